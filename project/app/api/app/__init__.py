@@ -1,6 +1,7 @@
 from .auth_router import router as auth_router
 from .board_router import router as board_router
 from .column_router import router as column_router
+from .metrics_router import router as metrics_router
 from .task_router import router as task_router
 from .user_router import router as user_router
 from .workspace_router import router as workspace_router
@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Depends, Request
 
+from app.core.dependencies.admission_dependencies import admit_request
+from app.core.monitoring.instrumented_route import InstrumentedRoute
 from app.core.security.decode_token import decode_token
 from app.schemas.auth_schema import (
     AuthResponseSchema,
@@ -13,7 +15,7 @@ from app.schemas.auth_schema import (
 from app.services.auth_service.auth_service import AuthService
 from app.services.user_service.user_service import UserService
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute, dependencies=[Depends(admit_request)])
 
 
 @router.post("/register", response_model=AuthResponseSchema)
@@ -71,8 +73,7 @@ async def refresh(data: RefreshSchema, token_data=Depends(decode_token)):
     - AuthResponseSchema: Contains new access token, refresh token, and user information
     """
     user_email = token_data.payload.get("email")
-    user = await UserService.get_user_by_email(user_email)
-    return await AuthService.refresh(data, user.id)
+    return await AuthService.refresh(data, user_email)
 
 
 @router.post("/logout")
@@ -1,8 +1,20 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
+from app.core.admission.admission_controller import RequestClass
+from app.core.dependencies.access_dependencies import (
+    BoardAccess,
+    begin_membership_checks,
+)
+from app.core.dependencies.admission_dependencies import admission, admit_request
+from app.core.dependencies.rate_limit_dependencies import RateLimit
+from app.core.monitoring.instrumented_route import InstrumentedRoute
+from app.core.rate_limit.rate_limiter import RateLimitRule
 from app.core.security.decode_token import decode_token
 from app.schemas.auth_schema import AuthDataOutputSchema
 from app.schemas.board_schema import (
+    BoardBulkInvitationSchema,
+    BoardBulkMembershipOutputSchema,
+    BoardBulkRemoveMemberSchema,
     BoardCreateSchema,
     BoardInvitationSchema,
     BoardMemberOutputSchema,
@@ -12,10 +24,18 @@ from app.schemas.board_schema import (
 )
 from app.services.board_service.board_service import BoardService
 
-router = APIRouter()
+router = APIRouter(
+    route_class=InstrumentedRoute,
+    dependencies=[
+        Depends(RateLimit("boards", RateLimitRule(10, 20), RateLimitRule(50, 100))),
+        Depends(admit_request),
+        Depends(begin_membership_checks),
+    ],
+)
 
 
 @router.get("/all-board-paginated/{workspace_id}", response_model=BoardPaginateSchema)
+@admission(RequestClass.LOW_PRIORITY)
 async def get_all_board_paginated(
     workspace_id: int,
     is_favourite: bool = False,
@@ -48,8 +68,10 @@ async def get_all_board_paginated(
 
 @router.get("/{board_id}/members", response_model=list[BoardMemberOutputSchema])
 async def get_board_members(
-    board_id: int,
-    token: AuthDataOutputSchema = Depends(decode_token),
+    board_id: BoardAccess,
+    search: str | None = None,
+    page: int = Query(0, ge=0),
+    limit: int = Query(25, gt=0, le=100),
 ) -> list[BoardMemberOutputSchema]:
     """
     Retrieve all members of a specific board.
@@ -59,13 +81,14 @@ async def get_board_members(
 
     Parameters:
     - board_id: ID of the board to get members from
-    - token: Authentication data containing user information
+    - search: Case insensitive prefix of the member name or email
+    - page: Page number for pagination (zero-indexed)
+    - limit: Maximum number of members per page (1 to 100, 25 by default)
 
     Returns:
     - List of board member objects with user details and roles
     """
-    user_email = token.payload.get("email")
-    return await BoardService.get_board_members(board_id, user_email)
+    return await BoardService.get_board_members(board_id, search, page, limit)
 
 
 @router.post("/", response_model=BoardOutputSchema)
@@ -114,6 +137,28 @@ async def invite_user_to_board(
     return await BoardService.invite_user_to_board(invitation, user_email)
 
 
+@router.post("/invite/bulk", response_model=BoardBulkMembershipOutputSchema)
+async def invite_users_to_board(
+    invitation: BoardBulkInvitationSchema,
+    token: AuthDataOutputSchema = Depends(decode_token),
+) -> BoardBulkMembershipOutputSchema:
+    """
+    Invite several users to join a board at once.
+
+    Only the board owner can invite new members. Emails are resolved in a
+    single query and the memberships inserted in a single statement.
+
+    Parameters:
+    - invitation: Contains board ID and the emails of the users to invite
+    - token: Authentication data containing user information
+
+    Returns:
+    - The result for each email: added, already_member or user_not_found
+    """
+    user_email = token.payload.get("email")
+    return await BoardService.invite_users_to_board(invitation, user_email)
+
+
 @router.put("/update-favorite/{board_id}", response_model=BoardOutputSchema)
 async def update_board_favourite(
     board_id: int, token: AuthDataOutputSchema = Depends(decode_token)
@@ -156,3 +201,24 @@ async def remove_user_from_board(
     """
     user_email = token.payload.get("email")
     return await BoardService.remove_user_from_board(removal, user_email)
+
+
+@router.delete("/remove-member/bulk", response_model=BoardBulkMembershipOutputSchema)
+async def remove_users_from_board(
+    removal: BoardBulkRemoveMemberSchema,
+    token: AuthDataOutputSchema = Depends(decode_token),
+) -> BoardBulkMembershipOutputSchema:
+    """
+    Remove several users from a board at once.
+
+    Only the board owner can remove members, the owner is never removed.
+
+    Parameters:
+    - removal: Contains board ID and the emails of the users to remove
+    - token: Authentication data containing user information
+
+    Returns:
+    - The result for each email: removed, not_member, owner or user_not_found
+    """
+    user_email = token.payload.get("email")
+    return await BoardService.remove_users_from_board(removal, user_email)
@@ -1,7 +1,15 @@
 from fastapi import APIRouter, Depends
 
-from app.core.security.decode_token import decode_token
-from app.schemas.auth_schema import AuthDataOutputSchema
+from app.core.dependencies.access_dependencies import (
+    BoardAccess,
+    ColumnAccess,
+    CurrentUser,
+    begin_membership_checks,
+)
+from app.core.dependencies.admission_dependencies import admit_request
+from app.core.dependencies.rate_limit_dependencies import RateLimit
+from app.core.monitoring.instrumented_route import InstrumentedRoute
+from app.core.rate_limit.rate_limiter import RateLimitRule
 from app.schemas.column_schema import (
     ColumnInputSchema,
     ColumnOutputSchema,
@@ -10,13 +18,18 @@ from app.schemas.column_schema import (
 )
 from app.services.column_service.column_service import ColumnService
 
-router = APIRouter()
+router = APIRouter(
+    route_class=InstrumentedRoute,
+    dependencies=[
+        Depends(RateLimit("columns", RateLimitRule(20, 40), RateLimitRule(100, 200))),
+        Depends(admit_request),
+        Depends(begin_membership_checks),
+    ],
+)
 
 
 @router.get("/{board_id}", response_model=list[ColumnOutputSchema])
-async def get_all_columns(
-    board_id: int, auth_data: AuthDataOutputSchema = Depends(decode_token)
-) -> list[ColumnOutputSchema]:
+async def get_all_columns(board_id: BoardAccess) -> list[ColumnOutputSchema]:
     """
     Retrieve all columns for a specific board.
 
@@ -25,18 +38,16 @@ async def get_all_columns(
 
     Parameters:
     - board_id: ID of the board to get columns from
-    - auth_data: Authentication data containing user information
 
     Returns:
     - List of column objects with their details
     """
-    user_email = auth_data.payload.get("email")
-    return await ColumnService.get_all_columns_by_board_id(board_id, user_email)
+    return await ColumnService.get_all_columns_by_board_id(board_id)
 
 
 @router.post("/", response_model=ColumnOutputSchema)
 async def create_column(
-    column: ColumnInputSchema, auth_data: AuthDataOutputSchema = Depends(decode_token)
+    column: ColumnInputSchema, user: CurrentUser
 ) -> ColumnOutputSchema:
     """
     Create a new column in a board.
@@ -47,19 +58,17 @@ async def create_column(
 
     Parameters:
     - column: Column creation data including name and board ID
-    - auth_data: Authentication data containing user information
+    - user: Authenticated user with its memberships
 
     Returns:
     - The created column object with its details
     """
-    user_email = auth_data.payload.get("email")
-    return await ColumnService.create_column(column, user_email)
+    return await ColumnService.create_column(column, user)
 
 
 @router.put("/change-name", response_model=ColumnOutputSchema)
 async def update_column_name(
-    column: ColumnUpdateNameSchema,
-    auth_data: AuthDataOutputSchema = Depends(decode_token),
+    column: ColumnUpdateNameSchema, user: CurrentUser
 ) -> ColumnOutputSchema:
     """
     Update the name of a column.
@@ -69,19 +78,17 @@ async def update_column_name(
 
     Parameters:
     - column: Contains column ID and the new name
-    - auth_data: Authentication data containing user information
+    - user: Authenticated user with its memberships
 
     Returns:
     - The updated column object with its details
     """
-    user_email = auth_data.payload.get("email")
-    return await ColumnService.update_column_name(column, user_email)
+    return await ColumnService.update_column_name(column, user)
 
 
 @router.put("/move", response_model=ColumnOutputSchema)
 async def move_column(
-    column_info: ColumnUpdateOrderSchema,
-    auth_data: AuthDataOutputSchema = Depends(decode_token),
+    column_info: ColumnUpdateOrderSchema, user: CurrentUser
 ) -> ColumnOutputSchema:
     """
     Change the position of a column within a board.
@@ -92,19 +99,16 @@ async def move_column(
 
     Parameters:
     - column_info: Contains column ID and the new position
-    - auth_data: Authentication data containing user information
+    - user: Authenticated user with its memberships
 
     Returns:
     - The moved column object with its updated details
     """
-    user_email = auth_data.payload.get("email")
-    return await ColumnService.move_column(column_info, user_email)
+    return await ColumnService.move_column(column_info, user)
 
 
 @router.delete("/{column_id}", response_model=ColumnOutputSchema)
-async def delete_column(
-    column_id: int, auth_data: AuthDataOutputSchema = Depends(decode_token)
-) -> ColumnOutputSchema:
+async def delete_column(column_id: int, column: ColumnAccess) -> ColumnOutputSchema:
     """
     Delete a column from a board.
 
@@ -113,10 +117,8 @@ async def delete_column(
 
     Parameters:
     - column_id: ID of the column to delete
-    - auth_data: Authentication data containing user information
 
     Returns:
     - The deleted column object with its details
     """
-    user_email = auth_data.payload.get("email")
-    return await ColumnService.delete_column(column_id, user_email)
+    return await ColumnService.delete_column(column)
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from starlette.responses import PlainTextResponse
+
+from app.core.monitoring.metrics_registry import MetricsRegistry
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics() -> PlainTextResponse:
+    """
+    Expose the request metrics of this worker in Prometheus text format.
+
+    Returns:
+    - Request counters and latency, DB time and query count histograms per route
+    """
+    return PlainTextResponse(
+        MetricsRegistry.render(), media_type="text/plain; version=0.0.4"
+    )
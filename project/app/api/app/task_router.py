@@ -1,9 +1,23 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 
-from app.core.security.decode_token import decode_token
-from app.schemas.auth_schema import AuthDataOutputSchema
+from app.core.admission.admission_controller import RequestClass
+from app.core.dependencies.access_dependencies import (
+    BoardAccess,
+    ColumnAccess,
+    CurrentUser,
+    TaskAccess,
+    begin_membership_checks,
+)
+from app.core.dependencies.admission_dependencies import admission, admit_request
+from app.core.dependencies.rate_limit_dependencies import RateLimit
+from app.core.monitoring.instrumented_route import InstrumentedRoute
+from app.core.rate_limit.rate_limiter import RateLimitRule
 from app.schemas.column_schema import ColumnWithTasksSchema
 from app.schemas.task_schema import (
+    ArchivedTaskPaginateSchema,
+    BoardView,
+    TaskArchiveOutputSchema,
+    TaskIdsSchema,
     TaskInputSchema,
     TaskOutputSchema,
     TaskUpdateOrderSchema,
@@ -11,34 +25,90 @@ from app.schemas.task_schema import (
 )
 from app.services.task_service.task_service import TaskService
 
-router = APIRouter()
+router = APIRouter(
+    route_class=InstrumentedRoute,
+    dependencies=[
+        Depends(RateLimit("tasks", RateLimitRule(20, 40), RateLimitRule(100, 200))),
+        Depends(admit_request),
+        Depends(begin_membership_checks),
+    ],
+)
 
 
 @router.get("/board/{board_id}", response_model=list[ColumnWithTasksSchema])
 async def get_columns_with_tasks(
-    board_id: int, auth_data: AuthDataOutputSchema = Depends(decode_token)
+    board_id: BoardAccess,
+    view: BoardView = BoardView.FULL,
+    fields: str | None = None,
 ):
     """
     Retrieve all columns with their associated tasks for a specific board.
 
     Returns a hierarchical structure of columns and their tasks for the
     specified board. Only board members can access this information.
+    The serialized snapshot is cached until the next change of the board.
 
     Parameters:
     - board_id: ID of the board to get columns and tasks from
-    - auth_data: Authentication data containing user information
+    - view: "compact" leaves out task descriptions and timestamps, fetch
+      them with GET /tasks?ids=
+    - fields: Comma separated task fields to return, overrides the view
 
     Returns:
     - List of column objects with nested task objects
     """
-    user_email = auth_data.payload.get("email")
-    return await TaskService.get_columns_with_tasks(board_id, user_email)
+    task_fields = TaskService.get_task_fields(view, fields)
+    snapshot = await TaskService.get_board_snapshot(board_id, task_fields)
+    return Response(snapshot, media_type="application/json")
+
+
+@router.get("", response_model=list[TaskOutputSchema])
+async def get_tasks_by_ids(
+    user: CurrentUser,
+    ids: str = Query(description="Comma separated task IDs"),
+) -> list[TaskOutputSchema]:
+    """
+    Retrieve several tasks by ID in one request.
+
+    Used to load the details (descriptions, timestamps) left out of compact
+    board reads. Tasks that do not exist are skipped, see POST /tasks/batch
+    for lists too long for a URL.
+    Only members of the boards of the tasks can access this information.
+
+    Parameters:
+    - ids: Comma separated task IDs (up to 1000)
+    - user: Authenticated user with its memberships
+
+    Returns:
+    - List of task objects in the requested order
+    """
+    return await TaskService.get_tasks_by_ids(TaskService.parse_task_ids(ids), user)
+
+
+@router.post("/batch", response_model=list[TaskOutputSchema])
+@admission(RequestClass.READ)
+async def get_tasks_by_ids_batch(
+    data: TaskIdsSchema, user: CurrentUser
+) -> list[TaskOutputSchema]:
+    """
+    Retrieve several tasks by ID, with the IDs in the request body.
+
+    Same as GET /tasks?ids= for long lists. Tasks that do not exist are
+    skipped.
+    Only members of the boards of the tasks can access this information.
+
+    Parameters:
+    - data: Task IDs (up to 1000)
+    - user: Authenticated user with its memberships
+
+    Returns:
+    - List of task objects in the requested order
+    """
+    return await TaskService.get_tasks_by_ids(data.ids, user)
 
 
 @router.post("/", response_model=TaskOutputSchema)
-async def create_task(
-    task: TaskInputSchema, auth_data: AuthDataOutputSchema = Depends(decode_token)
-) -> TaskOutputSchema:
+async def create_task(task: TaskInputSchema, user: CurrentUser) -> TaskOutputSchema:
     """
     Create a new task in a column.
 
@@ -48,19 +118,16 @@ async def create_task(
 
     Parameters:
     - task: Task creation data including title, description, and column ID
-    - auth_data: Authentication data containing user information
+    - user: Authenticated user with its memberships
 
     Returns:
     - The created task object with its details
     """
-    user_email = auth_data.payload.get("email")
-    return await TaskService.create_task(task, user_email)
+    return await TaskService.create_task(task, user)
 
 
 @router.put("/update", response_model=TaskOutputSchema)
-async def update_task(
-    task_info: TaskUpdateSchema, auth_data: AuthDataOutputSchema = Depends(decode_token)
-):
+async def update_task(task_info: TaskUpdateSchema, user: CurrentUser):
     """
     Update the details of a task.
 
@@ -70,42 +137,138 @@ async def update_task(
     Parameters:
     - task_info: Contains task ID and the fields to update (title, description,
       etc.)
-    - auth_data: Authentication data containing user information
+    - user: Authenticated user with its memberships
 
     Returns:
     - The updated task object with its details
     """
-    user_email = auth_data.payload.get("email")
-    return await TaskService.update_task(task_info, user_email)
+    return await TaskService.update_task(task_info, user)
 
 
 @router.put("/move", response_model=TaskOutputSchema)
 async def move_task(
-    task_info: TaskUpdateOrderSchema,
-    auth_data: AuthDataOutputSchema = Depends(decode_token),
+    task_info: TaskUpdateOrderSchema, user: CurrentUser
 ) -> TaskOutputSchema:
     """
     Move a task to a different position or column.
 
     Changes the position of a task within its column or moves it to a different
     column. Adjusts the positions of other tasks as needed.
-    Only board members can move tasks.
+    Only board members can move tasks, and only into columns of boards they
+    can access.
 
     Parameters:
     - task_info: Contains task ID, target column ID, and the new position
-    - auth_data: Authentication data containing user information
+    - user: Authenticated user with its memberships
 
     Returns:
     - The moved task object with its updated details
     """
-    user_email = auth_data.payload.get("email")
-    return await TaskService.move_task(task_info, user_email)
+    return await TaskService.move_task(task_info, user)
+
+
+@router.post("/{task_id}/archive", response_model=TaskArchiveOutputSchema)
+async def archive_task(task_id: int, task: TaskAccess) -> TaskArchiveOutputSchema:
+    """
+    Archive a task.
+
+    Moves the task out of its board: it is no longer returned by the board
+    reads nor shifted when the tasks of its column are reordered, until it is
+    restored. Only board members can archive tasks.
+
+    Parameters:
+    - task_id: ID of the task to archive
+
+    Returns:
+    - Number of archived tasks
+    """
+    return await TaskService.archive_task(task)
+
+
+@router.post("/archive/column/{column_id}", response_model=TaskArchiveOutputSchema)
+async def archive_column_tasks(
+    column_id: int, column: ColumnAccess
+) -> TaskArchiveOutputSchema:
+    """
+    Archive every task of a column.
+
+    Only board members can archive tasks.
+
+    Parameters:
+    - column_id: ID of the column to empty
+
+    Returns:
+    - Number of archived tasks
+    """
+    return await TaskService.archive_column_tasks(column)
+
+
+@router.post("/archive/board/{board_id}", response_model=TaskArchiveOutputSchema)
+async def archive_stale_tasks(
+    board_id: BoardAccess,
+    older_than_days: int = Query(gt=0),
+) -> TaskArchiveOutputSchema:
+    """
+    Archive the stale tasks of a board.
+
+    Archives every task of the board not updated for the given number of
+    days. Only board members can archive tasks.
+
+    Parameters:
+    - board_id: ID of the board to clean up
+    - older_than_days: Minimum number of days since the last update
+
+    Returns:
+    - Number of archived tasks
+    """
+    return await TaskService.archive_stale_tasks(board_id, older_than_days)
+
+
+@router.get("/archive/board/{board_id}", response_model=ArchivedTaskPaginateSchema)
+@admission(RequestClass.LOW_PRIORITY)
+async def get_archived_tasks(
+    board_id: BoardAccess,
+    page: int = Query(0, ge=0),
+    limit: int = Query(25, gt=0, le=100),
+) -> ArchivedTaskPaginateSchema:
+    """
+    Retrieve the archived tasks of a board, paginated.
+
+    Returns the most recently archived tasks first.
+    Only board members can access this information.
+
+    Parameters:
+    - board_id: ID of the board to get archived tasks from
+    - page: Page number for pagination (zero-indexed)
+    - limit: Maximum number of tasks per page (up to 100)
+
+    Returns:
+    - Paginated archived task data including total count and task objects
+    """
+    return await TaskService.get_archived_tasks(board_id, page, limit)
+
+
+@router.post("/archive/{archived_task_id}/restore", response_model=TaskOutputSchema)
+async def restore_task(archived_task_id: int, user: CurrentUser) -> TaskOutputSchema:
+    """
+    Restore an archived task.
+
+    Moves the task back to its column, after the existing tasks. Fails if a
+    task of the board has the same title.
+    Only board members can restore tasks.
+
+    Parameters:
+    - archived_task_id: ID of the archived task
+    - user: Authenticated user with its memberships
+
+    Returns:
+    - The restored task object with its details
+    """
+    return await TaskService.restore_task(archived_task_id, user)
 
 
 @router.delete("/{task_id}", response_model=TaskOutputSchema)
-async def delete_task(
-    task_id: int, auth_data: AuthDataOutputSchema = Depends(decode_token)
-):
+async def delete_task(task_id: int, task: TaskAccess):
     """
     Delete a task.
 
@@ -114,10 +277,8 @@ async def delete_task(
 
     Parameters:
     - task_id: ID of the task to delete
-    - auth_data: Authentication data containing user information
 
     Returns:
     - The deleted task object with its details
     """
-    user_email = auth_data.payload.get("email")
-    return await TaskService.delete_task(task_id, user_email)
+    return await TaskService.delete_task(task)
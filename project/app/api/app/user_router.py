@@ -1,11 +1,21 @@
 from fastapi import APIRouter, Depends
 
+from app.core.dependencies.admission_dependencies import admit_request
+from app.core.dependencies.rate_limit_dependencies import RateLimit
+from app.core.monitoring.instrumented_route import InstrumentedRoute
+from app.core.rate_limit.rate_limiter import RateLimitRule
 from app.core.security.decode_token import decode_token
 from app.schemas.auth_schema import AuthDataOutputSchema
 from app.schemas.user_schema import UserOutputSchema, UserUpdateSchema
 from app.services.user_service.user_service import UserService
 
-router = APIRouter()
+router = APIRouter(
+    route_class=InstrumentedRoute,
+    dependencies=[
+        Depends(RateLimit("users", RateLimitRule(5, 10))),
+        Depends(admit_request),
+    ],
+)
 
 
 @router.get("/me", response_model=UserOutputSchema)
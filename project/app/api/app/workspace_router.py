@@ -1,8 +1,19 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
+from app.core.dependencies.access_dependencies import (
+    WorkspaceAccess,
+    begin_membership_checks,
+)
+from app.core.dependencies.admission_dependencies import admit_request
+from app.core.dependencies.rate_limit_dependencies import RateLimit
+from app.core.monitoring.instrumented_route import InstrumentedRoute
+from app.core.rate_limit.rate_limiter import RateLimitRule
 from app.core.security.decode_token import decode_token
 from app.schemas.auth_schema import AuthDataOutputSchema
 from app.schemas.workspace_schema import (
+    WorkspaceBulkInvitationSchema,
+    WorkspaceBulkMembershipOutputSchema,
+    WorkspaceBulkRemoveMemberSchema,
     WorkspaceFilterByUserIdOutputSchema,
     WorkspaceInputSchema,
     WorkspaceInvitationSchema,
@@ -12,7 +23,14 @@ from app.schemas.workspace_schema import (
 )
 from app.services.workspace_service.workspace_service import WorkspaceService
 
-router = APIRouter()
+router = APIRouter(
+    route_class=InstrumentedRoute,
+    dependencies=[
+        Depends(RateLimit("workspaces", RateLimitRule(10, 20), RateLimitRule(50, 100))),
+        Depends(admit_request),
+        Depends(begin_membership_checks),
+    ],
+)
 
 
 @router.get("/all-me", response_model=list[WorkspaceFilterByUserIdOutputSchema])
@@ -30,7 +48,8 @@ async def get_all_workspaces_me(
     - token_decoder: Authentication data containing user information
 
     Returns:
-    - List of workspace objects with their details
+    - List of workspace objects with their board count, member count, the
+      role of the user (owner or member) and the last activity
     """
     user_email = token_decoder.payload.get("email")
     return await WorkspaceService.get_all_workspaces(user_email)
@@ -38,8 +57,10 @@ async def get_all_workspaces_me(
 
 @router.get("/{workspace_id}/members", response_model=list[WorkspaceMemberOutputSchema])
 async def get_workspace_members(
-    workspace_id: int,
-    token_decoder: AuthDataOutputSchema = Depends(decode_token),
+    workspace_id: WorkspaceAccess,
+    search: str | None = None,
+    page: int = Query(0, ge=0),
+    limit: int = Query(25, gt=0, le=100),
 ) -> list[WorkspaceMemberOutputSchema]:
     """
     Retrieve all members of a specific workspace.
@@ -49,13 +70,16 @@ async def get_workspace_members(
 
     Parameters:
     - workspace_id: ID of the workspace to get members from
-    - token_decoder: Authentication data containing user information
+    - search: Case insensitive prefix of the member name or email
+    - page: Page number for pagination (zero-indexed)
+    - limit: Maximum number of members per page (1 to 100, 25 by default)
 
     Returns:
     - List of workspace member objects with user details and roles
     """
-    user_email = token_decoder.payload.get("email")
-    return await WorkspaceService.get_workspace_members(workspace_id, user_email)
+    return await WorkspaceService.get_workspace_members(
+        workspace_id, search, page, limit
+    )
 
 
 @router.post("/", response_model=WorkspaceOutputSchema)
@@ -104,6 +128,28 @@ async def invite_user_to_workspace(
     return await WorkspaceService.invite_user_to_workspace(invitation, user_email)
 
 
+@router.post("/invite/bulk", response_model=WorkspaceBulkMembershipOutputSchema)
+async def invite_users_to_workspace(
+    invitation: WorkspaceBulkInvitationSchema,
+    token_decoder: AuthDataOutputSchema = Depends(decode_token),
+) -> WorkspaceBulkMembershipOutputSchema:
+    """
+    Invite several users to join a workspace at once.
+
+    Only the workspace owner can invite new members. Emails are resolved in a
+    single query and the memberships inserted in a single statement.
+
+    Parameters:
+    - invitation: Contains workspace ID and the emails of the users to invite
+    - token_decoder: Authentication data containing user information
+
+    Returns:
+    - The result for each email: added, already_member or user_not_found
+    """
+    user_email = token_decoder.payload.get("email")
+    return await WorkspaceService.invite_users_to_workspace(invitation, user_email)
+
+
 @router.delete("/remove-member", response_model=WorkspaceRemoveMemberSchema)
 async def remove_user_from_workspace(
     removal: WorkspaceRemoveMemberSchema,
@@ -126,6 +172,29 @@ async def remove_user_from_workspace(
     return await WorkspaceService.remove_user_from_workspace(removal, user_email)
 
 
+@router.delete(
+    "/remove-member/bulk", response_model=WorkspaceBulkMembershipOutputSchema
+)
+async def remove_users_from_workspace(
+    removal: WorkspaceBulkRemoveMemberSchema,
+    token_decoder: AuthDataOutputSchema = Depends(decode_token),
+) -> WorkspaceBulkMembershipOutputSchema:
+    """
+    Remove several users from a workspace at once.
+
+    Only the workspace owner can remove members, the owner is never removed.
+
+    Parameters:
+    - removal: Contains workspace ID and the emails of the users to remove
+    - token_decoder: Authentication data containing user information
+
+    Returns:
+    - The result for each email: removed, not_member, owner or user_not_found
+    """
+    user_email = token_decoder.payload.get("email")
+    return await WorkspaceService.remove_users_from_workspace(removal, user_email)
+
+
 @router.delete("/remove-workspace/{workspace_id}", response_model=WorkspaceOutputSchema)
 async def remove_workspace(
     workspace_id: int, token_decoder: AuthDataOutputSchema = Depends(decode_token)
@@ -9,6 +9,141 @@ logger = logging.getLogger(__name__)
 class AppSettings(BaseSettings):
     api_version: str = os.getenv("API_VERSION")
 
+    # Sampling profiler for slow requests, dumps folded stacks (flame graphs)
+    profiling_enabled: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    profiling_threshold_ms: float = float(os.getenv("PROFILING_THRESHOLD_MS", 500))
+    profiling_sample_interval: float = float(
+        os.getenv("PROFILING_SAMPLE_INTERVAL", 0.005)
+    )
+    profiling_output_dir: str = os.getenv("PROFILING_OUTPUT_DIR", "profiles")
+
+    # Log identical queries repeated within a request (N+1 detection)
+    query_duplicate_warning: bool = (
+        os.getenv("QUERY_DUPLICATE_WARNING", "false").lower() == "true"
+    )
+
+    # In-memory membership index used by the permission checks, entries are
+    # reloaded after the ttl to pick up changes made by other workers
+    membership_cache_ttl: float = float(os.getenv("MEMBERSHIP_CACHE_TTL", 60))
+    membership_cache_max_users: int = int(
+        os.getenv("MEMBERSHIP_CACHE_MAX_USERS", 10000)
+    )
+    # Redis pub/sub channel forwarding the invalidations of the index to the
+    # other workers and instances; empty for none, the index is then only
+    # trusted within a request when there are several workers
+    membership_invalidation_redis_url: str = os.getenv(
+        "MEMBERSHIP_INVALIDATION_REDIS_URL", ""
+    )
+
+    # Response compression (brotli when installed, gzip otherwise)
+    compression_minimum_size: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", 1024))
+    compression_gzip_level: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+    compression_brotli_quality: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+
+    # Serialized board snapshots: "local" (per worker LRU bounded in bytes,
+    # needs WEB_CONCURRENCY=1: off when there are several workers), "redis"
+    # (shared, any server speaking the Redis protocol) or "none"
+    snapshot_cache_backend: str = os.getenv("SNAPSHOT_CACHE_BACKEND", "local")
+    snapshot_cache_redis_url: str = os.getenv(
+        "SNAPSHOT_CACHE_REDIS_URL", "redis://localhost:6379/0"
+    )
+    snapshot_cache_max_bytes: int = int(
+        os.getenv("SNAPSHOT_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+    )
+    snapshot_cache_ttl: float = float(os.getenv("SNAPSHOT_CACHE_TTL", 600))
+
+    # Idempotency-Key of the mutations: responses kept per user and key for
+    # the ttl (seconds) in a "local" (per worker LRU bounded in bytes, needs
+    # WEB_CONCURRENCY=1: off when there are several), "redis" (shared) or "none"
+    # store; a request in progress holds its key up to the lock timeout, a
+    # duplicate waits up to the wait timeout for its response
+    idempotency_backend: str = os.getenv("IDEMPOTENCY_BACKEND", "local")
+    idempotency_redis_url: str = os.getenv(
+        "IDEMPOTENCY_REDIS_URL", "redis://localhost:6379/0"
+    )
+    idempotency_max_bytes: int = int(
+        os.getenv("IDEMPOTENCY_MAX_BYTES", 16 * 1024 * 1024)
+    )
+    idempotency_ttl: float = float(os.getenv("IDEMPOTENCY_TTL", 86400))
+    idempotency_lock_timeout: float = float(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT", 30))
+    idempotency_wait_timeout: float = float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", 10))
+
+    # Token bucket rate limits of the route groups, per user and workspace:
+    # "local" (per worker buckets, needs WEB_CONCURRENCY=1: off when there
+    # are several workers), "redis" (shared by the workers) or "none";
+    # limits of the routers overridden with comma separated
+    # group.scope=rate/burst entries (tokens per second, 0 to disable),
+    # e.g. tasks.user=50/100,tasks.workspace=0
+    rate_limit_backend: str = os.getenv("RATE_LIMIT_BACKEND", "local")
+    rate_limit_redis_url: str = os.getenv(
+        "RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0"
+    )
+    rate_limit_max_keys: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100000))
+    rate_limits: str = os.getenv("RATE_LIMITS", "")
+
+    # Admission control ahead of the database pool, per worker: concurrent
+    # mutations, reads and low priority reads (lists, pagination), lowered
+    # while the connection wait exceeds the target (ms); mutations and
+    # reads beyond their limit wait up to their queue timeout (seconds)
+    admission_control_enabled: bool = (
+        os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true"
+    )
+    admission_target_acquire_ms: float = float(
+        os.getenv("ADMISSION_TARGET_ACQUIRE_MS", 20)
+    )
+    admission_mutation_limit: int = int(os.getenv("ADMISSION_MUTATION_LIMIT", 32))
+    admission_read_limit: int = int(os.getenv("ADMISSION_READ_LIMIT", 64))
+    admission_low_priority_limit: int = int(
+        os.getenv("ADMISSION_LOW_PRIORITY_LIMIT", 16)
+    )
+    admission_mutation_queue_timeout: float = float(
+        os.getenv("ADMISSION_MUTATION_QUEUE_TIMEOUT", 5)
+    )
+    admission_read_queue_timeout: float = float(
+        os.getenv("ADMISSION_READ_QUEUE_TIMEOUT", 1)
+    )
+
+    # Auth sessions: index of the sessions by refresh token and reuse of the
+    # response of a refresh for the same token within the interval (seconds)
+    session_cache_ttl: float = float(os.getenv("SESSION_CACHE_TTL", 300))
+    session_cache_max_entries: int = int(os.getenv("SESSION_CACHE_MAX_ENTRIES", 50000))
+    auth_refresh_reuse_interval: float = float(
+        os.getenv("AUTH_REFRESH_REUSE_INTERVAL", 10)
+    )
+    # Sessions unused for the expiry (days) are deleted every sweep interval
+    # (seconds, 0 to disable), batch size rows per statement
+    session_expiry_days: float = float(os.getenv("SESSION_EXPIRY_DAYS", 30))
+    session_sweep_interval: float = float(os.getenv("SESSION_SWEEP_INTERVAL", 3600))
+    session_sweep_batch_size: int = int(os.getenv("SESSION_SWEEP_BATCH_SIZE", 1000))
+
+    # Warm-up of each worker before it accepts requests: connections opened
+    # per database and boards whose snapshot is primed (0 to skip)
+    warmup_enabled: bool = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+    warmup_connections: int = int(os.getenv("WARMUP_CONNECTIONS", 1))
+    warmup_prime_boards: int = int(os.getenv("WARMUP_PRIME_BOARDS", 10))
+
+    # Server launcher (python -m app.core.server) and gunicorn.conf.py:
+    # engine (uvicorn, gunicorn or hypercorn for HTTP/2), worker processes
+    # (0 for one per CPU, the local cache backends need one), event loop
+    # (auto, uvloop or asyncio), HTTP parser (auto, httptools or h11),
+    # keep-alive (seconds), connections served at once per worker (0 for no
+    # limit), TLS files (HTTP/2 over TLS)
+    server_engine: str = os.getenv("SERVER_ENGINE", "uvicorn")
+    server_host: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    server_port: int = int(os.getenv("PORT", 8000))
+    server_workers: int = int(os.getenv("WEB_CONCURRENCY", 0))
+    server_loop: str = os.getenv("SERVER_LOOP", "auto")
+    server_http: str = os.getenv("SERVER_HTTP", "auto")
+    server_backlog: int = int(os.getenv("SERVER_BACKLOG", 2048))
+    server_keepalive: int = int(os.getenv("SERVER_KEEPALIVE", 5))
+    server_limit_concurrency: int = int(os.getenv("SERVER_LIMIT_CONCURRENCY", 0))
+    server_certfile: str = os.getenv("SERVER_CERTFILE", "")
+    server_keyfile: str = os.getenv("SERVER_KEYFILE", "")
+
+    # In-process stand-in for Supabase auth (local runs, benchmarks, tests)
+    supabase_stub: bool = os.getenv("SUPABASE_STUB", "false").lower() == "true"
+    supabase_stub_latency_ms: float = float(os.getenv("SUPABASE_STUB_LATENCY_MS", 0))
+
 
 def get_application_settings() -> AppSettings:
     logger.info("loading application settings")
@@ -16,3 +151,16 @@ def get_application_settings() -> AppSettings:
 
 
 app_settings = get_application_settings()
+
+
+def get_workers() -> int:
+    """
+    Worker processes: WEB_CONCURRENCY, or one per CPU available to this
+    process. Workers are asynchronous, more than one per CPU only adds
+    context switches.
+    """
+    if app_settings.server_workers > 0:
+        return app_settings.server_workers
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
@@ -0,0 +1,237 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import Enum
+from typing import AsyncIterator
+
+from app.app_config import app_settings
+from app.core.admission.admission_exception import (
+    AdmissionException,
+    AdmissionExceptionInfo,
+)
+from app.core.monitoring.metrics_registry import Counter, Gauge, MetricsRegistry
+
+# Limits are adjusted at most once per interval, from the connection
+# acquires observed in between
+ADJUST_INTERVAL = 0.1
+RETRY_AFTER = "1"
+
+
+class RequestClass(str, Enum):
+    MUTATION = "mutation"
+    READ = "read"
+    # Reads that can be retried later without hurting the user (lists,
+    # pagination), shed first
+    LOW_PRIORITY = "low_priority"
+
+
+@dataclass(frozen=True)
+class AdmissionPolicy:
+    max_limit: int
+    min_limit: int
+    # Factor applied to the limit while the database is saturated
+    decrease: float
+    # Requests deferred once the limit is reached (0 to reject them at once)
+    queue_size: int
+    queue_timeout: float
+
+
+class AdaptiveLimit:
+    """
+    Concurrency limit of a request class: requests beyond the limit wait in
+    a bounded queue up to the queue timeout, and are rejected when it is
+    full or the wait times out
+    """
+
+    def __init__(self, request_class: RequestClass, policy: AdmissionPolicy):
+        self.request_class = request_class
+        self.policy = policy
+        self.limit = float(policy.max_limit)
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> None:
+        """
+        Take a slot, waiting for one when the limit is reached
+        :raises AdmissionException: when the queue is full or the wait
+            timed out
+        """
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.policy.queue_size:
+            self._reject("queue_full" if self.policy.queue_size else "shed")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait({waiter}, timeout=self.policy.queue_timeout)
+        except asyncio.CancelledError:
+            # Client gone: hand the slot over if it was granted meanwhile
+            if waiter.done():
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+        if not waiter.done():
+            self._waiters.remove(waiter)
+            self._reject("timeout")
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self.wake_up()
+
+    def wake_up(self) -> None:
+        """
+        Grant the free slots to the deferred requests, oldest first
+        """
+        while self._waiters and self.in_flight < int(self.limit):
+            self._waiters.popleft().set_result(None)
+            self.in_flight += 1
+
+    def decrease(self) -> None:
+        self.limit = max(self.policy.min_limit, self.limit * self.policy.decrease)
+
+    def increase(self, step: int) -> None:
+        self.limit = min(self.policy.max_limit, self.limit + step)
+        self.wake_up()
+
+    def _reject(self, reason: str) -> None:
+        AdmissionController.rejected.inc((self.request_class.value, reason))
+        raise AdmissionException(
+            AdmissionExceptionInfo.ERROR_SERVER_OVERLOADED,
+            headers={"Retry-After": RETRY_AFTER},
+        )
+
+
+def _create_limits() -> dict[RequestClass, AdaptiveLimit]:
+    policies = {
+        # Deferred rather than rejected, down to a floor kept for them
+        RequestClass.MUTATION: AdmissionPolicy(
+            app_settings.admission_mutation_limit,
+            max(app_settings.admission_mutation_limit // 4, 1),
+            0.9,
+            app_settings.admission_mutation_limit * 2,
+            app_settings.admission_mutation_queue_timeout,
+        ),
+        RequestClass.READ: AdmissionPolicy(
+            app_settings.admission_read_limit,
+            1,
+            0.7,
+            app_settings.admission_read_limit,
+            app_settings.admission_read_queue_timeout,
+        ),
+        # Shed entirely while saturated, never deferred
+        RequestClass.LOW_PRIORITY: AdmissionPolicy(
+            app_settings.admission_low_priority_limit, 0, 0.5, 0, 0
+        ),
+    }
+    return {
+        request_class: AdaptiveLimit(request_class, policy)
+        for request_class, policy in policies.items()
+    }
+
+
+class AdmissionController:
+    """
+    Per worker admission of the requests by class (mutations, reads, low
+    priority reads), ahead of the database pool they compete for.
+
+    The limits follow the time spent waiting for a database connection:
+    while it stays above the target, the pool is exhausted and the limits
+    decrease multiplicatively (low priority reads first and fastest,
+    mutations least and down to a floor); below it, they grow back by one
+    per interval. Requests beyond a limit are deferred in a bounded queue,
+    then rejected with 503 and Retry-After, so the queue forms here instead
+    of in the pool, where mutations would wait behind every read.
+    """
+
+    enabled: bool = app_settings.admission_control_enabled
+    limits: dict[RequestClass, AdaptiveLimit] = _create_limits()
+    acquire_latency: float = 0.0
+    _acquire_total: float = 0.0
+    _acquire_count: int = 0
+    _adjusted_at: float = 0.0
+    rejected = Counter(
+        "admission_rejected_requests_total",
+        "Requests rejected by the admission control",
+        ("request_class", "reason"),
+    )
+
+    @classmethod
+    def configure(cls, enabled: bool) -> None:
+        cls.enabled = enabled
+        cls.limits = _create_limits()
+        cls.acquire_latency = 0.0
+        cls._acquire_total, cls._acquire_count = 0.0, 0
+
+    @classmethod
+    def observe_acquire(cls, duration: float) -> None:
+        """
+        Record the time a query waited for its database connection
+        """
+        cls._acquire_total += duration
+        cls._acquire_count += 1
+
+    @classmethod
+    @asynccontextmanager
+    async def admit(cls, request_class: RequestClass) -> AsyncIterator[None]:
+        """
+        Hold a slot of the request class for the duration of the block
+        :raises AdmissionException: when the request is shed
+        """
+        if not cls.enabled:
+            yield
+            return
+        cls._adjust()
+        limit = cls.limits[request_class]
+        await limit.acquire()
+        try:
+            yield
+        finally:
+            limit.release()
+
+    @classmethod
+    def _adjust(cls) -> None:
+        now = time.monotonic()
+        intervals = int((now - cls._adjusted_at) / ADJUST_INTERVAL)
+        if not intervals:
+            return
+        # No acquire since the last adjustment: the database is idle
+        cls.acquire_latency = (
+            cls._acquire_total / cls._acquire_count if cls._acquire_count else 0.0
+        )
+        cls._acquire_total, cls._acquire_count = 0.0, 0
+        cls._adjusted_at = now
+
+        saturated = (
+            cls.acquire_latency * 1000 > app_settings.admission_target_acquire_ms
+        )
+        for limit in cls.limits.values():
+            if saturated:
+                limit.decrease()
+            else:
+                # Grown back for every interval elapsed, idle ones included
+                limit.increase(intervals)
+
+
+MetricsRegistry.register(AdmissionController.rejected)
+MetricsRegistry.register(
+    Gauge(
+        "admission_db_acquire_latency_seconds",
+        "Mean database connection wait of the last admission interval",
+        lambda: AdmissionController.acquire_latency,
+    )
+)
+for _request_class in RequestClass:
+    MetricsRegistry.register(
+        Gauge(
+            f"admission_{_request_class.value}_limit",
+            f"Concurrency limit of the {_request_class.value} requests",
+            lambda request_class=_request_class: int(
+                AdmissionController.limits[request_class].limit
+            ),
+        )
+    )
@@ -0,0 +1,9 @@
+from app.schemas.base_schema import BaseException, BaseExceptionInfo
+
+
+class AdmissionExceptionInfo(BaseExceptionInfo):
+    ERROR_SERVER_OVERLOADED = (9001, "Error server overloaded, retry later", 503)
+
+
+class AdmissionException(BaseException):
+    pass
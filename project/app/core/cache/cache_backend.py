@@ -0,0 +1,177 @@
+import logging
+import time
+from collections import OrderedDict
+
+from app.app_config import get_workers
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """
+    Byte values and integer counters shared by the instances of the API.
+    Values expire after their ttl and may be evicted at any time, counters
+    are only expected to grow.
+    """
+
+    async def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        raise NotImplementedError
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """
+        Set the value unless the key holds one
+        :return: whether the value was set
+        """
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def get_counter(self, key: str) -> int:
+        raise NotImplementedError
+
+    async def incr(self, key: str) -> int:
+        raise NotImplementedError
+
+    def size(self) -> int:
+        """Bytes held by the values, -1 when the backend does not track it"""
+        return -1
+
+
+class LocalCacheBackend(CacheBackend):
+    """
+    Per worker LRU cache bounded by the bytes of its keys and values
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._values: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._counters: dict[str, int] = {}
+        self._bytes = 0
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            self._pop(key)
+            return None
+        self._values.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._pop(key)
+        entry_size = len(key) + len(value)
+        if entry_size > self.max_bytes:
+            return
+        self._values[key] = (value, time.monotonic() + ttl)
+        self._bytes += entry_size
+        while self._bytes > self.max_bytes:
+            self._pop(next(iter(self._values)))
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._pop(key)
+
+    async def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    def size(self) -> int:
+        return self._bytes
+
+    def _pop(self, key: str) -> None:
+        entry = self._values.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(key) + len(entry[0])
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache shared by every worker and instance, on any server speaking the
+    Redis protocol. Memory is bounded by the server (maxmemory with an LRU
+    eviction policy).
+    """
+
+    def __init__(self, url: str, prefix: str = "kanban:"):
+        # Optional dependency, only needed when the backend is configured
+        from redis.asyncio import Redis
+
+        self.prefix = prefix
+        self._client = Redis.from_url(url)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._client.set(self.prefix + key, value, px=int(ttl * 1000))
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        return bool(
+            await self._client.set(
+                self.prefix + key, value, px=int(ttl * 1000), nx=True
+            )
+        )
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self.prefix + key)
+
+    async def get_counter(self, key: str) -> int:
+        value = await self._client.get(self.prefix + key)
+        return int(value) if value else 0
+
+    async def incr(self, key: str) -> int:
+        return await self._client.incr(self.prefix + key)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def local_backend_allowed(setting: str) -> bool:
+    """
+    Local backends are per worker, with several workers each one only sees
+    its own entries: they are then disabled with a warning
+    :param setting: environment variable selecting the backend
+    :return: whether there is a single worker
+    """
+    workers = get_workers()
+    if workers > 1:
+        logger.warning(
+            "%s=local disabled: the local backend needs a single worker, "
+            "there are %d, set %s=redis",
+            setting,
+            workers,
+            setting,
+        )
+        return False
+    return True
+
+
+def create_cache_backend(
+    setting: str, backend: str, redis_url: str, max_bytes: int
+) -> CacheBackend | None:
+    """
+    Backend selected by a setting: "redis" (shared by the workers), "local"
+    (per worker LRU bounded in bytes, single worker only) or "none"
+    :param setting: environment variable selecting the backend
+    :param backend: its value
+    :param redis_url: url of the redis backend
+    :param max_bytes: bound of the local backend
+    """
+    if backend == "redis":
+        return RedisCacheBackend(redis_url)
+    if backend == "local" and local_backend_allowed(setting):
+        return LocalCacheBackend(max_bytes)
+    return None
@@ -0,0 +1,131 @@
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+
+from app.app_config import app_settings
+from app.core.cache.cache_backend import CacheBackend, create_cache_backend
+from app.core.monitoring.metrics_registry import Counter, MetricsRegistry
+
+WAIT_INTERVAL = 0.05
+
+
+@dataclass
+class IdempotentResponse:
+    """
+    Response of a request sent with an Idempotency-Key. The status is None
+    while the request is in progress.
+    """
+
+    fingerprint: str
+    status: int | None = None
+    headers: list[tuple[bytes, bytes]] = field(default_factory=list)
+    body: bytes = b""
+
+    def dump(self) -> bytes:
+        head = {
+            "fingerprint": self.fingerprint,
+            "status": self.status,
+            "headers": [
+                [name.decode("latin-1"), value.decode("latin-1")]
+                for name, value in self.headers
+            ],
+        }
+        return json.dumps(head).encode() + b"\n" + self.body
+
+    @classmethod
+    def load(cls, data: bytes) -> "IdempotentResponse":
+        head, _, body = data.partition(b"\n")
+        values = json.loads(head)
+        return cls(
+            values["fingerprint"],
+            values["status"],
+            [
+                (name.encode("latin-1"), value.encode("latin-1"))
+                for name, value in values["headers"]
+            ],
+            body,
+        )
+
+
+class IdempotencyStore:
+    """
+    Responses of the mutations sent with an Idempotency-Key, by user and key.
+    A request claims its key with an in progress marker (expiring after the
+    lock timeout, should the worker die) replaced by the response once
+    completed, or removed when it failed so that it can be retried. The
+    store is shared by the workers (redis), the local one is only used by a
+    single worker.
+    """
+
+    # With several local stores, a retry served by another worker would run
+    # the mutation again
+    backend: CacheBackend | None = create_cache_backend(
+        "IDEMPOTENCY_BACKEND",
+        app_settings.idempotency_backend,
+        app_settings.idempotency_redis_url,
+        app_settings.idempotency_max_bytes,
+    )
+    requests = Counter(
+        "idempotency_requests_total",
+        "Requests sent with an Idempotency-Key",
+        ("result",),
+    )
+
+    @classmethod
+    def configure(cls, backend: CacheBackend | None) -> None:
+        cls.backend = backend
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return cls.backend is not None
+
+    @staticmethod
+    def key(subject: str, idempotency_key: str) -> str:
+        digest = hashlib.sha256(f"{subject}:{idempotency_key}".encode()).hexdigest()
+        return f"idempotency:{digest}"
+
+    @classmethod
+    async def get(cls, key: str) -> IdempotentResponse | None:
+        data = await cls.backend.get(key)
+        return IdempotentResponse.load(data) if data is not None else None
+
+    @classmethod
+    async def claim(cls, key: str, fingerprint: str) -> bool:
+        """
+        Mark the request in progress
+        :return: False when the key is already claimed or completed
+        """
+        return await cls.backend.add(
+            key,
+            IdempotentResponse(fingerprint).dump(),
+            app_settings.idempotency_lock_timeout,
+        )
+
+    @classmethod
+    async def complete(cls, key: str, response: IdempotentResponse) -> None:
+        await cls.backend.set(key, response.dump(), app_settings.idempotency_ttl)
+
+    @classmethod
+    async def release(cls, key: str) -> None:
+        await cls.backend.delete(key)
+
+    @classmethod
+    async def wait(cls, key: str) -> IdempotentResponse | None:
+        """
+        Wait for a request in progress, claimed by another worker
+        :return: its response, still in progress after the wait timeout, or
+            None when it failed and released the key
+        """
+        deadline = time.monotonic() + app_settings.idempotency_wait_timeout
+        response = await cls.get(key)
+        while response is not None and response.status is None:
+            if time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(WAIT_INTERVAL)
+            response = await cls.get(key)
+        return response
+
+
+MetricsRegistry.register(IdempotencyStore.requests)
@@ -0,0 +1,60 @@
+"""
+Request level resolution of the authenticated user and of the resources it
+accesses. FastAPI caches each dependency for the duration of a request, so
+the user and the rows loaded to authorize it are resolved once and handed
+to the services for the operation itself.
+"""
+
+from typing import Annotated
+
+from fastapi import Depends
+
+from app.core.security.decode_token import decode_token
+from app.modules.database_module.models.default import Column, Task
+from app.schemas.auth_schema import AuthDataOutputSchema
+from app.services.permission_service.membership_cache import (
+    Membership,
+    MembershipCache,
+)
+from app.services.permission_service.permission_service import PermissionService
+
+
+async def begin_membership_checks() -> None:
+    """
+    Router dependency: the permission checks of the request do not trust
+    the membership index when it misses the other workers' invalidations
+    """
+    MembershipCache.begin_request()
+
+
+async def get_current_user(
+    token: AuthDataOutputSchema = Depends(decode_token),
+) -> Membership:
+    return await MembershipCache.get(token.payload.get("email"))
+
+
+CurrentUser = Annotated[Membership, Depends(get_current_user)]
+
+
+async def get_workspace_access(workspace_id: int, user: CurrentUser) -> int:
+    return await PermissionService.get_accessible_workspace(user, workspace_id)
+
+
+async def get_board_access(board_id: int, user: CurrentUser) -> int:
+    return await PermissionService.get_accessible_board(user, board_id)
+
+
+async def get_column_access(column_id: int, user: CurrentUser) -> Column:
+    return await PermissionService.get_accessible_column(user, column_id)
+
+
+async def get_task_access(task_id: int, user: CurrentUser) -> Task:
+    return await PermissionService.get_accessible_task(user, task_id)
+
+
+# Identifier of a workspace/board path parameter the user can access
+WorkspaceAccess = Annotated[int, Depends(get_workspace_access)]
+BoardAccess = Annotated[int, Depends(get_board_access)]
+# Column / task (with its column) of a path parameter the user can access
+ColumnAccess = Annotated[Column, Depends(get_column_access)]
+TaskAccess = Annotated[Task, Depends(get_task_access)]
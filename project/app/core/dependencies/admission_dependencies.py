@@ -0,0 +1,43 @@
+"""
+Admission of the requests ahead of the database, declared on the routers.
+A request is a mutation or a read according to its method, endpoints can
+override their class with the admission decorator.
+"""
+
+from typing import AsyncIterator, Callable
+
+from fastapi import Request
+
+from app.core.admission.admission_controller import AdmissionController, RequestClass
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def admission(request_class: RequestClass) -> Callable:
+    """
+    Set the admission class of an endpoint, applied below the route
+    decorator, e.g. RequestClass.LOW_PRIORITY for a list that can be
+    retried later or RequestClass.READ for a read sent with POST
+    """
+
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.__admission_class__ = request_class
+        return endpoint
+
+    return decorator
+
+
+async def admit_request(request: Request) -> AsyncIterator[None]:
+    """
+    Hold a slot of the class of the request until the endpoint is done
+    :raises AdmissionException: when the request is shed
+    """
+    request_class = getattr(request.scope.get("endpoint"), "__admission_class__", None)
+    if request_class is None:
+        request_class = (
+            RequestClass.READ
+            if request.method in READ_METHODS
+            else RequestClass.MUTATION
+        )
+    async with AdmissionController.admit(request_class):
+        yield
@@ -0,0 +1,68 @@
+"""
+Rate limits of the route groups, declared on their routers. Applied as a
+router dependency rather than a middleware: the group and the workspace of
+the path parameters are only known once the request has been routed.
+"""
+
+from fastapi import Depends, Request
+
+from app.core.rate_limit.rate_limiter import RateLimiter, RateLimitRule
+from app.core.security.decode_token import decode_token
+from app.schemas.auth_schema import AuthDataOutputSchema
+from app.services.permission_service.membership_cache import MembershipCache
+
+
+class RateLimit:
+    """
+    Take a token per request from the bucket of the user (JWT subject) and,
+    when the path names a workspace or a board the user can access, from the
+    bucket of its workspace, shared by all of its members
+    """
+
+    def __init__(
+        self,
+        group: str,
+        per_user: RateLimitRule | None,
+        per_workspace: RateLimitRule | None = None,
+    ):
+        self.group = group
+        self.per_user = RateLimiter.get_rule(group, "user", per_user)
+        self.per_workspace = RateLimiter.get_rule(group, "workspace", per_workspace)
+
+    async def __call__(
+        self, request: Request, token: AuthDataOutputSchema = Depends(decode_token)
+    ) -> None:
+        if self.per_user is not None:
+            await RateLimiter.acquire(
+                self.group, "user", token.payload["sub"], self.per_user
+            )
+        if self.per_workspace is not None:
+            workspace_id = self._get_workspace_id(request, token)
+            if workspace_id is not None:
+                await RateLimiter.acquire(
+                    self.group, "workspace", str(workspace_id), self.per_workspace
+                )
+
+    @staticmethod
+    def _get_workspace_id(request: Request, token: AuthDataOutputSchema) -> int | None:
+        """
+        Workspace of the workspace_id or board_id path parameter, from the
+        cached memberships of the user: a request is not worth loading them,
+        the first requests of a user on a worker are only limited per user.
+        Identifiers the user cannot access are left to the permission checks.
+        """
+        path_params = request.path_params
+        if "workspace_id" not in path_params and "board_id" not in path_params:
+            return None
+        membership = MembershipCache.peek(token.payload.get("email"))
+        if membership is None:
+            return None
+        try:
+            if "workspace_id" in path_params:
+                workspace_id = int(path_params["workspace_id"])
+                if workspace_id in membership.workspace_ids:
+                    return workspace_id
+                return None
+            return membership.board_workspace_ids.get(int(path_params["board_id"]))
+        except ValueError:
+            return None
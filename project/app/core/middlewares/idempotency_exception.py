@@ -0,0 +1,19 @@
+from app.schemas.base_schema import BaseException, BaseExceptionInfo
+
+
+class IdempotencyExceptionInfo(BaseExceptionInfo):
+    ERROR_INVALID_IDEMPOTENCY_KEY = (7001, "Error invalid idempotency key", 400)
+    ERROR_IDEMPOTENCY_KEY_REUSED = (
+        7002,
+        "Error idempotency key already used for a different request",
+        422,
+    )
+    ERROR_IDEMPOTENCY_KEY_IN_PROGRESS = (
+        7003,
+        "Error a request with this idempotency key is in progress",
+        409,
+    )
+
+
+class IdempotencyException(BaseException):
+    pass
@@ -0,0 +1,175 @@
+import hashlib
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache.idempotency_store import IdempotencyStore, IdempotentResponse
+from app.core.middlewares.idempotency_exception import (
+    IdempotencyException,
+    IdempotencyExceptionInfo,
+)
+from app.core.security.decode_token import get_token_subject
+from app.utils.single_flight import SingleFlight
+
+MUTATING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+MAX_KEY_LENGTH = 255
+REPLAYED_HEADER = (b"idempotent-replayed", b"true")
+
+_flights = SingleFlight("idempotent_request")
+
+
+async def _read_body(receive: Receive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body", False):
+            return body
+
+
+class IdempotencyMiddleware:
+    """
+    Run a mutation sent with an Idempotency-Key once per user and key: the
+    response of a completed request is stored and replayed to its retries,
+    with an Idempotent-Replayed header. A duplicate arriving while the
+    request is in progress waits for its response, in process or through
+    the store. A key reused for a different request (method, path, query
+    or body) is rejected.
+
+    Server errors and failures are not stored, the request can be retried.
+    Requests without a valid bearer token are left to the endpoint.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in MUTATING_METHODS
+            or not IdempotencyStore.enabled()
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get("idempotency-key")
+        subject = get_token_subject(headers.get("authorization"))
+        if idempotency_key is None or subject is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+                raise IdempotencyException(
+                    IdempotencyExceptionInfo.ERROR_INVALID_IDEMPOTENCY_KEY
+                )
+            body = await _read_body(receive)
+            fingerprint = hashlib.sha256(
+                b"\n".join(
+                    (
+                        scope["method"].encode(),
+                        scope["path"].encode(),
+                        scope["query_string"],
+                        body,
+                    )
+                )
+            ).hexdigest()
+            key = IdempotencyStore.key(subject, idempotency_key)
+
+            owner = object()
+            executor, response = await _flights.run(
+                key,
+                lambda: self._run_once(key, fingerprint, scope, body, receive, owner),
+            )
+            if response.fingerprint != fingerprint:
+                raise IdempotencyException(
+                    IdempotencyExceptionInfo.ERROR_IDEMPOTENCY_KEY_REUSED
+                )
+        except IdempotencyException as exception:
+            IdempotencyStore.requests.inc(("rejected",))
+            await JSONResponse(exception.detail, exception.status_code)(
+                scope, receive, send
+            )
+            return
+
+        replayed = executor is not owner
+        IdempotencyStore.requests.inc(("replayed" if replayed else "executed",))
+        await self._send(response, send, replayed)
+
+    async def _run_once(
+        self,
+        key: str,
+        fingerprint: str,
+        scope: Scope,
+        body: bytes,
+        receive: Receive,
+        owner: object,
+    ) -> tuple[object | None, IdempotentResponse]:
+        """
+        Get the stored response, or run the request when the key is free
+        :return: owner of the request when it ran it, and the response
+        """
+        while True:
+            stored = await IdempotencyStore.get(key)
+            if stored is None:
+                if await IdempotencyStore.claim(key, fingerprint):
+                    return owner, await self._execute(
+                        key, fingerprint, scope, body, receive
+                    )
+                continue  # Claimed by another worker meanwhile
+            if stored.fingerprint == fingerprint and stored.status is None:
+                stored = await IdempotencyStore.wait(key)
+                if stored is None:
+                    continue  # Failed, the key is free again
+                if stored.status is None:
+                    raise IdempotencyException(
+                        IdempotencyExceptionInfo.ERROR_IDEMPOTENCY_KEY_IN_PROGRESS
+                    )
+            return None, stored
+
+    async def _execute(
+        self, key: str, fingerprint: str, scope: Scope, body: bytes, receive: Receive
+    ) -> IdempotentResponse:
+        response = IdempotentResponse(fingerprint)
+        body_sent = False
+
+        async def receive_body() -> Message:
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def capture(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response.status = message["status"]
+                response.headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                response.body += message.get("body", b"")
+
+        try:
+            await self.app(scope, receive_body, capture)
+        except BaseException:
+            await IdempotencyStore.release(key)
+            raise
+        if response.status is None or response.status >= 500:
+            await IdempotencyStore.release(key)
+        else:
+            await IdempotencyStore.complete(key, response)
+        return response
+
+    @staticmethod
+    async def _send(response: IdempotentResponse, send: Send, replayed: bool) -> None:
+        headers = list(response.headers)
+        if replayed:
+            headers.append(REPLAYED_HEADER)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status,
+                "headers": headers,
+            }
+        )
+        await send({"type": "http.response.body", "body": response.body})
@@ -0,0 +1,92 @@
+import functools
+import time
+from typing import Callable
+
+from tortoise.backends.base.client import (
+    ConnectionWrapper,
+    NestedTransactionContext,
+    PoolConnectionWrapper,
+    TransactionContext,
+)
+
+from app.core.monitoring.metrics_registry import Histogram, MetricsRegistry
+
+ACQUIRE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+class ConnectionAcquireTracker:
+    """
+    Measure the time spent waiting for a database connection (from the pool,
+    or the lock of a single connection) before each query and transaction.
+    It grows with the queue of requests once the pool is exhausted, before
+    the query latency does.
+    """
+
+    acquire_duration = Histogram(
+        "db_connection_acquire_seconds",
+        "Time spent waiting for a database connection",
+        ("connection",),
+        ACQUIRE_BUCKETS,
+    )
+    _listeners: list[Callable[[float], None]] = []
+
+    @classmethod
+    def install(cls) -> None:
+        """
+        Wrap the connection and transaction contexts of every loaded Tortoise
+        backend. Must be called after Tortoise.init so the backends are
+        imported.
+        """
+        context_classes = [
+            ConnectionWrapper,
+            PoolConnectionWrapper,
+            *cls._get_subclasses(TransactionContext),
+        ]
+        for context_class in context_classes:
+            # Savepoints run on the connection of their transaction
+            if issubclass(context_class, NestedTransactionContext):
+                continue
+            method = context_class.__dict__.get("__aenter__")
+            if (
+                method is None
+                or getattr(method, "__isabstractmethod__", False)
+                or getattr(method, "__acquire_tracked__", False)
+            ):
+                continue
+            context_class.__aenter__ = cls._track(method)
+
+    @classmethod
+    def add_listener(cls, listener: Callable[[float], None]) -> None:
+        """
+        Call the listener with the duration of every connection acquire
+        """
+        if listener not in cls._listeners:
+            cls._listeners.append(listener)
+
+    @classmethod
+    def _get_subclasses(cls, base: type) -> list[type]:
+        classes = []
+        for subclass in base.__subclasses__():
+            classes.extend([subclass, *cls._get_subclasses(subclass)])
+        return classes
+
+    @classmethod
+    def _track(cls, method):
+        @functools.wraps(method)
+        async def tracked(self, *args, **kwargs):
+            start = time.perf_counter()
+            result = await method(self, *args, **kwargs)
+            duration = time.perf_counter() - start
+            client = getattr(self, "client", None) or getattr(self, "connection", None)
+            cls.acquire_duration.observe(
+                (getattr(client, "connection_name", "default"),), duration
+            )
+            for listener in cls._listeners:
+                listener(duration)
+            return result
+
+        tracked.__acquire_tracked__ = True
+        return tracked
+
+
+MetricsRegistry.register(ConnectionAcquireTracker.acquire_duration)
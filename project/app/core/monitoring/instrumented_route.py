@@ -0,0 +1,56 @@
+import functools
+import inspect
+import time
+from typing import Any, Callable
+
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.monitoring.request_profile import get_current_profile
+
+
+class InstrumentedRoute(APIRoute):
+    """
+    APIRoute splitting the request time between the endpoint function and
+    the response validation/serialization done by FastAPI afterwards
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs):
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = self._time_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    @staticmethod
+    def _time_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(endpoint)
+        async def timed_endpoint(*args, **kwargs):
+            profile = get_current_profile()
+            start = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                if profile:
+                    profile.endpoint_finished_at = time.perf_counter()
+                    profile.handler_time = profile.endpoint_finished_at - start
+
+        return timed_endpoint
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        route_handler = super().get_route_handler()
+
+        async def instrumented_route_handler(request: Request) -> Response:
+            profile = get_current_profile()
+            if profile:
+                profile.route = self.path_format
+
+            response = await route_handler(request)
+
+            # Everything after the endpoint returns is validation and serialization
+            if profile and profile.endpoint_finished_at:
+                profile.serialization_time = (
+                    time.perf_counter() - profile.endpoint_finished_at
+                )
+            return response
+
+        return instrumented_route_handler
@@ -0,0 +1,191 @@
+import bisect
+import threading
+from collections import defaultdict
+from typing import Callable
+
+from app.core.monitoring.request_profile import RequestProfile
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+
+class Histogram:
+    """
+    Prometheus style cumulative histogram keyed by label values
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...],
+        buckets: tuple[float, ...],
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        self._counts: dict[tuple, list[int]] = defaultdict(
+            lambda: [0] * (len(buckets) + 1)
+        )
+        self._sums: dict[tuple, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float) -> None:
+        with self._lock:
+            self._counts[labels][bisect.bisect_left(self.buckets, value)] += 1
+            self._sums[labels] += value
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            for labels, counts in sorted(self._counts.items()):
+                label_text = ",".join(
+                    f'{name}="{value}"' for name, value in zip(self.label_names, labels)
+                )
+                cumulative = 0
+                for bound, count in zip((*self.buckets, "+Inf"), counts):
+                    cumulative += count
+                    lines.append(
+                        f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}'
+                    )
+                lines.append(f"{self.name}_sum{{{label_text}}} {self._sums[labels]}")
+                lines.append(f"{self.name}_count{{{label_text}}} {cumulative}")
+        return lines
+
+
+class Counter:
+    """
+    Prometheus style counter keyed by label values
+    """
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._values: dict[tuple, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] += amount
+
+    def get(self, labels: tuple) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                label_text = ",".join(
+                    f'{name}="{value}"' for name, value in zip(self.label_names, labels)
+                )
+                lines.append(f"{self.name}{{{label_text}}} {value}")
+        return lines
+
+
+class Gauge:
+    """
+    Prometheus style gauge whose value is collected when rendered
+    """
+
+    def __init__(self, name: str, documentation: str, collect: Callable[[], float]):
+        self.name = name
+        self.documentation = documentation
+        self.collect = collect
+
+    def render(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {self.collect()}",
+        ]
+
+
+class MetricsRegistry:
+    """
+    Per process request metrics exposed on /metrics
+    """
+
+    requests_total = Counter(
+        "http_requests_total",
+        "Total HTTP requests",
+        ("method", "route", "status"),
+    )
+    request_duration = Histogram(
+        "http_request_duration_seconds",
+        "Total time spent serving the request",
+        ("method", "route"),
+        LATENCY_BUCKETS,
+    )
+    handler_duration = Histogram(
+        "http_request_handler_duration_seconds",
+        "Time spent inside the endpoint function",
+        ("method", "route"),
+        LATENCY_BUCKETS,
+    )
+    serialization_duration = Histogram(
+        "http_request_serialization_duration_seconds",
+        "Time spent validating and serializing the response",
+        ("method", "route"),
+        LATENCY_BUCKETS,
+    )
+    db_duration = Histogram(
+        "http_request_db_duration_seconds",
+        "Time spent waiting on SQL queries",
+        ("method", "route"),
+        LATENCY_BUCKETS,
+    )
+    db_queries = Histogram(
+        "http_request_db_queries",
+        "Number of SQL queries issued by the request",
+        ("method", "route"),
+        QUERY_COUNT_BUCKETS,
+    )
+    single_flight_calls = Counter(
+        "single_flight_calls_total",
+        "Coalesced operations, executed or joined while already in flight",
+        ("operation", "result"),
+    )
+    extra_metrics: list = []
+
+    @classmethod
+    def observe_request(
+        cls, method: str, status: int, duration: float, profile: RequestProfile
+    ) -> None:
+        route = profile.route or "unmatched"
+        labels = (method, route)
+        cls.requests_total.inc((method, route, str(status)))
+        cls.request_duration.observe(labels, duration)
+        cls.handler_duration.observe(labels, profile.handler_time)
+        cls.serialization_duration.observe(labels, profile.serialization_time)
+        cls.db_duration.observe(labels, profile.db_time)
+        cls.db_queries.observe(labels, profile.query_count)
+
+    @classmethod
+    def register(cls, metric) -> None:
+        """
+        Expose an additional metric (anything with a render() method)
+        """
+        cls.extra_metrics.append(metric)
+
+    @classmethod
+    def render(cls) -> str:
+        metrics = [
+            cls.requests_total,
+            cls.request_duration,
+            cls.handler_duration,
+            cls.serialization_duration,
+            cls.db_duration,
+            cls.db_queries,
+            cls.single_flight_calls,
+            *cls.extra_metrics,
+        ]
+        return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import re
+import time
+from pathlib import Path
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.app_config import app_settings
+from app.core.monitoring.metrics_registry import MetricsRegistry
+from app.core.monitoring.request_profile import (
+    RequestProfile,
+    notify_profile_listeners,
+    reset_profile,
+    start_profile,
+)
+from app.core.monitoring.stack_sampler import StackSampler
+from app.core.monitoring.worker_startup import WorkerStartup
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilingMiddleware:
+    """
+    Collect per request timings, expose them as Server-Timing headers and
+    aggregate them into the /metrics histograms. With profiling enabled,
+    dumps a folded stack profile of requests slower than the threshold.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._sampling = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile, token = start_profile()
+        sampler = self._start_sampler()
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timings(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append(
+                    (
+                        b"server-timing",
+                        self._server_timing(
+                            profile, time.perf_counter() - start
+                        ).encode(),
+                    )
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timings)
+        finally:
+            duration = time.perf_counter() - start
+            reset_profile(token)
+            MetricsRegistry.observe_request(scope["method"], status, duration, profile)
+            WorkerStartup.observe_request(scope["method"], scope["path"], duration)
+            notify_profile_listeners(scope["method"], status, profile)
+            if app_settings.query_duplicate_warning:
+                self._warn_duplicate_queries(scope, profile)
+            if sampler:
+                await self._stop_sampler(sampler, scope, profile, duration)
+
+    @staticmethod
+    def _warn_duplicate_queries(scope: Scope, profile: RequestProfile) -> None:
+        for (sql, values), count in profile.get_duplicate_queries().items():
+            logger.warning(
+                "%s %s ran the same query %d times: %s %s",
+                scope["method"],
+                scope["path"],
+                count,
+                sql,
+                values,
+            )
+
+    @staticmethod
+    def _server_timing(profile: RequestProfile, total: float) -> str:
+        metrics = [
+            f'db;dur={profile.db_time * 1000:.2f};desc="{profile.query_count} queries"',
+            f"db-slowest;dur={profile.slowest_query_time * 1000:.2f}",
+            f"handler;dur={profile.handler_time * 1000:.2f}",
+            f"serialize;dur={profile.serialization_time * 1000:.2f}",
+            f"total;dur={total * 1000:.2f}",
+        ]
+        return ", ".join(metrics)
+
+    def _start_sampler(self) -> StackSampler | None:
+        # A single sampler at a time, the loop thread is shared by all requests
+        if not app_settings.profiling_enabled or self._sampling:
+            return None
+        self._sampling = True
+        sampler = StackSampler(app_settings.profiling_sample_interval)
+        sampler.start()
+        return sampler
+
+    async def _stop_sampler(
+        self,
+        sampler: StackSampler,
+        scope: Scope,
+        profile: RequestProfile,
+        duration: float,
+    ) -> None:
+        sampler.stop()
+        self._sampling = False
+        if duration * 1000 < app_settings.profiling_threshold_ms:
+            return
+
+        route = re.sub(r"[^\w]+", "_", profile.route or scope["path"]).strip("_")
+        output = Path(app_settings.profiling_output_dir) / (
+            f"{time.strftime('%Y%m%d-%H%M%S')}-{scope['method']}-{route}"
+            f"-{int(duration * 1000)}ms.folded"
+        )
+        logger.info(
+            "slow request %s %s (%.0f ms, slowest query: %s), profile in %s",
+            scope["method"],
+            scope["path"],
+            duration * 1000,
+            profile.slowest_query,
+            output,
+        )
+        await asyncio.to_thread(self._write_profile, output, sampler.folded())
+
+    @staticmethod
+    def _write_profile(output: Path, content: str) -> None:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(content)
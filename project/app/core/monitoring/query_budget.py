@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+
+from app.core.monitoring.request_profile import RequestProfile
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    """
+    Maximum number of SQL queries an endpoint may issue per request, and how
+    many of them may repeat an identical statement (same SQL and parameters)
+    """
+
+    max_queries: int
+    max_duplicates: int = 0
+
+    def check(self, endpoint: str, profile: RequestProfile) -> list[str]:
+        """
+        Compare the queries of a request against the budget
+        :param endpoint: endpoint description used in the messages
+        :param profile: profile of the request
+        :return: budget violations, empty when the request is within budget
+        :rtype: list[str]
+        """
+        violations = []
+        if profile.query_count > self.max_queries:
+            violations.append(
+                f"{endpoint} ran {profile.query_count} queries, "
+                f"budget is {self.max_queries}"
+            )
+
+        duplicates = profile.get_duplicate_queries()
+        duplicate_count = sum(count - 1 for count in duplicates.values())
+        if duplicate_count > self.max_duplicates:
+            repeated = "\n".join(
+                f"    {count}x {sql} {values}"
+                for (sql, values), count in duplicates.items()
+            )
+            violations.append(
+                f"{endpoint} repeated {duplicate_count} identical queries, "
+                f"budget is {self.max_duplicates}:\n{repeated}"
+            )
+        return violations
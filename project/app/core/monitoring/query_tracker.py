@@ -0,0 +1,91 @@
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from app.core.monitoring.request_profile import (
+    RequestProfile,
+    get_current_profile,
+    reset_profile,
+    start_profile,
+)
+
+TRACKED_METHODS = (
+    "execute_insert",
+    "execute_many",
+    "execute_query",
+    "execute_query_dict",
+    "execute_script",
+)
+
+# Backends call each other (e.g. transaction wrappers delegating to their
+# parent client), only the outermost call is recorded
+_inside_query: ContextVar[bool] = ContextVar("inside_tracked_query", default=False)
+
+
+class QueryTracker:
+    """
+    Record every SQL statement sent through Tortoise into the current
+    request profile
+    """
+
+    @classmethod
+    def install(cls) -> None:
+        """
+        Wrap the execute methods of every loaded Tortoise backend client.
+        Must be called after Tortoise.init so the backends are imported.
+        """
+        for client_class in cls._get_client_classes(BaseDBAsyncClient):
+            for method_name in TRACKED_METHODS:
+                method = client_class.__dict__.get(method_name)
+                if method is None or getattr(method, "__query_tracked__", False):
+                    continue
+                setattr(client_class, method_name, cls._track(method))
+
+    @staticmethod
+    @contextmanager
+    def track() -> Iterator[RequestProfile]:
+        """
+        Record the queries issued inside the block, outside of any request
+        (scripts, service level tests, shell sessions)
+        :return: profile filled with the queries of the block
+        :rtype: Iterator[RequestProfile]
+        """
+        profile, token = start_profile()
+        try:
+            yield profile
+        finally:
+            reset_profile(token)
+
+    @classmethod
+    def _get_client_classes(cls, base: type) -> list[type]:
+        classes = [base]
+        for subclass in base.__subclasses__():
+            classes.extend(cls._get_client_classes(subclass))
+        return classes
+
+    @staticmethod
+    def _track(method):
+        @functools.wraps(method)
+        async def tracked(self, query: str, *args, **kwargs):
+            profile = get_current_profile()
+            if profile is None or _inside_query.get():
+                return await method(self, query, *args, **kwargs)
+
+            token = _inside_query.set(True)
+            start = time.perf_counter()
+            try:
+                return await method(self, query, *args, **kwargs)
+            finally:
+                profile.record_query(
+                    query,
+                    args[0] if args else kwargs.get("values"),
+                    time.perf_counter() - start,
+                )
+                _inside_query.reset(token)
+
+        tracked.__query_tracked__ = True
+        return tracked
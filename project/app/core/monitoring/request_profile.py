@@ -0,0 +1,78 @@
+from collections import Counter
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+@dataclass
+class RequestProfile:
+    """
+    Timings collected while serving a single request, in seconds
+    """
+
+    route: str | None = None
+    query_count: int = 0
+    db_time: float = 0.0
+    slowest_query: str | None = None
+    slowest_query_time: float = 0.0
+    handler_time: float = 0.0
+    serialization_time: float = 0.0
+    endpoint_finished_at: float | None = None
+    # (sql, parameters) of every statement, to spot repeated identical queries
+    statements: list[tuple[str, str]] = field(default_factory=list)
+
+    def record_query(self, sql: str, values: list | None, duration: float) -> None:
+        self.query_count += 1
+        self.db_time += duration
+        self.statements.append((sql, repr(values)))
+        if duration >= self.slowest_query_time:
+            self.slowest_query = sql
+            self.slowest_query_time = duration
+
+    def get_duplicate_queries(self) -> dict[tuple[str, str], int]:
+        """
+        Identical statements (same SQL and parameters) issued more than once
+        :return: number of executions per duplicated statement
+        :rtype: dict[tuple[str, str], int]
+        """
+        return {
+            statement: count
+            for statement, count in Counter(self.statements).items()
+            if count > 1
+        }
+
+
+_current_profile: ContextVar[RequestProfile | None] = ContextVar(
+    "current_request_profile", default=None
+)
+
+
+def get_current_profile() -> RequestProfile | None:
+    return _current_profile.get()
+
+
+def start_profile() -> tuple[RequestProfile, Token]:
+    profile = RequestProfile()
+    return profile, _current_profile.set(profile)
+
+
+def reset_profile(token: Token) -> None:
+    _current_profile.reset(token)
+
+
+# Callbacks notified with (method, status, profile) once a request completes
+ProfileListener = Callable[[str, int, RequestProfile], None]
+_profile_listeners: list[ProfileListener] = []
+
+
+def add_profile_listener(listener: ProfileListener) -> None:
+    _profile_listeners.append(listener)
+
+
+def remove_profile_listener(listener: ProfileListener) -> None:
+    _profile_listeners.remove(listener)
+
+
+def notify_profile_listeners(method: str, status: int, profile: RequestProfile) -> None:
+    for listener in list(_profile_listeners):
+        listener(method, status, profile)
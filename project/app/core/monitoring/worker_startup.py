@@ -0,0 +1,52 @@
+import logging
+import os
+
+from app.core.monitoring.metrics_registry import Gauge, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerStartup:
+    """
+    Startup timings of this worker: duration of the warm-up and of the
+    first request served, the request paying for everything left cold
+    """
+
+    warmup_duration: float = 0.0
+    first_request_duration: float | None = None
+
+    @classmethod
+    def mark_ready(cls, warmup_duration: float) -> None:
+        cls.warmup_duration = warmup_duration
+        logger.info(
+            "worker %d warmed up in %.1f ms", os.getpid(), warmup_duration * 1000
+        )
+
+    @classmethod
+    def observe_request(cls, method: str, path: str, duration: float) -> None:
+        if cls.first_request_duration is not None:
+            return
+        cls.first_request_duration = duration
+        logger.info(
+            "worker %d first request %s %s took %.1f ms",
+            os.getpid(),
+            method,
+            path,
+            duration * 1000,
+        )
+
+
+MetricsRegistry.register(
+    Gauge(
+        "worker_warmup_seconds",
+        "Duration of the warm-up of this worker before accepting requests",
+        lambda: WorkerStartup.warmup_duration,
+    )
+)
+MetricsRegistry.register(
+    Gauge(
+        "worker_first_request_seconds",
+        "Duration of the first request served by this worker",
+        lambda: WorkerStartup.first_request_duration or 0.0,
+    )
+)
@@ -0,0 +1,9 @@
+from app.schemas.base_schema import BaseException, BaseExceptionInfo
+
+
+class RateLimitExceptionInfo(BaseExceptionInfo):
+    ERROR_TOO_MANY_REQUESTS = (8001, "Error too many requests, retry later", 429)
+
+
+class RateLimitException(BaseException):
+    pass
@@ -0,0 +1,99 @@
+import math
+from dataclasses import dataclass
+
+from app.app_config import app_settings
+from app.core.cache.cache_backend import local_backend_allowed
+from app.core.monitoring.metrics_registry import Counter, MetricsRegistry
+from app.core.rate_limit.rate_limit_exception import (
+    RateLimitException,
+    RateLimitExceptionInfo,
+)
+from app.core.rate_limit.token_buckets import (
+    LocalTokenBuckets,
+    RedisTokenBuckets,
+    TokenBuckets,
+)
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    rate: float  # tokens per second
+    burst: int
+
+
+def _create_backend() -> TokenBuckets | None:
+    if app_settings.rate_limit_backend == "redis":
+        return RedisTokenBuckets(app_settings.rate_limit_redis_url)
+    # With several local buckets, each worker would grant the whole limit
+    if app_settings.rate_limit_backend == "local" and local_backend_allowed(
+        "RATE_LIMIT_BACKEND"
+    ):
+        return LocalTokenBuckets(app_settings.rate_limit_max_keys)
+    return None
+
+
+def _parse_overrides(value: str) -> dict[tuple[str, str], RateLimitRule | None]:
+    """
+    Parse RATE_LIMITS, group.scope=rate/burst entries separated by commas
+    """
+    overrides = {}
+    for entry in filter(None, (item.strip() for item in value.split(","))):
+        try:
+            name, _, limit = entry.partition("=")
+            group, scope = name.strip().split(".")
+            rate, _, burst = limit.partition("/")
+            rule = RateLimitRule(float(rate), int(burst or math.ceil(float(rate))))
+        except ValueError:
+            raise ValueError(f"invalid RATE_LIMITS entry: {entry}")
+        overrides[(group, scope)] = rule if rule.rate > 0 else None
+    return overrides
+
+
+class RateLimiter:
+    """
+    Token buckets of the route groups, taken once per request per user (JWT
+    subject) and per workspace. The limits are declared by the routers and
+    can be overridden with RATE_LIMITS.
+    """
+
+    backend: TokenBuckets | None = _create_backend()
+    overrides = _parse_overrides(app_settings.rate_limits)
+    limited = Counter(
+        "rate_limited_requests_total",
+        "Requests rejected by the rate limits",
+        ("group", "scope"),
+    )
+
+    @classmethod
+    def configure(cls, backend: TokenBuckets | None) -> None:
+        cls.backend = backend
+
+    @classmethod
+    def get_rule(
+        cls, group: str, scope: str, default: RateLimitRule | None
+    ) -> RateLimitRule | None:
+        return cls.overrides.get((group, scope), default)
+
+    @classmethod
+    async def acquire(
+        cls, group: str, scope: str, identifier: str, rule: RateLimitRule
+    ) -> None:
+        """
+        Take a token from the bucket of the identifier
+        :raises RateLimitException: when the bucket is empty, with the
+            seconds until the next token in Retry-After
+        """
+        if cls.backend is None:
+            return
+        wait = await cls.backend.acquire(
+            f"{group}:{scope}:{identifier}", rule.rate, rule.burst
+        )
+        if wait > 0:
+            cls.limited.inc((group, scope))
+            raise RateLimitException(
+                RateLimitExceptionInfo.ERROR_TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+
+
+MetricsRegistry.register(RateLimiter.limited)
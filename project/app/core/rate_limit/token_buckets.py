@@ -0,0 +1,86 @@
+import time
+from collections import OrderedDict
+
+# Refill, take a token and report the wait in a single round trip. The time
+# of the server is used so that every instance shares the same clock.
+REDIS_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or burst
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(now - updated_at, 0) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class TokenBuckets:
+    """
+    Token buckets by key: a bucket holds up to burst tokens, refilled at
+    rate tokens per second, and each request takes one
+    """
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        """
+        Take a token from the bucket
+        :return: 0 when taken, otherwise seconds until a token is available
+        """
+        raise NotImplementedError
+
+
+class LocalTokenBuckets(TokenBuckets):
+    """
+    Per worker buckets, the least recently used are dropped beyond max_keys
+    (a dropped bucket comes back full)
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated_at) * rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class RedisTokenBuckets(TokenBuckets):
+    """
+    Buckets shared by every worker and instance, on any server speaking the
+    Redis protocol. Idle buckets expire once full again.
+    """
+
+    def __init__(self, url: str, prefix: str = "kanban:rate:"):
+        # Optional dependency, only needed when the backend is configured
+        from redis.asyncio import Redis
+
+        self.prefix = prefix
+        self._client = Redis.from_url(url)
+        self._script = self._client.register_script(REDIS_TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        wait = await self._script(keys=[self.prefix + key], args=[rate, burst])
+        return float(wait)
+
+    async def close(self) -> None:
+        await self._client.aclose()
@@ -35,3 +35,21 @@ async def decode_token(
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         )
+
+
+def get_token_subject(authorization: str | None) -> str | None:
+    """
+    Subject of the bearer token of an Authorization header, for the
+    middlewares running before the dependencies
+    :return: subject, None when the token is missing or invalid
+    """
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(
+            token, JWT_SECRET, algorithms=[JWT_ALGORITHM], audience="authenticated"
+        )
+    except JWTError:
+        return None
+    return payload.get("sub")
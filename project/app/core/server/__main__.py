@@ -0,0 +1,6 @@
+import logging
+
+from app.core.server.launcher import run
+
+logging.basicConfig(level=logging.INFO)
+run()
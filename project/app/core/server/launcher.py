@@ -0,0 +1,135 @@
+"""
+Server launcher, run with python -m app.core.server. SERVER_ENGINE selects
+the server:
+- uvicorn: uvicorn managing its own worker processes
+- gunicorn: gunicorn managing uvicorn workers (gunicorn.conf.py)
+- hypercorn: HTTP/2 (over TLS with SERVER_CERTFILE and SERVER_KEYFILE,
+  cleartext h2c otherwise) and HTTP/1.1
+
+uvloop and httptools are used when installed, the standard asyncio loop
+and h11 otherwise.
+"""
+
+import importlib.util
+import logging
+import os
+import sys
+
+from app.app_config import app_settings, get_workers
+
+logger = logging.getLogger(__name__)
+
+APPLICATION = "app.main:app"
+GUNICORN_CONFIG = "gunicorn.conf.py"
+
+ENGINES = ("uvicorn", "gunicorn", "hypercorn")
+LOOPS = {"uvloop": "uvloop", "asyncio": None}
+HTTP_PARSERS = {"httptools": "httptools", "h11": "h11"}
+
+
+def _installed(module: str | None) -> bool:
+    return module is None or importlib.util.find_spec(module) is not None
+
+
+def _select(setting: str, choice: str, implementations: dict[str, str | None]) -> str:
+    """
+    Pick an implementation: the first one installed for "auto" (they are
+    listed fastest first), the chosen one otherwise
+    """
+    if choice == "auto":
+        return next(
+            name for name, module in implementations.items() if _installed(module)
+        )
+    if choice not in implementations:
+        raise ValueError(
+            f"{setting} must be auto or one of {', '.join(implementations)}"
+        )
+    if not _installed(implementations[choice]):
+        raise RuntimeError(f"{setting}={choice} but {choice} is not installed")
+    return choice
+
+
+def select_loop() -> str:
+    # uvloop does not support Windows
+    loops = LOOPS if sys.platform != "win32" else {"asyncio": None}
+    return _select("SERVER_LOOP", app_settings.server_loop, loops)
+
+
+def select_http() -> str:
+    return _select("SERVER_HTTP", app_settings.server_http, HTTP_PARSERS)
+
+
+def get_limit_concurrency() -> int | None:
+    """
+    Connections and tasks served at once by a worker, beyond which uvicorn
+    answers 503 instead of queueing
+    """
+    return app_settings.server_limit_concurrency or None
+
+
+def uvicorn_options() -> dict:
+    """
+    Options of the uvicorn Config shared by the uvicorn engine and the
+    gunicorn workers
+    """
+    return {
+        "loop": select_loop(),
+        "http": select_http(),
+        "limit_concurrency": get_limit_concurrency(),
+    }
+
+
+def run_uvicorn() -> None:
+    import uvicorn
+
+    uvicorn.run(
+        APPLICATION,
+        host=app_settings.server_host,
+        port=app_settings.server_port,
+        workers=get_workers(),
+        backlog=app_settings.server_backlog,
+        timeout_keep_alive=app_settings.server_keepalive,
+        ssl_certfile=app_settings.server_certfile or None,
+        ssl_keyfile=app_settings.server_keyfile or None,
+        **uvicorn_options(),
+    )
+
+
+def run_gunicorn() -> None:
+    # gunicorn.conf.py reads the same settings
+    os.execvp("gunicorn", ["gunicorn", "-c", GUNICORN_CONFIG, APPLICATION])
+
+
+def run_hypercorn() -> None:
+    from hypercorn.config import Config
+    from hypercorn.run import run
+
+    config = Config()
+    config.application_path = APPLICATION
+    config.bind = [f"{app_settings.server_host}:{app_settings.server_port}"]
+    config.workers = get_workers()
+    config.worker_class = select_loop()
+    config.backlog = app_settings.server_backlog
+    config.keep_alive_timeout = app_settings.server_keepalive
+    if app_settings.server_certfile:
+        config.certfile = app_settings.server_certfile
+        config.keyfile = app_settings.server_keyfile
+    if get_limit_concurrency():
+        logger.warning("SERVER_LIMIT_CONCURRENCY is not supported by hypercorn")
+    sys.exit(run(config))
+
+
+def run() -> None:
+    engine = app_settings.server_engine
+    if engine not in ENGINES:
+        raise ValueError(f"SERVER_ENGINE must be one of {', '.join(ENGINES)}")
+    logger.info(
+        "starting %s: %d workers, %s loop, %s http",
+        engine,
+        get_workers(),
+        select_loop(),
+        select_http() if engine != "hypercorn" else "h2/h11",
+    )
+    {"uvicorn": run_uvicorn, "gunicorn": run_gunicorn, "hypercorn": run_hypercorn}[
+        engine
+    ]()
@@ -0,0 +1,13 @@
+from uvicorn.workers import UvicornWorker
+
+from app.core.server.launcher import uvicorn_options
+
+
+class TunedUvicornWorker(UvicornWorker):
+    """
+    Uvicorn worker of gunicorn with the event loop, HTTP parser and
+    concurrency limit of the launcher settings. Backlog and keep-alive are
+    gunicorn settings (gunicorn.conf.py), passed on by the base worker.
+    """
+
+    CONFIG_KWARGS = uvicorn_options()
@@ -1,6 +1,16 @@
+"""
+Supabase clients. The supabase packages are imported on first use: they
+weigh a large share of the startup time and most requests never reach
+Supabase.
+"""
+
 import os
+from typing import TYPE_CHECKING
+
+from app.app_config import app_settings
 
-from supabase._async.client import AsyncClient, create_client
+if TYPE_CHECKING:
+    from supabase._async.client import AsyncClient
 
 # Environment variables
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
@@ -8,35 +18,62 @@ SUPABASE_ANON_KEY = os.environ.get("SUPABASE_ANON_KEY")
 SUPABASE_SERVICE_ROLE_KEY = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
 
 # Cached clients (Singleton)
-_supabase_anon: AsyncClient = None
-_supabase_admin: AsyncClient = None
+_supabase_anon: "AsyncClient" = None
+_supabase_admin: "AsyncClient" = None
+_supabase_stub = None
+
+
+def _get_stub():
+    global _supabase_stub
+    if _supabase_stub is None:
+        from app.core.supabase.supabase_stub import SupabaseStub
+
+        _supabase_stub = SupabaseStub()
+    return _supabase_stub
+
 
+def auth_errors() -> tuple[type[Exception], ...]:
+    """
+    Errors raised by the Supabase auth API, for except clauses
+    """
+    from supabase_auth.errors import AuthApiError, AuthRetryableError
+
+    return AuthApiError, AuthRetryableError
 
-async def get_supabase() -> AsyncClient:
+
+async def get_supabase() -> "AsyncClient":
     """
     Returns the public Supabase client (using ANON key).
     Use this for operations like login, registration, etc.
     Implements singleton pattern.
     """
     global _supabase_anon
+    if app_settings.supabase_stub:
+        return _get_stub()
     if _supabase_anon is None:
         if not SUPABASE_URL or not SUPABASE_ANON_KEY:
             raise RuntimeError("SUPABASE_URL or SUPABASE_ANON_KEY not configured")
+        from supabase._async.client import create_client
+
         _supabase_anon = await create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
     return _supabase_anon
 
 
-async def get_supabase_admin() -> AsyncClient:
+async def get_supabase_admin() -> "AsyncClient":
     """
     Returns the admin Supabase client (using SERVICE_ROLE key).
     Use this for privileged operations like deleting users.
     Implements singleton pattern.
     """
     global _supabase_admin
+    if app_settings.supabase_stub:
+        return _get_stub()
     if _supabase_admin is None:
         if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
             raise RuntimeError(
                 "SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY not configured"
             )
+        from supabase._async.client import create_client
+
         _supabase_admin = await create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
     return _supabase_admin
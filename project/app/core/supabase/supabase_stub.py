@@ -0,0 +1,124 @@
+"""
+In-process stand-in for the Supabase auth API, enabled with SUPABASE_STUB.
+Users and refresh tokens live in memory and access tokens are signed with
+SUPABASE_JWT_TOKEN like the real ones, so the API can be run, benchmarked
+and tested without reaching Supabase. An optional latency simulates the
+upstream round trip. Never enable it in production.
+"""
+
+import asyncio
+import secrets
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from jose import jwt
+from supabase_auth.errors import AuthApiError
+
+from app.app_config import app_settings
+from app.core.security.decode_token import JWT_ALGORITHM, JWT_SECRET
+
+
+@dataclass
+class StubUser:
+    id: str
+    email: str
+    password: str
+
+
+@dataclass
+class StubSession:
+    access_token: str
+    refresh_token: str
+    user: StubUser
+
+
+@dataclass
+class StubAuthResponse:
+    user: StubUser | None
+    session: StubSession | None
+
+
+@dataclass
+class StubAuth:
+    users: dict[str, StubUser] = field(default_factory=dict)
+    refresh_tokens: dict[str, str] = field(default_factory=dict)
+    # Upstream calls received, to check the coalescing of the callers
+    calls: dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.admin = StubAdmin(self)
+
+    async def _round_trip(self, name: str) -> None:
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if app_settings.supabase_stub_latency_ms:
+            await asyncio.sleep(app_settings.supabase_stub_latency_ms / 1000)
+
+    def _issue_session(self, user: StubUser) -> StubSession:
+        now = int(time.time())
+        access_token = jwt.encode(
+            {
+                "sub": user.id,
+                "email": user.email,
+                "aud": "authenticated",
+                "iat": now,
+                "exp": now + 3600,
+            },
+            JWT_SECRET,
+            algorithm=JWT_ALGORITHM,
+        )
+        refresh_token = secrets.token_urlsafe(32)
+        self.refresh_tokens[refresh_token] = user.email
+        return StubSession(access_token, refresh_token, user)
+
+    async def sign_up(self, credentials: dict) -> StubAuthResponse:
+        await self._round_trip("sign_up")
+        email = credentials["email"]
+        if email in self.users:
+            raise AuthApiError("User already registered", 422, "user_already_exists")
+        user = StubUser(str(uuid.uuid4()), email, credentials["password"])
+        self.users[email] = user
+        return StubAuthResponse(user, self._issue_session(user))
+
+    async def sign_in_with_password(self, credentials: dict) -> StubAuthResponse:
+        await self._round_trip("sign_in_with_password")
+        user = self.users.get(credentials["email"])
+        if not user or user.password != credentials["password"]:
+            raise AuthApiError("Invalid login credentials", 400, "invalid_credentials")
+        return StubAuthResponse(user, self._issue_session(user))
+
+    async def refresh_session(self, refresh_token: str) -> StubAuthResponse:
+        await self._round_trip("refresh_session")
+        email = self.refresh_tokens.pop(refresh_token, None)
+        if email is None or email not in self.users:
+            raise AuthApiError("Invalid Refresh Token", 400, "refresh_token_not_found")
+        user = self.users[email]
+        return StubAuthResponse(user, self._issue_session(user))
+
+    async def reset_password_email(self, email: str) -> None:
+        await self._round_trip("reset_password_email")
+
+    async def update_user(self, attributes: dict, access_token: str) -> None:
+        await self._round_trip("update_user")
+        email = jwt.get_unverified_claims(access_token).get("email")
+        if email not in self.users:
+            raise AuthApiError("User not found", 404, "user_not_found")
+        self.users[email].password = attributes["password"]
+
+
+@dataclass
+class StubAdmin:
+    auth: StubAuth
+
+    async def delete_user(self, user_id: str) -> None:
+        await self.auth._round_trip("delete_user")
+        for email, user in list(self.auth.users.items()):
+            if user.id == user_id:
+                del self.auth.users[email]
+
+
+class SupabaseStub:
+    """Client exposing the subset of the auth API used by the services"""
+
+    def __init__(self) -> None:
+        self.auth = StubAuth()
@@ -0,0 +1,113 @@
+"""
+Warm-up of a worker, so its first requests do not pay for what is built on
+first use: database connections, the OpenAPI schema, the Supabase clients,
+compiled queries and board snapshots.
+
+preload() runs once in the gunicorn master when preload_app is set, the
+forked workers share what it built. warm_up() runs in each worker from the
+lifespan, after Tortoise is initialized and before requests are accepted.
+"""
+
+import asyncio
+import importlib
+import logging
+import time
+
+from fastapi import FastAPI
+from tortoise import connections
+
+from app.app_config import app_settings
+from app.core.monitoring.worker_startup import WorkerStartup
+from app.core.supabase import supabase_client
+from app.modules.database_module import DatabaseModule
+from app.modules.database_module.settings import PRIMARY_CONNECTION
+from app.repositories.board_repository import BoardRepository
+from app.services.board_service.board_snapshot_cache import BoardSnapshotCache
+from app.services.task_service.task_service import TaskService
+
+logger = logging.getLogger(__name__)
+
+# Imported on first use by the workers (see supabase_client), imported
+# before fork when preloading instead
+PRELOADED_MODULES = ("supabase._async.client", "supabase_auth.errors")
+
+# Latest tasks considered to rank the boards by activity
+ACTIVE_BOARDS_SAMPLE_PER_BOARD = 100
+
+
+def preload(app: FastAPI) -> None:
+    """
+    Build the shared state before the workers are forked
+    """
+    for module in PRELOADED_MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            logger.warning("%s not installed, not preloaded", module)
+    app.openapi()
+
+
+async def warm_up(app: FastAPI) -> None:
+    start = time.perf_counter()
+    await _open_connections()
+    # Cached on the app, built by preload() when the app was preloaded
+    app.openapi()
+    await _create_supabase_clients()
+    await _prime_board_snapshots()
+    WorkerStartup.mark_ready(time.perf_counter() - start)
+
+
+async def _open_connections() -> None:
+    """
+    Open the connections of every database. Concurrent queries make the
+    pools grow to warmup_connections, the connections then stay pooled.
+    A replica failing is reported and left to the replica monitor.
+    """
+    for name in connections.db_config:
+        connection = connections.get(name)
+        try:
+            await asyncio.gather(
+                *(
+                    connection.execute_query("SELECT 1")
+                    for _ in range(max(app_settings.warmup_connections, 1))
+                )
+            )
+        except Exception:
+            if name == PRIMARY_CONNECTION:
+                raise
+            logger.warning("warm-up of %s failed", name, exc_info=True)
+
+
+async def _create_supabase_clients() -> None:
+    if app_settings.supabase_stub or not supabase_client.SUPABASE_URL:
+        return
+    try:
+        if supabase_client.SUPABASE_ANON_KEY:
+            await supabase_client.get_supabase()
+        if supabase_client.SUPABASE_SERVICE_ROLE_KEY:
+            await supabase_client.get_supabase_admin()
+    except Exception:
+        logger.warning("warm-up of the Supabase clients failed", exc_info=True)
+
+
+async def _prime_board_snapshots() -> None:
+    """
+    Build the snapshots of the most active boards of each shard, which also
+    compiles the queries and serializers of the board reads
+    """
+    limit = app_settings.warmup_prime_boards
+    if limit <= 0 or BoardSnapshotCache.backend is None:
+        return
+
+    async def prime_shard() -> None:
+        board_ids = await BoardRepository.get_most_active_board_ids(
+            limit, limit * ACTIVE_BOARDS_SAMPLE_PER_BOARD
+        )
+        for board_id in board_ids:
+            await TaskService.get_board_snapshot(board_id)
+
+    try:
+        await DatabaseModule.gather_shards(prime_shard)
+    except Exception as exception:
+        # An empty database (schema not generated yet) included
+        logger.warning("board snapshots not primed: %s", exception)
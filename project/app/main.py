@@ -1,7 +1,7 @@
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
-import uvicorn
 from fastapi import APIRouter, FastAPI, Request
 from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
@@ -12,13 +12,28 @@ from app.api.app import (
     auth_router,
     board_router,
     column_router,
+    metrics_router,
     task_router,
     user_router,
     workspace_router,
 )
 from app.app_config import app_settings
+from app.core.admission.admission_controller import AdmissionController
+from app.core.middlewares.compression_middleware import CompressionMiddleware
+from app.core.middlewares.idempotency_middleware import IdempotencyMiddleware
+from app.core.monitoring.connection_acquire_tracker import ConnectionAcquireTracker
+from app.core.monitoring.profiling_middleware import ProfilingMiddleware
+from app.core.monitoring.query_tracker import QueryTracker
+from app.core.warmup.worker_warmup import warm_up
+from app.modules.database_module.database_router import DatabaseRouter
 from app.modules.database_module.settings import module_settings
+from app.modules.database_module.shard_router import ShardRouter
+from app.modules.database_module.slow_database_stub import SlowDatabaseStub
 from app.schemas.base_schema import BaseException
+from app.services.auth_service.session_sweeper import SessionSweeper
+from app.services.permission_service.membership_invalidation_channel import (
+    MembershipInvalidationChannel,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +46,7 @@ def application_service_handler(_: Request, exception: Exception) -> JSONRespons
                 obj=exception.detail,
                 exclude_none=True,
             ),
+            headers=exception.headers,
         )
 
     return JSONResponse(
@@ -43,14 +59,59 @@ def application_service_handler(_: Request, exception: Exception) -> JSONRespons
 
 
 @asynccontextmanager
-async def lifespan(_app: FastAPI):
+async def lifespan(application: FastAPI):
     # Init Tortoise
-    await Tortoise.init(
-        db_url=module_settings.database_url,
-        modules={"default": ["app.modules.database_module.models.default"]},
-    )
+    await Tortoise.init(config=module_settings.get_tortoise_config())
+    QueryTracker.install()
+    # Connection waits drive the admission control
+    ConnectionAcquireTracker.install()
+    ConnectionAcquireTracker.add_listener(AdmissionController.observe_acquire)
+    if module_settings.database_stub_latency_ms:
+        SlowDatabaseStub.install(module_settings.database_stub_latency_ms / 1000)
+
+    # Shard of each workspace, kept up to date for the workspaces moved
+    # between shards by the other processes
+    shard_map_monitor = None
+    if ShardRouter.is_sharded():
+        await ShardRouter.refresh_shard_map()
+        shard_map_monitor = asyncio.create_task(ShardRouter.monitor_shard_map())
+
+    # Build what the first requests would otherwise pay for
+    if app_settings.warmup_enabled:
+        await warm_up(application)
+
+    # Keep track of the replica lag to stop reading from lagging replicas
+    replica_monitor = None
+    if DatabaseRouter.has_replicas():
+        replica_monitor = asyncio.create_task(DatabaseRouter.monitor_replica_lag())
+
+    # Share the invalidations of the membership index with the other workers
+    membership_channel = membership_subscriber = None
+    if app_settings.membership_invalidation_redis_url:
+        membership_channel = MembershipInvalidationChannel(
+            app_settings.membership_invalidation_redis_url
+        )
+        membership_subscriber = asyncio.create_task(membership_channel.run())
+
+    # Prune the sessions left unused (never logged out)
+    session_sweeper = None
+    if app_settings.session_sweep_interval > 0:
+        session_sweeper = asyncio.create_task(SessionSweeper.run())
 
     yield
+
+    for task in (
+        shard_map_monitor,
+        replica_monitor,
+        membership_subscriber,
+        session_sweeper,
+    ):
+        if task:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    if membership_channel:
+        await membership_channel.close()
     await Tortoise.close_connections()
 
 
@@ -63,6 +124,10 @@ def create_app() -> FastAPI:
     )
 
     # Middlewares
+    # Run the mutations sent with an Idempotency-Key once, replay their
+    # response to retries (innermost, replays get fresh CORS headers)
+    application.add_middleware(IdempotencyMiddleware)
+
     # Add CORS origins
     application.add_middleware(
         CORSMiddleware,
@@ -70,8 +135,21 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["Server-Timing"],
     )
 
+    # Compress large responses (board snapshots), inside the profiling so
+    # the compression time is part of the request duration
+    application.add_middleware(
+        CompressionMiddleware,
+        minimum_size=app_settings.compression_minimum_size,
+        gzip_level=app_settings.compression_gzip_level,
+        brotli_quality=app_settings.compression_brotli_quality,
+    )
+
+    # Per request query count and timings (Server-Timing header and /metrics)
+    application.add_middleware(ProfilingMiddleware)
+
     # Handlers
     application.add_exception_handler(BaseException, application_service_handler)
 
@@ -90,10 +168,13 @@ def create_app() -> FastAPI:
     application.include_router(
         api_version_router, prefix=f"/api/v{app_settings.api_version}"
     )
+    application.include_router(metrics_router, tags=["Metrics"])
     return application
 
 
 app = create_app()
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000)
+    from app.core.server.launcher import run
+
+    run()
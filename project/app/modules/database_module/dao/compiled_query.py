@@ -0,0 +1,180 @@
+import itertools
+from typing import Any, Callable, Type
+
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.queryset import AwaitableQuery
+
+from app.modules.database_module.models.database_model import DatabaseModel
+
+# Parameter template entry: (True, filter key) for a runtime value,
+# (False, value) for a constant emitted by the query builder (e.g. LIMIT 1)
+ParamTemplate = list[tuple[bool, Any]]
+
+COMPILABLE_TYPES = (int, str)
+STRING_SENTINEL = "\x00compiled_query_param_"
+
+
+class CompiledQuery:
+    """
+    Cache of the parameterized SQL of fixed-shape lookups.
+
+    The query builder runs once per shape (model, filter keys, ordering and
+    dialect); later calls only bind the values and send the same SQL text,
+    which asyncpg keeps as a prepared statement in its per-connection cache.
+    """
+
+    _statements: dict[tuple, tuple[str, ParamTemplate] | None] = {}
+
+    @classmethod
+    async def fetch_first(
+        cls,
+        model: Type[DatabaseModel],
+        filters: dict,
+        connection: BaseDBAsyncClient = None,
+    ) -> DatabaseModel | None:
+        """
+        Get the first entity matching the equality filters
+        :param model: entity model to find
+        :param filters: filters to find the entity
+        :param connection: connection to use, the model default if empty
+        :return: Result found if exists
+        :rtype: DatabaseModel | None
+        """
+        rows = await cls._execute(
+            "first",
+            model,
+            filters,
+            connection,
+            lambda qs: qs.first(),
+        )
+        if rows is None:
+            return await model.filter(**filters).using_db(connection).first()
+        return model._init_from_db(**dict(rows[0])) if rows else None
+
+    @classmethod
+    async def fetch_all(
+        cls,
+        model: Type[DatabaseModel],
+        filters: dict,
+        order: str = None,
+        connection: BaseDBAsyncClient = None,
+    ) -> list[DatabaseModel]:
+        """
+        Get every entity matching the equality filters
+        :param model: entity model to find
+        :param filters: filters to find the entities
+        :param order: field to order by
+        :param connection: connection to use, the model default if empty
+        :return: Results found
+        :rtype: list[DatabaseModel]
+        """
+        rows = await cls._execute(
+            f"all:{order}",
+            model,
+            filters,
+            connection,
+            lambda qs: qs.order_by(order) if order else qs,
+        )
+        if rows is None:
+            data = model.filter(**filters).using_db(connection)
+            return await (data.order_by(order) if order else data)
+        return [model._init_from_db(**dict(row)) for row in rows]
+
+    @classmethod
+    async def exists(
+        cls,
+        model: Type[DatabaseModel],
+        filters: dict,
+        connection: BaseDBAsyncClient = None,
+    ) -> bool:
+        """
+        Check if any entity matches the equality filters
+        :param model: entity model to check
+        :param filters: filters to match
+        :param connection: connection to use, the model default if empty
+        :return: True if a row matches
+        :rtype: bool
+        """
+        rows = await cls._execute(
+            "exists",
+            model,
+            filters,
+            connection,
+            lambda qs: qs.exists(),
+        )
+        if rows is None:
+            return await model.filter(**filters).using_db(connection).exists()
+        return bool(rows)
+
+    @classmethod
+    async def _execute(
+        cls,
+        kind: str,
+        model: Type[DatabaseModel],
+        filters: dict,
+        connection: BaseDBAsyncClient | None,
+        shape: Callable[[Any], AwaitableQuery],
+    ) -> list | None:
+        """
+        Run the cached statement, returns None when the filters can not be
+        compiled and the caller has to fall back to the query builder
+        """
+        if not all(type(value) in COMPILABLE_TYPES for value in filters.values()):
+            return None
+
+        connection = connection or model._choose_db()
+        key = (
+            kind,
+            model,
+            tuple(filters),
+            tuple(type(value) for value in filters.values()),
+            connection.capabilities.dialect,
+        )
+        if key not in cls._statements:
+            cls._statements[key] = cls._compile(model, filters, connection, shape)
+
+        statement = cls._statements[key]
+        if statement is None:
+            return None
+
+        sql, template = statement
+        values = [filters[item] if is_arg else item for is_arg, item in template]
+        _, rows = await connection.execute_query(sql, values)
+        return rows
+
+    @staticmethod
+    def _compile(
+        model: Type[DatabaseModel],
+        filters: dict,
+        connection: BaseDBAsyncClient,
+        shape: Callable[[Any], AwaitableQuery],
+    ) -> tuple[str, ParamTemplate] | None:
+        """
+        Build the query once with sentinel values and record where each filter
+        value lands in the parameter list
+        """
+        negative = itertools.count(-1_000_000_001, -1)
+        sentinels = {
+            key: (next(negative) if type(value) is int else f"{STRING_SENTINEL}{index}")
+            for index, (key, value) in enumerate(filters.items())
+        }
+        keys_by_sentinel = {sentinel: key for key, sentinel in sentinels.items()}
+
+        query = shape(model.filter(**sentinels).using_db(connection))
+        query._choose_db_if_not_chosen()
+        query._make_query()
+        sql, params = query.query.get_parameterized_sql()
+
+        template: ParamTemplate = []
+        for param in params:
+            if param in keys_by_sentinel:
+                template.append((True, keys_by_sentinel[param]))
+            elif isinstance(param, str) and STRING_SENTINEL in param:
+                # The builder transformed the value (e.g. LIKE patterns)
+                return None
+            else:
+                template.append((False, param))
+
+        if {key for is_arg, key in template if is_arg} != set(filters):
+            return None
+        return sql, template
@@ -1,11 +1,74 @@
-from typing import Type
+import re
+from typing import Awaitable, Callable, Type, TypeVar
 
+from pypika_tortoise import Table
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
 from tortoise.expressions import Q
 
+from app.modules.database_module.dao.compiled_query import CompiledQuery
+from app.modules.database_module.database_router import DatabaseRouter
 from app.modules.database_module.models.database_model import DatabaseModel
+from app.modules.database_module.settings import PRIMARY_CONNECTION
+from app.modules.database_module.shard_router import ShardRouter
+
+T = TypeVar("T")
 
 
 class GenericDao:
+    @classmethod
+    def get_read_connection(cls) -> BaseDBAsyncClient | None:
+        """
+        Get the connection for read-only queries that tolerate replica lag
+        :return: replica connection, None means the primary connection
+        :rtype: BaseDBAsyncClient | None
+        """
+        return DatabaseRouter.get_read_connection()
+
+    @classmethod
+    def use_workspace_shard(cls, workspace_id: int) -> None:
+        """
+        Run the remaining queries of the request on the shard of a workspace
+        :param workspace_id: workspace identifier, from the shard map
+        :raises ShardException: if the workspace is being moved
+        """
+        ShardRouter.bind_workspace(workspace_id)
+
+    @classmethod
+    async def use_entity_shard(
+        cls, model: Type[DatabaseModel], identifier: int
+    ) -> None:
+        """
+        Run the remaining queries of the request on the shard holding an
+        entity, looked up on every shard. Left unchanged if no shard holds it.
+        :param model: entity model to find
+        :param identifier: entity identifier
+        """
+        shard = await ShardRouter.locate(model, identifier)
+        if shard:
+            ShardRouter.bind(shard)
+
+    @classmethod
+    async def gather_shards(cls, query: Callable[[], Awaitable[T]]) -> list[T]:
+        """
+        Run a query on every shard concurrently, for the queries spanning
+        the workspaces of several shards (e.g. the workspaces of a user)
+        :param query: coroutine function running the query
+        :return: result of each shard
+        :rtype: list[T]
+        """
+        return await ShardRouter.gather(query)
+
+    @classmethod
+    async def fetch_raw_sharded(cls, query: str, values: list = None) -> list[dict]:
+        """
+        Run a read-only SQL statement on every shard, see fetch_raw
+        :return: rows of every shard, concatenated
+        :rtype: list[dict]
+        """
+        results = await ShardRouter.gather(lambda: cls.fetch_raw(query, values))
+        return [row for rows in results for row in rows]
+
     @classmethod
     async def post_entity(
         cls, model: Type[DatabaseModel], data: dict
@@ -17,6 +80,11 @@ class GenericDao:
         :return: Object created
         :rtype: DatabaseModel | None
         """
+        DatabaseRouter.stick_to_primary()
+        if ShardRouter.is_replicated(model):
+            entity = await ShardRouter.on_catalog(lambda: model.create(**data))
+            await ShardRouter.replicate(entity)
+            return entity
         return await model.create(**data)
 
     @classmethod
@@ -32,7 +100,7 @@ class GenericDao:
         :rtype: DatabaseModel | None
         """
         filters = filters if filters else {}
-        return await model.filter(id=identifier).filter(**filters).first()
+        return await CompiledQuery.fetch_first(model, {"id": identifier, **filters})
 
     @classmethod
     async def get_entity_filtered(
@@ -45,19 +113,125 @@ class GenericDao:
         :return: Result found if exists
         :rtype: DatabaseModel | None
         """
-        return await model.filter(**filters).first()
+        return await CompiledQuery.fetch_first(model, filters)
+
+    @classmethod
+    async def exists_entity(cls, model: Type[DatabaseModel], filters: dict) -> bool:
+        """
+        Check if an object matching the filters exists
+        :param model: entity model to find
+        :param filters: filters to find the entity
+        :return: True if the entity exists
+        :rtype: bool
+        """
+        return await CompiledQuery.exists(model, filters)
 
     @classmethod
     async def get_all_entity_filtered(
         cls, model: Type[DatabaseModel], filters: dict = None, order: str = None
     ) -> list[DatabaseModel] | None:
         filters = filters if filters else {}
-        data = model.filter(**filters).all()
+        return await CompiledQuery.fetch_all(
+            model, filters, order, cls.get_read_connection()
+        )
 
-        if order:
-            data = data.order_by(order)
+    @classmethod
+    async def fetch_raw(cls, query: str, values: list = None) -> list[dict]:
+        """
+        Run a read-only SQL statement for aggregates the query builder cannot
+        express in a single query
+        :param query: SQL with numbered placeholders ($1, $2, ...)
+        :param values: values bound to the placeholders
+        :return: rows as dicts
+        :rtype: list[dict]
+        """
+        connection = cls.get_read_connection() or connections.get(PRIMARY_CONNECTION)
+        if connection.capabilities.dialect == "sqlite":
+            query = re.sub(r"\$(\d+)", r"?\1", query)
+        return await connection.execute_query_dict(query, values or [])
+
+    @classmethod
+    async def get_related_ids(
+        cls, model: Type[DatabaseModel], relation: str, identifier: int, ids: set
+    ) -> set[int]:
+        """
+        Get which of the given identifiers are already related to the entity
+        through a many to many field, in one query on the primary
+        :param model: entity model holding the many to many field
+        :param relation: name of the many to many field
+        :param identifier: entity identifier
+        :param ids: related identifiers to check
+        :return: identifiers already related
+        :rtype: set[int]
+        """
+        if not ids:
+            return set()
+        field = model._meta.fields_map[relation]
+        through = Table(field.through)
+        connection = connections.get(PRIMARY_CONNECTION)
+        query = (
+            connection.query_class.from_(through)
+            .select(through[field.forward_key])
+            .where(through[field.backward_key] == identifier)
+            .where(through[field.forward_key].isin(list(ids)))
+        )
+        _, rows = await connection.execute_query(*query.get_parameterized_sql())
+        return {row[field.forward_key] for row in rows}
+
+    @classmethod
+    async def add_related(
+        cls, model: Type[DatabaseModel], relation: str, identifier: int, ids: set
+    ) -> None:
+        """
+        Insert the through table rows relating the entity with the given
+        identifiers in one statement. Existing relations are skipped, also
+        when inserted concurrently.
+        :param model: entity model holding the many to many field
+        :param relation: name of the many to many field
+        :param identifier: entity identifier
+        :param ids: related identifiers to add
+        """
+        if not ids:
+            return
+        DatabaseRouter.stick_to_primary()
+        field = model._meta.fields_map[relation]
+        through = Table(field.through)
+        connection = connections.get(PRIMARY_CONNECTION)
+        query = (
+            connection.query_class.into(through)
+            .columns(through[field.backward_key], through[field.forward_key])
+            .on_conflict(field.backward_key, field.forward_key)
+            .do_nothing()
+        )
+        for related_id in sorted(ids):
+            query = query.insert(identifier, related_id)
+        await connection.execute_query(*query.get_parameterized_sql())
 
-        return await data
+    @classmethod
+    async def remove_related(
+        cls, model: Type[DatabaseModel], relation: str, identifier: int, ids: set
+    ) -> None:
+        """
+        Delete the through table rows relating the entity with the given
+        identifiers in one statement
+        :param model: entity model holding the many to many field
+        :param relation: name of the many to many field
+        :param identifier: entity identifier
+        :param ids: related identifiers to remove
+        """
+        if not ids:
+            return
+        DatabaseRouter.stick_to_primary()
+        field = model._meta.fields_map[relation]
+        through = Table(field.through)
+        connection = connections.get(PRIMARY_CONNECTION)
+        query = (
+            connection.query_class.from_(through)
+            .where(through[field.backward_key] == identifier)
+            .where(through[field.forward_key].isin(list(ids)))
+            .delete()
+        )
+        await connection.execute_query(*query.get_parameterized_sql())
 
     @classmethod
     async def get_all_entity_filtered_paginated(
@@ -74,6 +248,7 @@ class GenericDao:
         exclude = exclude or {}
 
         data = model.filter(q, **filters) if q else model.filter(**filters)
+        data = data.using_db(cls.get_read_connection())
 
         if exclude:
             data = data.exclude(**exclude)
@@ -90,20 +265,38 @@ class GenericDao:
         data: dict,
         identifier: int,
     ) -> DatabaseModel | None:
-        entity = await model.filter(id=identifier).first()
-        if not entity:
-            return None
+        DatabaseRouter.stick_to_primary()
+
+        async def put() -> DatabaseModel | None:
+            entity = await model.filter(id=identifier).first()
+            if not entity:
+                return None
 
-        for key, value in data.items():
-            setattr(entity, key, value)
+            for key, value in data.items():
+                setattr(entity, key, value)
 
-        await entity.save()
-        return entity
+            await entity.save()
+            return entity
+
+        if ShardRouter.is_replicated(model):
+            entity = await ShardRouter.on_catalog(put)
+            if entity:
+                await ShardRouter.replicate(entity)
+            return entity
+        return await put()
 
     @classmethod
     async def remove_entity(
         cls, model: Type[DatabaseModel], identifier: int
     ) -> DatabaseModel | None:
-        entity = await model.filter(id=identifier).first()
-        await model.filter(id=identifier).delete()
-        return entity
+        DatabaseRouter.stick_to_primary()
+
+        async def remove() -> DatabaseModel | None:
+            entity = await model.filter(id=identifier).first()
+            await model.filter(id=identifier).delete()
+            return entity
+
+        if ShardRouter.is_replicated(model):
+            # Deleted from every shard, the row of the catalog is returned
+            return (await ShardRouter.gather(remove))[0]
+        return await remove()
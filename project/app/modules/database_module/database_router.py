@@ -0,0 +1,116 @@
+import asyncio
+import itertools
+import logging
+from contextvars import ContextVar
+
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from app.modules.database_module.settings import (
+    CATALOG_SHARD,
+    REPLICA_CONNECTION_PREFIX,
+    module_settings,
+)
+from app.modules.database_module.shard_router import ShardRouter
+
+logger = logging.getLogger(__name__)
+
+# Set once the current request has written to the primary, so that every
+# following read of the same request sees its own writes
+_stick_to_primary: ContextVar[bool] = ContextVar("stick_to_primary", default=False)
+
+# A replica having replayed everything it received is up to date, however
+# old its last replayed transaction (idle primary)
+POSTGRES_LAG_QUERY = (
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+    "THEN 0 ELSE COALESCE("
+    "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0"
+    ") END AS lag"
+)
+
+
+class DatabaseRouter:
+    """
+    Route read-only queries to the read replicas and everything else to the
+    primary connection
+    """
+
+    _replicas: list[str] = [
+        f"{REPLICA_CONNECTION_PREFIX}{index}"
+        for index in range(len(module_settings.get_replica_urls()))
+    ]
+    _replica_lag: dict[str, float] = {}
+    _round_robin = itertools.count()
+
+    @classmethod
+    def stick_to_primary(cls) -> None:
+        """
+        Send every remaining read of the current request to the primary
+        """
+        _stick_to_primary.set(True)
+
+    @classmethod
+    def is_stuck_to_primary(cls) -> bool:
+        return _stick_to_primary.get()
+
+    @classmethod
+    def get_healthy_replicas(cls) -> list[str]:
+        """
+        Replicas whose last measured lag is within the configured bounds.
+        Replicas never measured are considered healthy.
+        """
+        return [
+            replica
+            for replica in cls._replicas
+            if cls._replica_lag.get(replica, 0)
+            <= module_settings.replica_max_lag_seconds
+        ]
+
+    @classmethod
+    def get_read_connection(cls) -> BaseDBAsyncClient | None:
+        """
+        Get the connection to use for a read-only query
+        :return: replica connection or None to use the primary connection
+        :rtype: BaseDBAsyncClient | None
+        """
+        # The replicas are the replicas of the catalog shard
+        if cls.is_stuck_to_primary() or ShardRouter.get_bound_shard() != CATALOG_SHARD:
+            return None
+
+        replicas = cls.get_healthy_replicas()
+        if not replicas:
+            return None
+
+        return connections.get(replicas[next(cls._round_robin) % len(replicas)])
+
+    @classmethod
+    async def refresh_replica_lag(cls) -> None:
+        """
+        Measure the replication lag of each replica. Unreachable replicas are
+        marked with an infinite lag so reads fall back to the primary.
+        """
+        for replica in cls._replicas:
+            connection = connections.get(replica)
+            try:
+                if connection.capabilities.dialect == "postgres":
+                    _, rows = await connection.execute_query(POSTGRES_LAG_QUERY)
+                    cls._replica_lag[replica] = float(rows[0]["lag"])
+                else:
+                    await connection.execute_query("SELECT 1")
+                    cls._replica_lag[replica] = 0
+            except Exception:
+                logger.warning("replica %s unreachable", replica, exc_info=True)
+                cls._replica_lag[replica] = float("inf")
+
+    @classmethod
+    async def monitor_replica_lag(cls) -> None:
+        """
+        Refresh the replica lag periodically, meant to run as a background task
+        """
+        while True:
+            await cls.refresh_replica_lag()
+            await asyncio.sleep(module_settings.replica_lag_check_interval)
+
+    @classmethod
+    def has_replicas(cls) -> bool:
+        return bool(cls._replicas)
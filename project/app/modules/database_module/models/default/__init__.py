@@ -1,3 +1,4 @@
+from .archived_task import ArchivedTask
 from .board import Board
 from .column import Column
 from .task import Task
@@ -7,3 +8,4 @@ from .task_by_board import TaskByBoard
 from .user import User
 from .user_session import UserSession
 from .workspace import Workspace
+from .workspace_shard import WorkspaceShard
@@ -1,6 +1,8 @@
+from .archived_task import ArchivedTask
 from .board import Board
 from .column import Column
 from .task import Task
 from .user import User
 from .user_session import UserSession
 from .workspace import Workspace
+from .workspace_shard import WorkspaceShard
@@ -0,0 +1,32 @@
+from tortoise import fields
+
+from app.modules.database_module.models.database_model import DatabaseModel
+
+
+# Task moved out of its board, left out of the snapshots and of the order
+# shifts of its column until restored. It keeps the identifier of the task.
+class ArchivedTask(DatabaseModel):
+    id = fields.IntField(primary_key=True, generated=False)
+    title = fields.CharField(max_length=255)
+    description = fields.TextField()
+    # Position in the column when archived, a restored task goes last
+    order = fields.IntField()
+    created_at = fields.DatetimeField()
+    updated_at = fields.DatetimeField()
+    archived_at = fields.DatetimeField(auto_now_add=True)
+
+    # Relation
+    column = fields.ForeignKeyField(
+        "default.Column",
+        on_delete=fields.CASCADE,
+        related_name="archived_tasks",
+        db_index=True,
+    )
+    # Copied from the column, the archive of a board is browsed by its index
+    board = fields.ForeignKeyField(
+        "default.Board", on_delete=fields.CASCADE, related_name="archived_tasks"
+    )
+
+    class Meta:
+        table = "archived_task"
+        indexes = (("board_id", "archived_at"),)
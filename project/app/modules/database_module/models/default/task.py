@@ -12,3 +12,12 @@ class Task(DatabaseModel):
 
     # Relation
     column = fields.ForeignKeyField("default.Column", on_delete=fields.CASCADE)
+    # Copied from the column: every task query is scoped to a board, which is
+    # the partition key when the table is partitioned (TASK_PARTITIONS)
+    board = fields.ForeignKeyField(
+        "default.Board", on_delete=fields.CASCADE, related_name="tasks"
+    )
+
+    class Meta:
+        table = "task"
+        indexes = (("board_id", "column_id", "order"),)
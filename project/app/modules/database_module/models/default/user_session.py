@@ -1,6 +1,7 @@
 from tortoise import fields
 
 from app.modules.database_module.models.database_model import DatabaseModel
+from app.utils.token_helper import TOKEN_HASH_LENGTH
 
 
 class UserSession(DatabaseModel):
@@ -8,12 +9,14 @@ class UserSession(DatabaseModel):
         "default.User",
         on_delete=fields.CASCADE,
         related_name="sessions",
+        db_index=True,
     )
-    refresh_token = fields.TextField()
+    # Only a hash of the refresh token is stored, looked up by its index
+    refresh_token_hash = fields.CharField(max_length=TOKEN_HASH_LENGTH, unique=True)
     user_agent = fields.CharField(max_length=255, null=True)
     created_at = fields.DatetimeField(auto_now_add=True)
-    last_used_at = fields.DatetimeField(auto_now=True)
+    # Sessions unused for session_expiry_days are pruned by the sweeper
+    last_used_at = fields.DatetimeField(auto_now=True, db_index=True)
 
     class Meta:
         table = "user_sessions"
-        unique_together = ("user", "refresh_token")
@@ -0,0 +1,17 @@
+from tortoise import fields
+
+from app.modules.database_module.models.database_model import DatabaseModel
+
+
+# Shard holding a workspace, read from the catalog (primary) database only.
+# Workspaces without a row live in the catalog.
+class WorkspaceShard(DatabaseModel):
+    workspace_id = fields.IntField(unique=True)
+    shard = fields.CharField(max_length=64)
+    # Set by move_workspace while the rows are copied, the requests of the
+    # workspace are rejected meanwhile
+    is_moving = fields.BooleanField(default=False)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        table = "workspace_shard"
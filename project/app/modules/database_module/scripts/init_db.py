@@ -2,23 +2,111 @@ import logging
 import os
 
 from dotenv import load_dotenv
-from tortoise import Tortoise, run_async
+from tortoise import Tortoise, connections, run_async
+from tortoise.utils import generate_schema_for_client
+
+from app.modules.database_module.models.default import User
+from app.modules.database_module.settings import (
+    CATALOG_SHARD,
+    PRIMARY_CONNECTION,
+    get_shard_connection_name,
+)
+from app.modules.database_module.sharding import (
+    copy_rows,
+    get_script_shards,
+    get_script_tortoise_config,
+    reserve_id_range,
+)
+from app.modules.database_module.task_partitioning import (
+    create_partitioned_task_table,
+)
 
 logger = logging.getLogger(__name__)
 # load env
 load_dotenv()
 
+# Tables created by earlier versions, generate_schemas only creates what is
+# missing (PostgreSQL, no-op once applied): sessions keep a hash of their
+# refresh token instead of the token, tasks keep the board of their column
+# (convert large task tables with partition_tasks first, which adds it too)
+UPGRADE_SQL = """
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'user_sessions' AND column_name = 'refresh_token'
+    ) THEN
+        ALTER TABLE user_sessions ADD COLUMN refresh_token_hash VARCHAR(64);
+        UPDATE user_sessions SET refresh_token_hash =
+            encode(sha256(convert_to(refresh_token, 'UTF8')), 'hex');
+        ALTER TABLE user_sessions ALTER COLUMN refresh_token_hash SET NOT NULL;
+        ALTER TABLE user_sessions ADD CONSTRAINT
+            user_sessions_refresh_token_hash_key UNIQUE (refresh_token_hash);
+        ALTER TABLE user_sessions DROP COLUMN refresh_token;
+    END IF;
+    IF EXISTS (
+        SELECT 1 FROM information_schema.tables WHERE table_name = 'task'
+    ) AND NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'task' AND column_name = 'board_id'
+    ) THEN
+        ALTER TABLE task ADD COLUMN board_id INT
+            REFERENCES board (id) ON DELETE CASCADE;
+        UPDATE task SET board_id = columns.board_id
+            FROM columns WHERE columns.id = task.column_id;
+        ALTER TABLE task ALTER COLUMN board_id SET NOT NULL;
+    END IF;
+END $$;
+"""
+
+
+async def generate_shard_schema(connection, partitions: int) -> None:
+    """
+    Create the tables of one database, the primary connection pointing to it
+    """
+    if connection.capabilities.dialect == "postgres":
+        logger.info("Upgrading the tables of earlier versions...")
+        await connection.execute_script(UPGRADE_SQL)
+
+    logger.info("Generating database schemas via Tortoise...")
+    await generate_schema_for_client(connection, safe=True)
+
+    if partitions and connection.capabilities.dialect == "postgres":
+        if await create_partitioned_task_table(connection, partitions):
+            logger.info("Task table partitioned by board")
+            # Indexes of the model on the partitioned table
+            await generate_schema_for_client(connection, safe=True)
+        else:
+            logger.warning(
+                "The task table holds tasks, convert it with partition_tasks"
+            )
+
 
 async def generate_schema() -> None:
     logger.info("Initializing Tortoise...")
 
-    await Tortoise.init(
-        db_url=os.getenv("DATABASE_URL"),
-        modules={"default": ["app.modules.database_module.models.default.__main__"]},
-    )
+    # Read after load_dotenv, as DATABASE_URL
+    await Tortoise.init(config=get_script_tortoise_config())
+    partitions = int(os.getenv("TASK_PARTITIONS", 0))
+    shards = get_script_shards()
 
-    logger.info("Generating database schemas via Tortoise...")
-    await Tortoise.generate_schemas()
+    catalog = Tortoise.get_connection(PRIMARY_CONNECTION)
+    for index, shard in enumerate(shards):
+        logger.info("Shard %s", shard)
+        connection = Tortoise.get_connection(get_shard_connection_name(shard))
+        # The models use the primary connection
+        token = connections.set(PRIMARY_CONNECTION, connection)
+        try:
+            await generate_shard_schema(connection, partitions)
+            await reserve_id_range(connection, index)
+            if shard != CATALOG_SHARD:
+                # Users registered before the shard was added
+                copied = await copy_rows(
+                    catalog, connection, User._meta.db_table, skip_existing=True
+                )
+                logger.info("Copied %d users", copied)
+        finally:
+            connections.reset(token)
 
     await Tortoise.close_connections()
 
@@ -0,0 +1,266 @@
+"""
+Move a workspace, with its boards, columns, tasks and memberships, to
+another shard while the API keeps serving the other workspaces.
+
+Usage (from the project directory):
+    python -m app.modules.database_module.scripts.move_workspace
+        WORKSPACE_ID SHARD [--batch-size 500] [--no-wait]
+
+SHARD is a name of DATABASE_SHARD_URLS, or "default" for the catalog.
+
+1. Mark the workspace as moving in the shard map and wait for the API
+   processes to refresh it (SHARD_MAP_REFRESH_INTERVAL): its requests are
+   answered with 503 and Retry-After until the end of the move.
+2. Copy its rows to the target shard in one transaction, replacing the rows
+   left by an interrupted move. The users it references are copied first.
+3. Point the shard map to the target, delete the rows from the source
+   (cascading from the workspace) and clear the moving flag. Run again to
+   finish a move interrupted after the copy.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import re
+
+from dotenv import load_dotenv
+from tortoise import Tortoise, run_async
+from tortoise.transactions import in_transaction
+
+from app.modules.database_module.models.default import (
+    ArchivedTask,
+    Board,
+    Column,
+    Task,
+    User,
+    Workspace,
+    WorkspaceShard,
+)
+from app.modules.database_module.settings import (
+    CATALOG_SHARD,
+    PRIMARY_CONNECTION,
+    get_shard_connection_name,
+)
+from app.modules.database_module.sharding import (
+    COPY_BATCH_SIZE,
+    copy_rows,
+    get_id_range,
+    get_script_shards,
+    get_script_tortoise_config,
+    reserve_id_range,
+)
+
+logger = logging.getLogger(__name__)
+# load env
+load_dotenv()
+
+# Margin over the refresh interval for the requests started before
+IN_FLIGHT_GRACE_SECONDS = 5
+
+
+def _get_through(model, relation: str) -> tuple[str, str, str]:
+    # Table, column of the model and column of the user of a many to many
+    field = model._meta.fields_map[relation]
+    return field.through, field.backward_key, field.forward_key
+
+
+async def _select_ids(connection, query: str, values: list) -> list[int]:
+    if connection.capabilities.dialect == "sqlite":
+        query = re.sub(r"\$(\d+)", r"?\1", query)
+    _, rows = await connection.execute_query(query, values)
+    return sorted({row[0] for row in rows})
+
+
+async def get_referenced_ids(source, workspace_id: int) -> tuple[list, list]:
+    """
+    :return: identifiers of the boards of the workspace and of the users its
+        rows reference (owners, members, favorites)
+    :rtype: tuple[list, list]
+    """
+    board_table = Board._meta.db_table
+    board_ids = await _select_ids(
+        source,
+        f'SELECT id FROM "{board_table}" WHERE workspace_id = $1',
+        [workspace_id],
+    )
+    user_ids = set(
+        await _select_ids(
+            source,
+            f'SELECT owner_id FROM "{board_table}" WHERE workspace_id = $1 '
+            f'UNION SELECT owner_id FROM "{Workspace._meta.db_table}" WHERE id = $1',
+            [workspace_id],
+        )
+    )
+    through, workspace_key, user_key = _get_through(Workspace, "user")
+    user_ids.update(
+        await _select_ids(
+            source,
+            f'SELECT {user_key} FROM "{through}" WHERE {workspace_key} = $1',
+            [workspace_id],
+        )
+    )
+    for relation in ("members", "users"):
+        through, board_key, user_key = _get_through(Board, relation)
+        user_ids.update(
+            await _select_ids(
+                source,
+                f'SELECT m.{user_key} FROM "{through}" m '
+                f'JOIN "{board_table}" b ON b.id = m.{board_key} '
+                "WHERE b.workspace_id = $1",
+                [workspace_id],
+            )
+        )
+    return board_ids, sorted(user_ids)
+
+
+async def copy_workspace(
+    source, target, workspace_id: int, board_ids: list, user_ids: list, batch_size
+) -> None:
+    """
+    Copy the rows of a workspace in the order of their foreign keys, in the
+    transaction of the target
+    """
+    copied = await copy_rows(
+        source, target, User._meta.db_table, "id", user_ids, skip_existing=True
+    )
+    logger.info("Copied %d missing users", copied)
+
+    await copy_rows(source, target, Workspace._meta.db_table, "id", [workspace_id])
+    through, workspace_key, _ = _get_through(Workspace, "user")
+    await copy_rows(source, target, through, workspace_key, [workspace_id], key=None)
+    await copy_rows(source, target, Board._meta.db_table, "id", board_ids)
+    for relation in ("members", "users"):
+        through, board_key, _ = _get_through(Board, relation)
+        await copy_rows(source, target, through, board_key, board_ids, key=None)
+    for model in (Column, Task, ArchivedTask):
+        copied = await copy_rows(
+            source,
+            target,
+            model._meta.db_table,
+            "board_id",
+            board_ids,
+            batch_size=batch_size,
+        )
+        logger.info("Copied %d rows of %s", copied, model._meta.db_table)
+
+
+async def check_id_range(source, target, workspace_id: int, target_index: int):
+    """
+    SQLite sequences continue after the largest identifier of their table:
+    rows above the range of the target would move its identifiers into the
+    range of another shard
+    """
+    if target.capabilities.dialect != "sqlite":
+        return
+    _, end = get_id_range(target_index)
+    board_table = Board._meta.db_table
+    rows = await source.execute_query_dict(
+        f'SELECT MAX(t.id) AS max_id FROM "{Task._meta.db_table}" t '
+        f'JOIN "{board_table}" b ON b.id = t.board_id WHERE b.workspace_id = ?1 '
+        f'UNION ALL SELECT MAX(id) FROM "{board_table}" WHERE workspace_id = ?1 '
+        f'UNION ALL SELECT id FROM "{Workspace._meta.db_table}" WHERE id = ?1',
+        [workspace_id],
+    )
+    if any(row["max_id"] and row["max_id"] >= end for row in rows):
+        raise SystemExit(
+            "The workspace holds identifiers above the range of the target, "
+            "not supported on SQLite"
+        )
+
+
+async def set_shard(
+    workspace_id: int, shard: str, is_moving: bool, catalog
+) -> WorkspaceShard:
+    entry, _ = await WorkspaceShard.update_or_create(
+        defaults={"shard": shard, "is_moving": is_moving},
+        using_db=catalog,
+        workspace_id=workspace_id,
+    )
+    return entry
+
+
+async def move_workspace(
+    workspace_id: int, target_shard: str, batch_size: int, wait: bool
+) -> None:
+    logger.info("Initializing Tortoise...")
+
+    await Tortoise.init(config=get_script_tortoise_config())
+    try:
+        shards = get_script_shards()
+        if target_shard not in shards:
+            raise SystemExit(f"Unknown shard {target_shard}, expected one of {shards}")
+        catalog = Tortoise.get_connection(PRIMARY_CONNECTION)
+        entry = (
+            await WorkspaceShard.filter(workspace_id=workspace_id)
+            .using_db(catalog)
+            .first()
+        )
+        source_shard = entry.shard if entry else CATALOG_SHARD
+        if source_shard not in shards:
+            raise SystemExit(f"Workspace mapped to unknown shard {source_shard}")
+        source = Tortoise.get_connection(get_shard_connection_name(source_shard))
+        target = Tortoise.get_connection(get_shard_connection_name(target_shard))
+        if source_shard == target_shard:
+            if entry and entry.is_moving:
+                # Interrupted after the copy, the source still holds the rows
+                for shard in shards:
+                    if shard != target_shard:
+                        await Workspace.filter(id=workspace_id).using_db(
+                            Tortoise.get_connection(get_shard_connection_name(shard))
+                        ).delete()
+                await set_shard(workspace_id, target_shard, False, catalog)
+            logger.info("Workspace %d already on %s", workspace_id, target_shard)
+            return
+        if not await Workspace.filter(id=workspace_id).using_db(source).exists():
+            raise SystemExit(f"Workspace {workspace_id} not found on {source_shard}")
+        await check_id_range(source, target, workspace_id, shards.index(target_shard))
+
+        await set_shard(workspace_id, source_shard, True, catalog)
+        if wait:
+            delay = (
+                float(os.getenv("SHARD_MAP_REFRESH_INTERVAL", 10))
+                + IN_FLIGHT_GRACE_SECONDS
+            )
+            logger.info("Waiting %.0fs for the API to stop serving it...", delay)
+            await asyncio.sleep(delay)
+
+        board_ids, user_ids = await get_referenced_ids(source, workspace_id)
+        logger.info(
+            "Copying workspace %d (%d boards) from %s to %s...",
+            workspace_id,
+            len(board_ids),
+            source_shard,
+            target_shard,
+        )
+        async with in_transaction(target.connection_name) as transaction:
+            # Left by an interrupted move, cascading from the workspace
+            await Workspace.filter(id=workspace_id).using_db(transaction).delete()
+            await copy_workspace(
+                source, transaction, workspace_id, board_ids, user_ids, batch_size
+            )
+        await reserve_id_range(target, shards.index(target_shard))
+
+        await set_shard(workspace_id, target_shard, True, catalog)
+        await Workspace.filter(id=workspace_id).using_db(source).delete()
+        await set_shard(workspace_id, target_shard, False, catalog)
+        logger.info("Workspace %d moved to %s", workspace_id, target_shard)
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("workspace_id", type=int)
+    parser.add_argument("shard")
+    parser.add_argument("--batch-size", type=int, default=COPY_BATCH_SIZE)
+    parser.add_argument(
+        "--no-wait",
+        dest="wait",
+        action="store_false",
+        help="do not wait for the API to stop serving the workspace (API stopped)",
+    )
+    args = parser.parse_args()
+
+    run_async(move_workspace(args.workspace_id, args.shard, args.batch_size, args.wait))
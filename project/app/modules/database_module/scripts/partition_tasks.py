@@ -0,0 +1,208 @@
+"""
+Convert the task table to a table hash partitioned by board (PostgreSQL)
+while the API keeps serving.
+
+Usage (from the project directory):
+    python -m app.modules.database_module.scripts.partition_tasks
+        [--partitions TASK_PARTITIONS or 32] [--batch-size 10000] [--drop-old]
+
+1. Create task_partitioned (resumes with the copy when it exists).
+2. A trigger on task mirrors every write into task_partitioned.
+3. Copy the tasks in batches of primary key ranges, one transaction each,
+   the copied rows are locked (FOR SHARE) so a concurrent delete waits for
+   the batch and is then mirrored. The index of the model is built before,
+   init_db finds it under its name after the swap.
+4. Swap the tables in one short transaction under an exclusive lock, the
+   old table is kept as task_unpartitioned unless --drop-old.
+"""
+
+import argparse
+import logging
+import os
+
+from dotenv import load_dotenv
+from tortoise import Tortoise, run_async
+from tortoise.transactions import in_transaction
+
+from app.modules.database_module.models.default import Task
+from app.modules.database_module.task_partitioning import (
+    TASK_COLUMNS,
+    get_partitioned_task_sql,
+    is_task_table_partitioned,
+)
+
+logger = logging.getLogger(__name__)
+# load env
+load_dotenv()
+
+SOURCE_TABLE = "task"
+TARGET_TABLE = "task_partitioned"
+OLD_TABLE = "task_unpartitioned"
+# View of init_fixtures, bound to the table it was created on
+TASKS_VIEW = "tasks_by_board"
+TARGET_INDEX = f"{TARGET_TABLE}_board_idx"
+MAX_TASK_ID = 2**31 - 1
+
+_COLUMN_LIST = ", ".join(f'"{column}"' for column in TASK_COLUMNS)
+_SOURCE_COLUMN_LIST = ", ".join(
+    "c.board_id" if column == "board_id" else f't."{column}"' for column in TASK_COLUMNS
+)
+_NEW_COLUMN_LIST = ", ".join(
+    "c.board_id" if column == "board_id" else f'NEW."{column}"'
+    for column in TASK_COLUMNS
+)
+
+SYNC_TRIGGER_SQL = f"""
+CREATE OR REPLACE FUNCTION {TARGET_TABLE}_sync() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM "{TARGET_TABLE}" WHERE id = OLD.id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO "{TARGET_TABLE}" ({_COLUMN_LIST})
+        SELECT {_NEW_COLUMN_LIST} FROM columns c WHERE c.id = NEW.column_id;
+    END IF;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS {TARGET_TABLE}_sync ON "{SOURCE_TABLE}";
+CREATE TRIGGER {TARGET_TABLE}_sync
+    AFTER INSERT OR UPDATE OR DELETE ON "{SOURCE_TABLE}"
+    FOR EACH ROW EXECUTE FUNCTION {TARGET_TABLE}_sync();
+"""
+
+# Rows already mirrored by the trigger are the newest version, kept
+COPY_BATCH_SQL = f"""
+WITH batch AS (
+    SELECT {_SOURCE_COLUMN_LIST}
+    FROM "{SOURCE_TABLE}" t JOIN columns c ON c.id = t.column_id
+    WHERE t.id > $1 AND t.id <= $2
+    FOR SHARE OF t
+)
+INSERT INTO "{TARGET_TABLE}" ({_COLUMN_LIST})
+SELECT * FROM batch
+ON CONFLICT DO NOTHING
+"""
+
+
+def _get_model_index_name(connection) -> str:
+    # Name generate_schemas gives to the index of the Task model
+    generator = connection.schema_generator(connection)
+    return generator._get_index_name("idx", Task, Task._meta.indexes[0])
+
+
+async def copy_tasks(connection, batch_size: int) -> int:
+    """
+    Copy the tasks to the partitioned table, in batches of primary keys
+    :return: highest identifier copied
+    :rtype: int
+    """
+    rows = await connection.execute_query_dict(
+        f'SELECT COALESCE(MAX(id), 0) AS max_id FROM "{SOURCE_TABLE}"'
+    )
+    # Later tasks are inserted by the trigger
+    max_id = rows[0]["max_id"]
+    last_id = 0
+    while last_id < max_id:
+        upper_id = min(last_id + batch_size, max_id)
+        async with in_transaction("default") as transaction:
+            await transaction.execute_query(COPY_BATCH_SQL, [last_id, upper_id])
+        last_id = upper_id
+        logger.info("Copied tasks up to id %d of %d", last_id, max_id)
+    return max_id
+
+
+async def swap_tables(connection, partitions: int, copied_id: int) -> None:
+    """
+    Replace the task table with the partitioned one in one transaction,
+    writes wait for the exclusive lock for its duration only
+    :param copied_id: highest identifier copied
+    """
+    index_name = _get_model_index_name(connection)
+    async with in_transaction("default") as transaction:
+        await transaction.execute_script(
+            f'LOCK TABLE "{SOURCE_TABLE}" IN ACCESS EXCLUSIVE MODE;'
+        )
+        # Inserts started before the trigger and committed after the copy
+        await transaction.execute_query(COPY_BATCH_SQL, [copied_id, MAX_TASK_ID])
+        rows = await transaction.execute_query_dict(
+            "SELECT pg_get_viewdef(to_regclass($1)) AS definition", [TASKS_VIEW]
+        )
+        view_definition = rows[0]["definition"]
+
+        statements = [
+            f'DROP VIEW IF EXISTS "{TASKS_VIEW}";',
+            f'DROP TRIGGER {TARGET_TABLE}_sync ON "{SOURCE_TABLE}";',
+            f"DROP FUNCTION {TARGET_TABLE}_sync();",
+            f'ALTER TABLE "{SOURCE_TABLE}" RENAME TO "{OLD_TABLE}";',
+            f'ALTER TABLE "{TARGET_TABLE}" RENAME TO "{SOURCE_TABLE}";',
+            f'ALTER SEQUENCE "{SOURCE_TABLE}_id_seq" RENAME TO "{OLD_TABLE}_id_seq";',
+            f'ALTER SEQUENCE "{TARGET_TABLE}_id_seq" '
+            f'RENAME TO "{SOURCE_TABLE}_id_seq";',
+            # Left by an earlier init_db on the old table
+            f'DROP INDEX IF EXISTS "{index_name}";',
+            f'ALTER INDEX "{TARGET_INDEX}" RENAME TO "{index_name}";',
+            f"SELECT setval('\"{SOURCE_TABLE}_id_seq\"', GREATEST("
+            f'(SELECT MAX(id) FROM "{OLD_TABLE}"), '
+            f'(SELECT MAX(id) FROM "{SOURCE_TABLE}"), 1));',
+        ]
+        statements.extend(
+            f'ALTER TABLE "{TARGET_TABLE}_p{remainder}" '
+            f'RENAME TO "{SOURCE_TABLE}_p{remainder}";'
+            for remainder in range(partitions)
+        )
+        if view_definition:
+            statements.append(f'CREATE VIEW "{TASKS_VIEW}" AS {view_definition}')
+        await transaction.execute_script("\n".join(statements))
+
+
+async def partition_tasks(partitions: int, batch_size: int, drop_old: bool) -> None:
+    logger.info("Initializing Tortoise...")
+
+    await Tortoise.init(
+        db_url=os.getenv("DATABASE_URL"),
+        modules={"default": ["app.modules.database_module.models.default.__main__"]},
+    )
+    connection = Tortoise.get_connection("default")
+    try:
+        if connection.capabilities.dialect != "postgres":
+            raise SystemExit("Task partitioning requires PostgreSQL")
+        if await is_task_table_partitioned(connection):
+            logger.info("The task table is already partitioned")
+            return
+
+        logger.info("Creating %s with %d partitions...", TARGET_TABLE, partitions)
+        await connection.execute_script(
+            get_partitioned_task_sql(TARGET_TABLE, partitions)
+        )
+        index_fields = ", ".join(f'"{field}"' for field in Task._meta.indexes[0])
+        await connection.execute_script(
+            f'CREATE INDEX IF NOT EXISTS "{TARGET_INDEX}" '
+            f'ON "{TARGET_TABLE}" ({index_fields});'
+        )
+        await connection.execute_script(SYNC_TRIGGER_SQL)
+
+        copied_id = await copy_tasks(connection, batch_size)
+        logger.info("Swapping the tables...")
+        await swap_tables(connection, partitions, copied_id)
+
+        if drop_old:
+            await connection.execute_script(f'DROP TABLE "{OLD_TABLE}";')
+            logger.info("Dropped %s", OLD_TABLE)
+        else:
+            logger.info("Kept the previous table as %s", OLD_TABLE)
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--partitions", type=int, default=int(os.getenv("TASK_PARTITIONS") or 32)
+    )
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--drop-old", action="store_true")
+    args = parser.parse_args()
+
+    run_async(partition_tasks(args.partitions, args.batch_size, args.drop_old))
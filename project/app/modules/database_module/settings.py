@@ -3,9 +3,90 @@ from functools import lru_cache
 
 from pydantic_settings import BaseSettings
 
+PRIMARY_CONNECTION = "default"
+REPLICA_CONNECTION_PREFIX = "replica_"
+SHARD_CONNECTION_PREFIX = "shard_"
+# Shard of the primary connection: users, sessions, shard map and the
+# workspaces not mapped to another shard
+CATALOG_SHARD = PRIMARY_CONNECTION
+
+
+def parse_shard_urls(value: str) -> dict[str, str]:
+    """
+    Parse a comma separated list of name=url shards
+    :param value: e.g. "acme=postgres://...,globex=sqlite://globex.sqlite3"
+    :return: url of each shard name, in the configured order
+    :rtype: dict[str, str]
+    """
+    shards = {}
+    for entry in value.split(","):
+        if not entry.strip():
+            continue
+        name, _, url = entry.partition("=")
+        name = name.strip()
+        if not name or not url.strip() or name == CATALOG_SHARD:
+            raise ValueError(f"Invalid shard {entry.strip()!r}, expected name=url")
+        shards[name] = url.strip()
+    return shards
+
+
+def get_shard_connection_name(shard: str) -> str:
+    if shard == CATALOG_SHARD:
+        return PRIMARY_CONNECTION
+    return f"{SHARD_CONNECTION_PREFIX}{shard}"
+
 
 class DatabaseSettings(BaseSettings):
     database_url: str = os.getenv("DATABASE_URL")
+    # Comma separated list of read replica urls, empty to disable replicas
+    database_replica_urls: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    replica_max_lag_seconds: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", 5))
+    replica_lag_check_interval: float = float(
+        os.getenv("REPLICA_LAG_CHECK_INTERVAL", 10)
+    )
+    # Synthetic slow database: every connection is held this much longer
+    # (ms) than its queries need, 0 to disable (load shedding benchmarks)
+    database_stub_latency_ms: float = float(os.getenv("DATABASE_STUB_LATENCY_MS", 0))
+    # Comma separated list of name=url databases holding workspaces moved
+    # out of the primary database, empty to disable sharding. Append only:
+    # the position of a shard sets the range of its identifiers.
+    database_shard_urls: str = os.getenv("DATABASE_SHARD_URLS", "")
+    shard_map_refresh_interval: float = float(
+        os.getenv("SHARD_MAP_REFRESH_INTERVAL", 10)
+    )
+    # Shards queried at once by the queries spanning every shard
+    shard_gather_concurrency: int = int(os.getenv("SHARD_GATHER_CONCURRENCY", 8))
+
+    def get_replica_urls(self) -> list[str]:
+        return [
+            url.strip() for url in self.database_replica_urls.split(",") if url.strip()
+        ]
+
+    def get_shard_urls(self) -> dict[str, str]:
+        return parse_shard_urls(self.database_shard_urls)
+
+    def get_tortoise_config(self) -> dict:
+        """
+        Build the Tortoise configuration with the primary, replica and shard
+        connections
+        :return: Tortoise configuration dict
+        :rtype: dict
+        """
+        connections = {PRIMARY_CONNECTION: self.database_url}
+        for index, url in enumerate(self.get_replica_urls()):
+            connections[f"{REPLICA_CONNECTION_PREFIX}{index}"] = url
+        for shard, url in self.get_shard_urls().items():
+            connections[get_shard_connection_name(shard)] = url
+
+        return {
+            "connections": connections,
+            "apps": {
+                "default": {
+                    "models": ["app.modules.database_module.models.default"],
+                    "default_connection": PRIMARY_CONNECTION,
+                }
+            },
+        }
 
 
 @lru_cache
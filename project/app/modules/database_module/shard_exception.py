@@ -0,0 +1,13 @@
+from app.schemas.base_schema import BaseException, BaseExceptionInfo
+
+
+class ShardExceptionInfo(BaseExceptionInfo):
+    ERROR_WORKSPACE_MOVING = (
+        10001,
+        "Error workspace being moved to another database, retry later",
+        503,
+    )
+
+
+class ShardException(BaseException):
+    pass
@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import math
+from contextvars import Context, ContextVar
+from typing import Awaitable, Callable, Type, TypeVar
+
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from app.modules.database_module.models.database_model import DatabaseModel
+from app.modules.database_module.models.default import User, WorkspaceShard
+from app.modules.database_module.settings import (
+    CATALOG_SHARD,
+    PRIMARY_CONNECTION,
+    get_shard_connection_name,
+    module_settings,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Shard the current request is bound to, every query of the request runs on
+# it until another shard is bound
+_bound_shard: ContextVar[str] = ContextVar("bound_shard", default=CATALOG_SHARD)
+
+
+class ShardRouter:
+    """
+    Route the queries of a request to the shard holding its workspace.
+
+    The catalog shard (the primary connection) holds the users, their
+    sessions, the shard map and every workspace not mapped to another shard.
+    Binding a shard replaces the primary connection in the context of the
+    current request, so the DAO, the repositories and their transactions
+    follow it without passing connections around. Bind before opening a
+    transaction, a transaction keeps the connection it started on.
+
+    Users are replicated to every shard so that the rows of a workspace
+    (owners, members) reference them wherever the workspace lives.
+    """
+
+    _shards: list[str] = [CATALOG_SHARD, *module_settings.get_shard_urls()]
+    _workspace_shards: dict[int, str] = {}
+    _moving: frozenset[int] = frozenset()
+    # Written to the catalog and copied to every other shard
+    _replicated_models: tuple[Type[DatabaseModel], ...] = (User,)
+
+    @classmethod
+    def is_sharded(cls) -> bool:
+        return len(cls._shards) > 1
+
+    @classmethod
+    def get_shards(cls) -> list[str]:
+        return list(cls._shards)
+
+    @classmethod
+    def is_replicated(cls, model: Type[DatabaseModel]) -> bool:
+        return cls.is_sharded() and model in cls._replicated_models
+
+    @staticmethod
+    def get_client(shard: str) -> BaseDBAsyncClient:
+        """
+        Get the connection of a shard, as opened by Tortoise.init: outside of
+        the shard bound to the current request and of its transactions
+        """
+        return Context().run(connections.get, get_shard_connection_name(shard))
+
+    @classmethod
+    def get_bound_shard(cls) -> str:
+        return _bound_shard.get()
+
+    @classmethod
+    def bind(cls, shard: str) -> None:
+        """
+        Run the remaining queries of the current request on a shard
+        :param shard: shard name, CATALOG_SHARD for the primary connection
+        """
+        if shard == _bound_shard.get():
+            return
+        if shard not in cls._shards:
+            raise ValueError(f"Unknown shard {shard}")
+        connections.set(PRIMARY_CONNECTION, cls.get_client(shard))
+        _bound_shard.set(shard)
+
+    @classmethod
+    def get_workspace_shard(cls, workspace_id: int) -> str:
+        """
+        Get the shard holding a workspace from the shard map
+        :raises ShardException: if the workspace is being moved
+        """
+        if workspace_id in cls._moving:
+            cls._reject_moving()
+        return cls._workspace_shards.get(workspace_id, CATALOG_SHARD)
+
+    @staticmethod
+    def _reject_moving() -> None:
+        # base_schema imports the database module
+        from app.modules.database_module.shard_exception import (
+            ShardException,
+            ShardExceptionInfo,
+        )
+
+        raise ShardException(
+            ShardExceptionInfo.ERROR_WORKSPACE_MOVING,
+            headers={
+                "Retry-After": str(
+                    math.ceil(module_settings.shard_map_refresh_interval)
+                )
+            },
+        )
+
+    @classmethod
+    def bind_workspace(cls, workspace_id: int) -> None:
+        if cls.is_sharded():
+            cls.bind(cls.get_workspace_shard(workspace_id))
+
+    @classmethod
+    async def gather(
+        cls, query: Callable[[], Awaitable[T]], shards: list[str] | None = None
+    ) -> list[T]:
+        """
+        Run a query on every shard, shard_gather_concurrency shards at a
+        time. Each run is bound to its shard, the binding of the caller is
+        left untouched.
+        :param query: coroutine function running the query
+        :param shards: shards to query, all of them when None
+        :return: result of each shard, in the order of the shards
+        :rtype: list[T]
+        """
+        if not cls.is_sharded():
+            return [await query()]
+
+        semaphore = asyncio.Semaphore(module_settings.shard_gather_concurrency)
+
+        async def run(shard: str) -> T:
+            async with semaphore:
+                cls.bind(shard)
+                return await query()
+
+        # Each coroutine runs in a task, with a copy of the current context
+        shards = cls._shards if shards is None else shards
+        return await asyncio.gather(*(run(shard) for shard in shards))
+
+    @classmethod
+    async def on_catalog(cls, query: Callable[[], Awaitable[T]]) -> T:
+        """Run a query on the catalog shard, whichever shard is bound"""
+        return (await cls.gather(query, [CATALOG_SHARD]))[0]
+
+    @classmethod
+    async def locate(cls, model: Type[DatabaseModel], identifier: int) -> str | None:
+        """
+        Find the shard holding a row, querying every shard at once
+        :param model: model of the row
+        :param identifier: primary key of the row
+        :return: shard name, None if no shard holds it
+        :rtype: str | None
+        :raises ShardException: if the row is on two shards, its workspace is
+            being moved
+        """
+        if not cls.is_sharded():
+            return CATALOG_SHARD
+
+        found = await cls.gather(lambda: model.exists(id=identifier))
+        shards = [shard for shard, exists in zip(cls._shards, found) if exists]
+        if len(shards) > 1:
+            cls._reject_moving()
+        return shards[0] if shards else None
+
+    @classmethod
+    async def replicate(cls, entity: DatabaseModel) -> None:
+        """
+        Copy a row written to the catalog to the other shards
+        :param entity: row of a replicated model, as saved in the catalog
+        """
+        model = type(entity)
+        values = {
+            field: getattr(entity, field) for field in model._meta.fields_db_projection
+        }
+        update_fields = [field for field in values if field != model._meta.pk_attr]
+
+        async def upsert() -> None:
+            await model.bulk_create(
+                [model(**values)],
+                on_conflict=[model._meta.pk_attr],
+                update_fields=update_fields,
+            )
+
+        await cls.gather(upsert, cls._shards[1:])
+
+    @classmethod
+    async def refresh_shard_map(cls) -> None:
+        """
+        Load the shard map from the catalog. Workspaces mapped to a shard
+        missing from the configuration are rejected as moving rather than
+        looked up in the wrong database.
+        """
+        rows = (
+            await WorkspaceShard.all()
+            .using_db(cls.get_client(CATALOG_SHARD))
+            .values_list("workspace_id", "shard", "is_moving")
+        )
+        unknown = {
+            workspace_id for workspace_id, shard, _ in rows if shard not in cls._shards
+        }
+        if unknown:
+            logger.error("workspaces %s mapped to unknown shards", sorted(unknown))
+        cls._workspace_shards = {
+            workspace_id: shard
+            for workspace_id, shard, _ in rows
+            if shard != CATALOG_SHARD
+        }
+        cls._moving = frozenset(
+            workspace_id for workspace_id, _, is_moving in rows if is_moving
+        ) | frozenset(unknown)
+
+    @classmethod
+    async def monitor_shard_map(cls) -> None:
+        """
+        Refresh the shard map periodically, meant to run as a background task
+        """
+        while True:
+            await asyncio.sleep(module_settings.shard_map_refresh_interval)
+            try:
+                await cls.refresh_shard_map()
+            except Exception:
+                logger.warning("shard map not refreshed", exc_info=True)
@@ -0,0 +1,162 @@
+"""
+Maintenance of the workspace shards: identifier ranges and copies of rows
+between shards, used by init_db and the move_workspace script.
+
+Each shard generates the identifiers of its own range (SHARD_ID_RANGE wide,
+by position: the catalog first, then DATABASE_SHARD_URLS in order) so that
+workspaces, boards, columns and tasks stay unique across the shards and the
+API keeps addressing them by identifier alone. Rows moved to another shard
+keep their identifiers.
+"""
+
+import os
+
+from pypika_tortoise import Table
+
+from app.modules.database_module.models.default import Board, Column, Task, Workspace
+from app.modules.database_module.settings import (
+    CATALOG_SHARD,
+    PRIMARY_CONNECTION,
+    get_shard_connection_name,
+    parse_shard_urls,
+)
+
+# Identifiers per shard, 21 shards fit in the INT primary keys
+SHARD_ID_RANGE = 100_000_000
+COPY_BATCH_SIZE = 500
+
+# Tables generating the identifiers of the rows of a workspace
+ID_RANGE_MODELS = (Workspace, Board, Column, Task)
+
+
+def get_script_tortoise_config() -> dict:
+    """
+    Tortoise configuration of the scripts, with the catalog and every shard,
+    read from the environment (after load_dotenv)
+    :return: Tortoise configuration dict
+    :rtype: dict
+    """
+    connections = {PRIMARY_CONNECTION: os.getenv("DATABASE_URL")}
+    for shard, url in parse_shard_urls(os.getenv("DATABASE_SHARD_URLS", "")).items():
+        connections[get_shard_connection_name(shard)] = url
+    return {
+        "connections": connections,
+        "apps": {
+            "default": {
+                "models": ["app.modules.database_module.models.default.__main__"],
+                "default_connection": PRIMARY_CONNECTION,
+            }
+        },
+    }
+
+
+def get_script_shards() -> list[str]:
+    return [
+        CATALOG_SHARD,
+        *parse_shard_urls(os.getenv("DATABASE_SHARD_URLS", "")),
+    ]
+
+
+def get_id_range(shard_index: int) -> tuple[int, int]:
+    """
+    :param shard_index: position of the shard, 0 for the catalog
+    :return: first identifier and end (excluded) of the range of the shard
+    :rtype: tuple[int, int]
+    """
+    return max(shard_index * SHARD_ID_RANGE, 1), (shard_index + 1) * SHARD_ID_RANGE
+
+
+async def reserve_id_range(connection, shard_index: int) -> None:
+    """
+    Move the identifier sequences of a shard into its range, after the rows
+    already in the range. No-op for the catalog, which owns the first range.
+    :param shard_index: position of the shard
+    """
+    if not shard_index:
+        return
+    start, end = get_id_range(shard_index)
+    for model in ID_RANGE_MODELS:
+        table = model._meta.db_table
+        rows = await connection.execute_query_dict(
+            f'SELECT MAX(id) AS max_id FROM "{table}" '
+            f"WHERE id >= {start} AND id < {end}"
+        )
+        last_id = rows[0]["max_id"] or start
+        if connection.capabilities.dialect == "postgres":
+            await connection.execute_query(
+                f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), "
+                f"{last_id})"
+            )
+        else:
+            # AUTOINCREMENT tables continue after the largest of the sequence
+            # and of the identifiers in the table
+            await connection.execute_script(
+                f"DELETE FROM sqlite_sequence WHERE name = '{table}';"
+                "INSERT INTO sqlite_sequence (name, seq) "
+                f"VALUES ('{table}', {last_id});"
+            )
+
+
+async def copy_rows(
+    source,
+    target,
+    table: str,
+    column: str | None = None,
+    values: list | None = None,
+    key: str | None = "id",
+    skip_existing: bool = False,
+    batch_size: int = COPY_BATCH_SIZE,
+) -> int:
+    """
+    Copy the rows of a table, or those whose column is one of the values, in
+    batches of primary keys
+    :param source: connection to read from
+    :param target: connection to insert into
+    :param table: table name
+    :param column: column filtered on, e.g. board_id, None for every row
+    :param values: values of the column
+    :param key: primary key, None for the many to many tables (one batch)
+    :param skip_existing: leave out the primary keys already in the target
+    :return: number of rows copied
+    :rtype: int
+    """
+    if column and not values:
+        return 0
+    sql_table = Table(table)
+    copied = 0
+    last_key = None
+    while True:
+        query = source.query_class.from_(sql_table).select("*")
+        if column:
+            query = query.where(sql_table[column].isin(list(values)))
+        if key:
+            if last_key is not None:
+                query = query.where(sql_table[key] > last_key)
+            query = query.orderby(sql_table[key]).limit(batch_size)
+        rows = await source.execute_query_dict(*query.get_parameterized_sql())
+        if not rows:
+            return copied
+        fetched = len(rows)
+        if key:
+            last_key = rows[-1][key]
+        if skip_existing:
+            existing_query = (
+                target.query_class.from_(sql_table)
+                .select(sql_table[key])
+                .where(sql_table[key].isin([row[key] for row in rows]))
+            )
+            existing = {
+                row[key]
+                for row in await target.execute_query_dict(
+                    *existing_query.get_parameterized_sql()
+                )
+            }
+            rows = [row for row in rows if row[key] not in existing]
+        if rows:
+            insert = target.query_class.into(sql_table).columns(*rows[0])
+            for row in rows:
+                insert = insert.insert(*row.values())
+            await target.execute_query(*insert.get_parameterized_sql())
+            copied += len(rows)
+        if not key or fetched < batch_size:
+            return copied
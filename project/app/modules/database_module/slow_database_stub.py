@@ -0,0 +1,39 @@
+"""
+Synthetic slow database, enabled with DATABASE_STUB_LATENCY_MS: every
+connection taken from the pool (or the lock of a SQLite connection) is held
+that much longer than its queries need, as on a saturated server. The pool
+runs dry at a predictable load, so the admission control and the load
+shedding can be exercised locally. Never enable it in production.
+"""
+
+import asyncio
+import functools
+
+from tortoise.backends.base.client import ConnectionWrapper, PoolConnectionWrapper
+
+
+class SlowDatabaseStub:
+    @classmethod
+    def install(cls, latency: float) -> None:
+        """
+        Hold every connection latency seconds once acquired
+        """
+        for context_class in (ConnectionWrapper, PoolConnectionWrapper):
+            method = context_class.__dict__["__aenter__"]
+            if not getattr(method, "__slowed_down__", False):
+                context_class.__aenter__ = cls._slow_down(method, latency)
+
+    @staticmethod
+    def _slow_down(method, latency: float):
+        @functools.wraps(method)
+        async def slowed_down(self, *args, **kwargs):
+            connection = await method(self, *args, **kwargs)
+            try:
+                await asyncio.sleep(latency)
+            except BaseException:
+                await self.__aexit__(None, None, None)
+                raise
+            return connection
+
+        slowed_down.__slowed_down__ = True
+        return slowed_down
@@ -0,0 +1,91 @@
+"""
+Hash partitioning of the task table by board (PostgreSQL). The task queries
+filter on board_id (board snapshots, order shifts of a column, title checks)
+so they are pruned to a single partition, and vacuum and index maintenance
+work on partitions a fraction of the table size. Lookups by task id probe
+the primary key index of every partition.
+
+Tortoise cannot declare a partitioned table: init_db replaces the empty
+table created by generate_schemas, which then adds the indexes of the model.
+Tables holding tasks are converted by the partition_tasks script.
+"""
+
+# Drop the task table created by generate_schemas, only while empty
+DROP_EMPTY_TASK_TABLE_SQL = """
+DO $$
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = to_regclass('task')) = 'r'
+        AND NOT EXISTS (SELECT 1 FROM task) THEN
+        DROP TABLE task;
+    END IF;
+END $$;
+"""
+
+TASK_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "order",
+    "created_at",
+    "updated_at",
+    "column_id",
+    "board_id",
+)
+
+
+def get_partitioned_task_sql(table: str, partitions: int) -> str:
+    """
+    Create a task table hash partitioned by board, matching the Task model.
+    The partition key is part of the primary key, as PostgreSQL requires.
+    :param table: table name
+    :param partitions: number of partitions
+    :return: SQL script, no-op on the tables that already exist
+    :rtype: str
+    """
+    statements = [
+        f"""
+        CREATE TABLE IF NOT EXISTS "{table}" (
+            "id" SERIAL NOT NULL,
+            "title" VARCHAR(255) NOT NULL,
+            "description" TEXT NOT NULL,
+            "order" INT NOT NULL,
+            "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            "column_id" INT NOT NULL
+                REFERENCES "columns" ("id") ON DELETE CASCADE,
+            "board_id" INT NOT NULL
+                REFERENCES "board" ("id") ON DELETE CASCADE,
+            PRIMARY KEY ("id", "board_id")
+        ) PARTITION BY HASH ("board_id");
+        """
+    ]
+    for remainder in range(partitions):
+        statements.append(
+            f"""
+            CREATE TABLE IF NOT EXISTS "{table}_p{remainder}" PARTITION OF "{table}"
+            FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder});
+            """
+        )
+    return "".join(statements)
+
+
+async def is_task_table_partitioned(connection) -> bool:
+    rows = await connection.execute_query_dict(
+        "SELECT relkind FROM pg_class WHERE oid = to_regclass('task')"
+    )
+    return bool(rows) and rows[0]["relkind"] == "p"
+
+
+async def create_partitioned_task_table(connection, partitions: int) -> bool:
+    """
+    Replace the task table created by generate_schemas with a partitioned
+    one while it is empty, generate_schemas then adds the indexes
+    :param partitions: number of partitions
+    :return: True if the task table is partitioned
+    :rtype: bool
+    """
+    if await is_task_table_partitioned(connection):
+        return True
+    await connection.execute_script(DROP_EMPTY_TASK_TABLE_SQL)
+    await connection.execute_script(get_partitioned_task_sql("task", partitions))
+    return await is_task_table_partitioned(connection)
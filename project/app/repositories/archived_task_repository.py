@@ -0,0 +1,107 @@
+from tortoise.transactions import in_transaction
+
+from app.modules.database_module import DatabaseModule
+from app.modules.database_module.database_router import DatabaseRouter
+from app.modules.database_module.models.default import ArchivedTask, Task
+from app.modules.database_module.settings import PRIMARY_CONNECTION
+
+# Tasks moved per transaction, archiving a whole board never holds the locks
+# of all its rows at once
+ARCHIVE_BATCH_SIZE = 500
+
+
+class ArchivedTaskRepository:
+    @staticmethod
+    async def archive_tasks(board_id: int, filters: dict) -> int:
+        """
+        Move the tasks matching the filters to the archive, in transactions
+        of ARCHIVE_BATCH_SIZE tasks
+        :param board_id: board of the tasks
+        :param filters: filters on the task table only, e.g. column_id
+        :return: number of archived tasks
+        :rtype: int
+        """
+        DatabaseRouter.stick_to_primary()
+        total = 0
+        while True:
+            async with in_transaction(PRIMARY_CONNECTION) as connection:
+                tasks = (
+                    await Task.filter(board_id=board_id, **filters)
+                    .order_by("id")
+                    .limit(ARCHIVE_BATCH_SIZE)
+                    .select_for_update()
+                    .using_db(connection)
+                )
+                if not tasks:
+                    return total
+                await ArchivedTask.bulk_create(
+                    [
+                        ArchivedTask(
+                            id=task.id,
+                            title=task.title,
+                            description=task.description,
+                            order=task.order,
+                            created_at=task.created_at,
+                            updated_at=task.updated_at,
+                            column_id=task.column_id,
+                            board_id=board_id,
+                        )
+                        for task in tasks
+                    ],
+                    using_db=connection,
+                )
+                await Task.filter(
+                    board_id=board_id, id__in=[task.id for task in tasks]
+                ).using_db(connection).delete()
+            total += len(tasks)
+            if len(tasks) < ARCHIVE_BATCH_SIZE:
+                return total
+
+    @staticmethod
+    async def use_archived_task_shard(archived_task_id: int) -> None:
+        await DatabaseModule.use_entity_shard(ArchivedTask, archived_task_id)
+
+    @staticmethod
+    async def get_archived_task_by_id(archived_task_id: int) -> ArchivedTask | None:
+        return await DatabaseModule.get_entity_filtered(
+            ArchivedTask, {"id": archived_task_id}
+        )
+
+    @staticmethod
+    async def get_archived_tasks_paginated(
+        board_id: int, page: int, limit: int
+    ) -> tuple[list[ArchivedTask], int]:
+        """Archived tasks of a board, the most recently archived first"""
+        return await DatabaseModule.get_all_entity_filtered_paginated(
+            ArchivedTask,
+            page,
+            limit,
+            filters={"board_id": board_id},
+            order="-archived_at",
+        )
+
+    @staticmethod
+    async def restore_task(archived_task: ArchivedTask, order: int) -> Task | None:
+        """
+        Move an archived task back to its column, at the given position
+        :return: None if the task was restored by a concurrent request
+        :rtype: Task | None
+        """
+        DatabaseRouter.stick_to_primary()
+        async with in_transaction(PRIMARY_CONNECTION) as connection:
+            deleted = (
+                await ArchivedTask.filter(id=archived_task.id)
+                .using_db(connection)
+                .delete()
+            )
+            if not deleted:
+                return None
+            return await Task.create(
+                id=archived_task.id,
+                title=archived_task.title,
+                description=archived_task.description,
+                order=order,
+                column_id=archived_task.column_id,
+                board_id=archived_task.board_id,
+                using_db=connection,
+            )
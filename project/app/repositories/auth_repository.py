@@ -1,5 +1,12 @@
+from datetime import datetime
+
+from tortoise.expressions import Subquery
+
 from app.modules.database_module import DatabaseModule
+from app.modules.database_module.database_router import DatabaseRouter
 from app.modules.database_module.models.default import User, UserSession
+from app.utils.timer_helper import utc_now
+from app.utils.token_helper import hash_token
 
 
 class AuthRepository:
@@ -19,7 +26,7 @@ class AuthRepository:
             UserSession,
             {
                 "user_id": user_id,
-                "refresh_token": refresh_token,
+                "refresh_token_hash": hash_token(refresh_token),
                 "user_agent": user_agent,
             },
         )
@@ -27,11 +34,71 @@ class AuthRepository:
     @staticmethod
     async def get_session(user_id: int, refresh_token: str) -> UserSession | None:
         return await DatabaseModule.get_entity_filtered(
-            UserSession, {"user_id": user_id, "refresh_token": refresh_token}
+            UserSession,
+            {"user_id": user_id, "refresh_token_hash": hash_token(refresh_token)},
+        )
+
+    @staticmethod
+    async def get_session_with_user(
+        refresh_token: str, email: str
+    ) -> UserSession | None:
+        """Get the session of the user with the user loaded in the same query"""
+        return (
+            await UserSession.filter(
+                refresh_token_hash=hash_token(refresh_token), user__email=email
+            )
+            .select_related("user")
+            .first()
+        )
+
+    @staticmethod
+    async def rotate_session(
+        session_id: int, refresh_token: str, new_refresh_token: str
+    ) -> bool:
+        """
+        Replace the refresh token of the session and touch last_used_at, in
+        one statement conditional on the session still holding the token
+        :return: False if the session was deleted or already rotated
+        :rtype: bool
+        """
+        DatabaseRouter.stick_to_primary()
+        updated = await UserSession.filter(
+            id=session_id, refresh_token_hash=hash_token(refresh_token)
+        ).update(
+            refresh_token_hash=hash_token(new_refresh_token), last_used_at=utc_now()
         )
+        return updated > 0
 
     @staticmethod
     async def delete_session(user_id: int, refresh_token: str) -> None:
-        session = await AuthRepository.get_session(user_id, refresh_token)
-        if session:
-            await DatabaseModule.remove_entity(UserSession, session.id)
+        DatabaseRouter.stick_to_primary()
+        await UserSession.filter(
+            user_id=user_id, refresh_token_hash=hash_token(refresh_token)
+        ).delete()
+
+    @staticmethod
+    async def delete_user_sessions(user_id: int) -> int:
+        """
+        Delete every session of the user in one statement
+        :return: number of deleted sessions
+        :rtype: int
+        """
+        DatabaseRouter.stick_to_primary()
+        return await UserSession.filter(user_id=user_id).delete()
+
+    @staticmethod
+    async def delete_expired_sessions(unused_since: datetime, batch_size: int) -> int:
+        """
+        Delete up to batch_size sessions unused since the given time, in one
+        statement walking the last_used_at index
+        :return: number of deleted sessions, below batch_size once done
+        :rtype: int
+        """
+        DatabaseRouter.stick_to_primary()
+        expired = (
+            UserSession.filter(last_used_at__lt=unused_since)
+            .order_by("last_used_at")
+            .limit(batch_size)
+            .values("id")
+        )
+        return await UserSession.filter(id__in=Subquery(expired)).delete()
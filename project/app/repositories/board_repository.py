@@ -1,7 +1,8 @@
 from tortoise.expressions import Q
 
 from app.modules.database_module import DatabaseModule
-from app.modules.database_module.models.default import Board, User
+from app.modules.database_module.models.default import Board, Task, User
+from app.repositories.user_repository import UserRepository
 
 
 class BoardRepository:
@@ -49,9 +50,11 @@ class BoardRepository:
         """Get all boards in workspace that are NOT favorites for the specified user"""
 
         # Get favorite board IDs for this user in this workspace
-        favorite_board_ids = await Board.filter(
-            workspace_id=workspace_id, users__id=user_id
-        ).values_list("id", flat=True)
+        favorite_board_ids = (
+            await Board.filter(workspace_id=workspace_id, users__id=user_id)
+            .using_db(DatabaseModule.get_read_connection())
+            .values_list("id", flat=True)
+        )
 
         # Filter out favorites
         if favorite_board_ids:
@@ -76,31 +79,116 @@ class BoardRepository:
     async def put_board(payload: dict, identifier: int) -> Board | None:
         return await DatabaseModule.put_entity(Board, payload, identifier)
 
+    @staticmethod
+    async def use_board_shard(board_id: int) -> None:
+        await DatabaseModule.use_entity_shard(Board, board_id)
+
     @staticmethod
     async def get_board_by_identifier(identifier: int) -> Board | None:
         return await DatabaseModule.get_entity(Board, identifier)
 
     @staticmethod
     async def is_favorite_board(board_id: int, user_id: int) -> bool:
-        return await Board.filter(id=board_id, users__id=user_id).exists()
+        return await DatabaseModule.exists_entity(
+            Board, {"id": board_id, "users__id": user_id}
+        )
 
     @staticmethod
     async def add_user_to_favorites(board: Board, user: User) -> None:
-        await board.users.add(user)
+        await DatabaseModule.add_related(Board, "users", board.id, {user.id})
 
     @staticmethod
     async def remove_user_from_favorites(board: Board, user: User) -> None:
-        await board.users.remove(user)
+        await DatabaseModule.remove_related(Board, "users", board.id, {user.id})
+
+    @staticmethod
+    async def get_user_accessible_boards(
+        user_id: int, workspace_ids: frozenset[int]
+    ) -> list[tuple[int, int, int]]:
+        """
+        Get the identifier, owner and workspace of the boards a user owns or
+        is member of, within the given workspaces of every shard
+        """
+        if not workspace_ids:
+            return []
+        results = await DatabaseModule.gather_shards(
+            lambda: Board.filter(
+                Q(members__id=user_id) | Q(owner_id=user_id),
+                workspace_id__in=list(workspace_ids),
+            )
+            .distinct()
+            .values_list("id", "owner_id", "workspace_id")
+        )
+        return [board for boards in results for board in boards]
+
+    @staticmethod
+    async def get_accessible_board_ids(user_id: int, board_ids: set[int]) -> set[int]:
+        """
+        Get which of the boards a user can open: member of the workspace of
+        the board, and owner or member of the board. Single joined query
+        per shard.
+        """
+        results = await DatabaseModule.gather_shards(
+            lambda: Board.filter(
+                Q(members__id=user_id) | Q(owner_id=user_id),
+                id__in=list(board_ids),
+                workspace__user__id=user_id,
+            )
+            .distinct()
+            .values_list("id", flat=True)
+        )
+        return {board_id for board_ids in results for board_id in board_ids}
+
+    @staticmethod
+    async def get_most_active_board_ids(limit: int, sample: int) -> list[int]:
+        """
+        Get the boards holding most of the latest tasks of the bound shard,
+        read from the newest rows of the task table only (primary key order)
+        so the cost does not grow with the table
+        :param limit: number of boards
+        :param sample: number of latest tasks considered
+        """
+        rows = await DatabaseModule.fetch_raw(
+            f"""
+            SELECT board_id
+            FROM (
+                SELECT board_id FROM "{Task._meta.db_table}"
+                ORDER BY id DESC LIMIT $1
+            ) t
+            GROUP BY board_id
+            ORDER BY COUNT(*) DESC, board_id
+            LIMIT $2
+            """,
+            [sample, limit],
+        )
+        return [row["board_id"] for row in rows]
 
     @staticmethod
     async def is_board_member(board_id: int, user_id: int) -> bool:
         """Check if a user is a member of a board"""
-        return await Board.filter(id=board_id, members__id=user_id).exists()
+        return await DatabaseModule.exists_entity(
+            Board, {"id": board_id, "members__id": user_id}
+        )
 
     @staticmethod
-    async def get_board_members(board_id: int) -> list:
-        """Get all members of a board"""
-        board = await Board.filter(id=board_id).prefetch_related("members").first()
-        if not board:
-            return []
-        return board.members
+    async def get_board_member_ids(board_id: int, user_ids: set[int]) -> set[int]:
+        return await DatabaseModule.get_related_ids(
+            Board, "members", board_id, user_ids
+        )
+
+    @staticmethod
+    async def add_board_members(board_id: int, user_ids: set[int]) -> None:
+        await DatabaseModule.add_related(Board, "members", board_id, user_ids)
+
+    @staticmethod
+    async def remove_board_members(board_id: int, user_ids: set[int]) -> None:
+        await DatabaseModule.remove_related(Board, "members", board_id, user_ids)
+
+    @staticmethod
+    async def get_board_members(
+        board_id: int, search: str | None, page: int, limit: int | None
+    ) -> list[dict]:
+        """Get a page of the members of a board"""
+        return await UserRepository.get_members(
+            Board, "members", board_id, search, page, limit
+        )
@@ -17,6 +17,10 @@ class ColumnRepository:
             {"name__iexact": payload.get("name"), "board_id": payload.get("board_id")},
         )
 
+    @staticmethod
+    async def use_column_shard(column_id: int) -> None:
+        await DatabaseModule.use_entity_shard(Column, column_id)
+
     @staticmethod
     async def get_column_by_id(column_id: int) -> Column | None:
         return await DatabaseModule.get_entity(Column, column_id)
@@ -16,18 +16,20 @@ class TaskRepository:
             Task,
             {
                 "title__iexact": payload.get("title"),
-                "column__board_id": payload.get("board_id"),
+                "board_id": payload.get("board_id"),
             },
         )
 
     @staticmethod
     async def get_all_tasks_by_board_id(board_id: int) -> list[Task]:
-        return await Task.filter(column__board_id=board_id).prefetch_related("column")
+        return await DatabaseModule.get_all_entity_filtered(
+            Task, {"board_id": board_id}
+        )
 
     @staticmethod
-    async def get_next_order_by_column_id(column_id: int) -> int:
+    async def get_next_order_by_column_id(column_id: int, board_id: int) -> int:
         result = (
-            await Task.filter(column_id=column_id)
+            await Task.filter(column_id=column_id, board_id=board_id)
             .annotate(max_order=Max("order"))
             .values("max_order")
         )
@@ -38,10 +40,29 @@ class TaskRepository:
         )
         return max_order + 1
 
+    @staticmethod
+    async def use_task_shard(task_id: int) -> None:
+        await DatabaseModule.use_entity_shard(Task, task_id)
+
     @staticmethod
     async def get_task_by_id(task_id: int) -> Task | None:
         return await DatabaseModule.get_entity_filtered(Task, {"id": task_id})
 
+    @staticmethod
+    async def get_task_with_column(task_id: int) -> Task | None:
+        """Get a task with its column loaded in the same query"""
+        return await Task.filter(id=task_id).select_related("column").first()
+
+    @staticmethod
+    async def get_tasks_with_column_by_ids(task_ids: list[int]) -> list[Task]:
+        """Get tasks with their column loaded, in one query per shard"""
+        results = await DatabaseModule.gather_shards(
+            lambda: Task.filter(id__in=task_ids)
+            .select_related("column")
+            .using_db(DatabaseModule.get_read_connection())
+        )
+        return [task for tasks in results for task in tasks]
+
     @staticmethod
     async def update_order_task(payload: dict) -> Task | None:
         old_order = payload.get("order")
@@ -49,7 +70,13 @@ class TaskRepository:
         column_id = payload.get("column_id")
         task_id = payload.get("task_id")
         return await OrderHelper.reorder_entity(
-            Task, task_id, "column_id", column_id, old_order, new_order
+            Task,
+            task_id,
+            "column_id",
+            column_id,
+            old_order,
+            new_order,
+            {"board_id": payload.get("board_id")},
         )
 
     @staticmethod
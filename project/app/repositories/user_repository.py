@@ -1,4 +1,7 @@
+from typing import Type
+
 from app.modules.database_module import DatabaseModule
+from app.modules.database_module.models.database_model import DatabaseModel
 from app.modules.database_module.models.default import User
 
 
@@ -11,6 +14,59 @@ class UserRepository:
     async def get_user_by_id(user_id: int) -> User | None:
         return await DatabaseModule.get_entity(User, user_id)
 
+    @staticmethod
+    async def get_user_ids_by_emails(emails: list[str]) -> dict[str, int]:
+        """
+        Resolve emails to user identifiers in one query, unknown emails are
+        left out
+        """
+        rows = await User.filter(email__in=emails).values_list("id", "email")
+        return {email: user_id for user_id, email in rows}
+
+    @staticmethod
+    async def get_members(
+        model: Type[DatabaseModel],
+        relation: str,
+        identifier: int,
+        search: str | None = None,
+        page: int = 0,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """
+        Get the members of a board or workspace as rows holding only the
+        user columns shown in member lists, with is_owner computed in SQL
+        :param model: entity with an owner_id and a many to many to User
+        :param relation: name of the many to many field holding the members
+        :param identifier: entity identifier
+        :param search: case insensitive prefix of the name or email
+        :param page: page number (zero-indexed), used with limit
+        :param limit: page size, all the members when None
+        :return: rows with id, name, surname, email and is_owner
+        :rtype: list[dict]
+        """
+        field = model._meta.fields_map[relation]
+        query = f"""
+            SELECT u.id, u.name, u.surname, u.email, u.id = e.owner_id AS is_owner
+            FROM "{field.through}" m
+            JOIN "{User._meta.db_table}" u ON u.id = m.{field.forward_key}
+            JOIN "{model._meta.db_table}" e ON e.id = m.{field.backward_key}
+            WHERE m.{field.backward_key} = $1
+        """
+        values = [identifier]
+        if search:
+            escaped = search.lower().replace("\\", "\\\\")
+            escaped = escaped.replace("%", "\\%").replace("_", "\\_")
+            values.append(f"{escaped}%")
+            query += f"""
+            AND (LOWER(u.name) LIKE ${len(values)} ESCAPE '\\'
+                OR LOWER(u.email) LIKE ${len(values)} ESCAPE '\\')
+            """
+        query += " ORDER BY u.id"
+        if limit is not None:
+            values.extend([limit, page * limit])
+            query += f" LIMIT ${len(values) - 1} OFFSET ${len(values)}"
+        return await DatabaseModule.fetch_raw(query, values)
+
     @staticmethod
     async def delete_user(user_id: int) -> User | None:
         return await DatabaseModule.remove_entity(User, user_id)
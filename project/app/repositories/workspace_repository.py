@@ -1,5 +1,11 @@
 from app.modules.database_module import DatabaseModule
-from app.modules.database_module.models.default import Workspace
+from app.modules.database_module.models.default import (
+    Board,
+    Task,
+    User,
+    Workspace,
+)
+from app.repositories.user_repository import UserRepository
 
 
 class WorkspaceRepository:
@@ -7,24 +13,75 @@ class WorkspaceRepository:
     async def create_workspace(payload: dict) -> Workspace | None:
         return await DatabaseModule.post_entity(Workspace, payload)
 
+    @staticmethod
+    def use_workspace_shard(workspace_id: int) -> None:
+        DatabaseModule.use_workspace_shard(workspace_id)
+
     @staticmethod
     async def get_workspace_by_name(payload: dict) -> Workspace | None:
-        return await DatabaseModule.get_entity_filtered(
-            Workspace,
-            {"name__iexact": payload.get("name"), "owner_id": payload.get("owner_id")},
+        """Names are unique per owner across the shards"""
+        workspaces = await DatabaseModule.gather_shards(
+            lambda: DatabaseModule.get_entity_filtered(
+                Workspace,
+                {
+                    "name__iexact": payload.get("name"),
+                    "owner_id": payload.get("owner_id"),
+                },
+            )
         )
+        return next((workspace for workspace in workspaces if workspace), None)
 
     @staticmethod
-    async def check_user_contain_workspace(payload: dict) -> Workspace | None:
-        return await DatabaseModule.get_entity_filtered(
+    async def check_user_contain_workspace(payload: dict) -> bool:
+        return await DatabaseModule.exists_entity(
             Workspace,
             {"id": payload.get("workspace_id"), "user__id": payload.get("user_id")},
         )
 
     @staticmethod
-    async def get_all_workspace(user_email: str) -> list[Workspace] | None:
-        return await DatabaseModule.get_all_entity_filtered(
-            Workspace, {"user__email": user_email}
+    async def get_all_workspace(user_id: int) -> list[dict]:
+        """
+        Get the workspaces of a user with their board and member counts and
+        the latest update of the workspace, its boards or its tasks, from
+        every shard
+        """
+        workspace = Workspace._meta.db_table
+        through = Workspace._meta.fields_map["user"].through
+        board, task = Board._meta.db_table, Task._meta.db_table
+        rows = await DatabaseModule.fetch_raw_sharded(
+            f"""
+            SELECT w.id, w.name, w.owner_id, w.updated_at,
+                (SELECT COUNT(*) FROM "{board}" b WHERE b.workspace_id = w.id)
+                    AS board_count,
+                (SELECT COUNT(*) FROM "{through}" m WHERE m.workspace_id = w.id)
+                    AS member_count,
+                (SELECT MAX(b.updated_at) FROM "{board}" b
+                    WHERE b.workspace_id = w.id) AS boards_updated_at,
+                (SELECT MAX(t.updated_at) FROM "{task}" t
+                    WHERE t.board_id IN (
+                        SELECT b.id FROM "{board}" b WHERE b.workspace_id = w.id
+                    )) AS tasks_updated_at
+            FROM "{workspace}" w
+            JOIN "{through}" wu ON wu.workspace_id = w.id
+            WHERE wu.user_id = $1
+            ORDER BY w.id
+            """,
+            [user_id],
+        )
+        return sorted(rows, key=lambda row: row["id"])
+
+    @staticmethod
+    async def get_user_workspaces(user_id: int) -> list[tuple[int, int]]:
+        """Get the identifier and owner of the workspaces of a user"""
+        results = await DatabaseModule.gather_shards(
+            lambda: Workspace.filter(user__id=user_id).values_list("id", "owner_id")
+        )
+        return [workspace for workspaces in results for workspace in workspaces]
+
+    @staticmethod
+    async def get_all_workspace_member_ids(workspace_id: int) -> list[int]:
+        return await User.filter(workspaces__id=workspace_id).values_list(
+            "id", flat=True
         )
 
     @staticmethod
@@ -32,14 +89,29 @@ class WorkspaceRepository:
         return await DatabaseModule.get_entity(Workspace, workspace_id)
 
     @staticmethod
-    async def get_workspace_members(workspace_id: int) -> list:
-        """Get all members of a workspace"""
-        workspace = (
-            await Workspace.filter(id=workspace_id).prefetch_related("user").first()
+    async def get_workspace_member_ids(
+        workspace_id: int, user_ids: set[int]
+    ) -> set[int]:
+        return await DatabaseModule.get_related_ids(
+            Workspace, "user", workspace_id, user_ids
+        )
+
+    @staticmethod
+    async def add_workspace_members(workspace_id: int, user_ids: set[int]) -> None:
+        await DatabaseModule.add_related(Workspace, "user", workspace_id, user_ids)
+
+    @staticmethod
+    async def remove_workspace_members(workspace_id: int, user_ids: set[int]) -> None:
+        await DatabaseModule.remove_related(Workspace, "user", workspace_id, user_ids)
+
+    @staticmethod
+    async def get_workspace_members(
+        workspace_id: int, search: str | None, page: int, limit: int | None
+    ) -> list[dict]:
+        """Get a page of the members of a workspace"""
+        return await UserRepository.get_members(
+            Workspace, "user", workspace_id, search, page, limit
         )
-        if not workspace:
-            return []
-        return workspace.user
 
     @staticmethod
     async def delete_workspace(workspace_id: int) -> Workspace | None:
@@ -70,7 +70,9 @@ class BaseException(HTTPException):
     Base class for custom exceptions in the application
     """
 
-    def __init__(self, exception_info: BaseExceptionInfo):
+    def __init__(
+        self, exception_info: BaseExceptionInfo, headers: dict[str, str] | None = None
+    ):
         detail = {
             "code": exception_info.error_code,
             "error": exception_info.error_message,
@@ -78,4 +80,5 @@ class BaseException(HTTPException):
         super().__init__(
             status_code=exception_info.http_code,
             detail=detail,
+            headers=headers,
         )
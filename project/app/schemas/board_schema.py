@@ -1,7 +1,10 @@
 from datetime import datetime
 from typing import Optional
 
+from pydantic import Field
+
 from app.schemas.base_schema import BaseSchema
+from app.schemas.membership_schema import MAX_BULK_MEMBERS, MembershipResultSchema
 
 
 class BoardCreateSchema(BaseSchema):
@@ -42,6 +45,21 @@ class BoardRemoveMemberSchema(BaseSchema):
     user_email_to_remove: str
 
 
+class BoardBulkInvitationSchema(BaseSchema):
+    board_id: int
+    invited_user_emails: list[str] = Field(min_length=1, max_length=MAX_BULK_MEMBERS)
+
+
+class BoardBulkRemoveMemberSchema(BaseSchema):
+    board_id: int
+    user_emails_to_remove: list[str] = Field(min_length=1, max_length=MAX_BULK_MEMBERS)
+
+
+class BoardBulkMembershipOutputSchema(BaseSchema):
+    board_id: int
+    results: list[MembershipResultSchema]
+
+
 class BoardMemberOutputSchema(BaseSchema):
     id: int
     name: str
@@ -0,0 +1,21 @@
+from enum import Enum
+
+from app.schemas.base_schema import BaseSchema
+
+# Upper bound of emails per bulk invite or removal, keeps the IN lists and
+# the multi row insert within the database parameter limits
+MAX_BULK_MEMBERS = 1000
+
+
+class MembershipStatus(str, Enum):
+    ADDED = "added"
+    REMOVED = "removed"
+    ALREADY_MEMBER = "already_member"
+    NOT_MEMBER = "not_member"
+    USER_NOT_FOUND = "user_not_found"
+    OWNER = "owner"
+
+
+class MembershipResultSchema(BaseSchema):
+    email: str
+    status: MembershipStatus
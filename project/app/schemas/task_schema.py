@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import Enum
 
 from pydantic import Field
 
@@ -24,6 +25,35 @@ class TaskOutputSchema(TaskCreateSchema):
     updated_at: datetime
 
 
+# Archived task (the identifier is the one of the task)
+class ArchivedTaskOutputSchema(TaskOutputSchema):
+    board_id: int
+    archived_at: datetime
+
+
+class ArchivedTaskPaginateSchema(BaseSchema):
+    data: list[ArchivedTaskOutputSchema]
+    total: int
+
+
+class TaskArchiveOutputSchema(BaseSchema):
+    archived: int
+
+
+# Task fields of the board reads
+class BoardView(str, Enum):
+    FULL = "full"
+    COMPACT = "compact"  # no descriptions nor timestamps
+
+
+COMPACT_TASK_FIELDS = frozenset({"id", "title", "order", "column_id"})
+MAX_TASK_IDS = 1000
+
+
+class TaskIdsSchema(BaseSchema):
+    ids: list[int] = Field(min_length=1, max_length=MAX_TASK_IDS)
+
+
 class TaskFilterByTitleAndBoard(BaseSchema):
     title: str
     board_id: int
@@ -1,6 +1,10 @@
 from datetime import datetime
+from enum import Enum
+
+from pydantic import Field
 
 from app.schemas.base_schema import BaseSchema
+from app.schemas.membership_schema import MAX_BULK_MEMBERS, MembershipResultSchema
 
 
 class WorkspaceInputSchema(BaseSchema):
@@ -23,8 +27,18 @@ class WorkspaceFilterByUserInputSchema(BaseSchema):
     user_id: int
 
 
+class WorkspaceRole(str, Enum):
+    OWNER = "owner"
+    MEMBER = "member"
+
+
 class WorkspaceFilterByUserIdOutputSchema(WorkspaceInputSchema):
     id: int
+    owner_id: int
+    role: WorkspaceRole
+    board_count: int
+    member_count: int
+    last_activity: datetime
 
 
 class WorkspaceInvitationSchema(BaseSchema):
@@ -37,6 +51,21 @@ class WorkspaceRemoveMemberSchema(BaseSchema):
     user_email_to_remove: str
 
 
+class WorkspaceBulkInvitationSchema(BaseSchema):
+    workspace_id: int
+    invited_user_emails: list[str] = Field(min_length=1, max_length=MAX_BULK_MEMBERS)
+
+
+class WorkspaceBulkRemoveMemberSchema(BaseSchema):
+    workspace_id: int
+    user_emails_to_remove: list[str] = Field(min_length=1, max_length=MAX_BULK_MEMBERS)
+
+
+class WorkspaceBulkMembershipOutputSchema(BaseSchema):
+    workspace_id: int
+    results: list[MembershipResultSchema]
+
+
 class WorkspaceMemberOutputSchema(BaseSchema):
     id: int
     name: str
@@ -1,6 +1,4 @@
-from supabase_auth.errors import AuthApiError, AuthRetryableError
-
-from app.core.supabase.supabase_client import get_supabase
+from app.core.supabase.supabase_client import auth_errors, get_supabase
 from app.repositories.auth_repository import AuthRepository
 from app.schemas.auth_schema import (
     AuthResponseSchema,
@@ -15,7 +13,12 @@ from app.services.auth_service.auth_service_exception import (
     AuthServiceException,
     AuthServiceExceptionInfo,
 )
-from app.utils.timer_helper import utc_now
+from app.services.auth_service.session_cache import SessionCache, SessionEntry
+from app.utils.single_flight import SingleFlight
+from app.utils.token_helper import hash_token
+
+# Concurrent refreshes of the same token share one Supabase round trip
+_refresh_flights = SingleFlight("auth_refresh")
 
 
 class AuthService:
@@ -36,7 +39,7 @@ class AuthService:
             response = await supabase.auth.sign_up(
                 {"email": data.email, "password": data.password}
             )
-        except (AuthApiError, AuthRetryableError) as e:
+        except auth_errors() as e:
             raise AuthServiceException(
                 AuthServiceExceptionInfo.ERROR_USER_CREATION_FAILED
             ) from e
@@ -54,18 +57,21 @@ class AuthService:
             # Rollback Supabase registration if local DB insertion fails
             try:
                 await supabase.auth.admin.delete_user(user_id=response.user.id)
-            except (AuthApiError, AuthRetryableError):
+            except auth_errors():
                 pass
             raise AuthServiceException(
                 AuthServiceExceptionInfo.ERROR_USER_CREATION_FAILED
             ) from e
 
         if response.session:
-            await AuthRepository.create_session(
+            session = await AuthRepository.create_session(
                 user_id=user.id,
                 refresh_token=response.session.refresh_token,
                 user_agent=user_agent,
             )
+            SessionCache.put(
+                response.session.refresh_token, session.id, user.id, user.email
+            )
 
         return AuthResponseSchema(
             access_token=response.session.access_token if response.session else "",
@@ -90,16 +96,19 @@ class AuthService:
             response = await supabase.auth.sign_in_with_password(
                 {"email": data.email, "password": data.password}
             )
-        except (AuthApiError, AuthRetryableError) as e:
+        except auth_errors() as e:
             raise AuthServiceException(
                 AuthServiceExceptionInfo.ERROR_INVALID_CREDENTIALS
             ) from e
 
-        await AuthRepository.create_session(
+        session = await AuthRepository.create_session(
             user_id=user.id,
             refresh_token=response.session.refresh_token,
             user_agent=user_agent,
         )
+        SessionCache.put(
+            response.session.refresh_token, session.id, user.id, user.email
+        )
         return AuthResponseSchema(
             access_token=response.session.access_token,
             refresh_token=response.session.refresh_token,
@@ -108,23 +117,46 @@ class AuthService:
         )
 
     @staticmethod
-    async def refresh(data: RefreshSchema, user_id: int) -> AuthResponseSchema:
+    async def refresh(data: RefreshSchema, user_email: str) -> AuthResponseSchema:
         """
         Refresh user access token using a valid refresh token.
-        Updates the last_used_at timestamp in the local session.
+        Rotates the refresh token of the local session and updates its
+        last_used_at timestamp.
+
+        A token refreshed again within the reuse interval gets the same
+        response without reaching Supabase, and concurrent refreshes of the
+        same token are coalesced into a single upstream call.
         """
-        # Get session from DB
-        session = await AuthRepository.get_session(user_id, data.refresh_token)
-        if not session:
-            raise AuthServiceException(
-                AuthServiceExceptionInfo.ERROR_REFRESH_TOKEN_INVALID
+        refreshed = SessionCache.get_refreshed(data.refresh_token)
+        if refreshed and refreshed.email == user_email:
+            return refreshed
+
+        return await _refresh_flights.run(
+            (hash_token(data.refresh_token), user_email),
+            lambda: AuthService._refresh_session(data.refresh_token, user_email),
+        )
+
+    @staticmethod
+    async def _refresh_session(
+        refresh_token: str, user_email: str
+    ) -> AuthResponseSchema:
+        # Get session and user from the index, or from DB in one query
+        entry = SessionCache.get(refresh_token)
+        if not entry or entry.email != user_email:
+            session = await AuthRepository.get_session_with_user(
+                refresh_token, user_email
             )
+            if not session:
+                raise AuthServiceException(
+                    AuthServiceExceptionInfo.ERROR_REFRESH_TOKEN_INVALID
+                )
+            entry = SessionEntry(session.id, session.user.id, session.user.email, 0)
 
         # Ask Supabase to refresh the session
         supabase = await get_supabase()
         try:
-            response = await supabase.auth.refresh_session(data.refresh_token)
-        except (AuthApiError, AuthRetryableError) as e:
+            response = await supabase.auth.refresh_session(refresh_token)
+        except auth_errors() as e:
             raise AuthServiceException(
                 AuthServiceExceptionInfo.ERROR_REFRESH_TOKEN_INVALID
             ) from e
@@ -133,19 +165,28 @@ class AuthService:
                 AuthServiceExceptionInfo.ERROR_REFRESH_TOKEN_INVALID
             ) from e
 
-        # Update last used timestamp in local DB
-        session.last_used_at = utc_now()
-        await session.save()
-
-        # Load user from session relationship
-        user = await session.user
+        # Store the rotated token, fails if the session was deleted meanwhile
+        new_refresh_token = response.session.refresh_token
+        rotated = await AuthRepository.rotate_session(
+            entry.session_id, refresh_token, new_refresh_token
+        )
+        if not rotated:
+            SessionCache.invalidate(refresh_token)
+            raise AuthServiceException(
+                AuthServiceExceptionInfo.ERROR_REFRESH_TOKEN_INVALID
+            )
 
-        return AuthResponseSchema(
+        auth_response = AuthResponseSchema(
             access_token=response.session.access_token,
-            refresh_token=response.session.refresh_token,
-            user_id=user.id,
-            email=user.email,
+            refresh_token=new_refresh_token,
+            user_id=entry.user_id,
+            email=entry.email,
+        )
+        SessionCache.put_refreshed(refresh_token, auth_response)
+        SessionCache.put(
+            new_refresh_token, entry.session_id, entry.user_id, entry.email
         )
+        return auth_response
 
     @staticmethod
     async def logout(data: LogoutSchema, user_id: int):
@@ -153,6 +194,7 @@ class AuthService:
         Delete the session associated with the given refresh token.
         """
         await AuthRepository.delete_session(user_id, data.refresh_token)
+        SessionCache.invalidate(data.refresh_token)
         return {"message": "Logged out successfully"}
 
     @staticmethod
@@ -163,7 +205,7 @@ class AuthService:
         supabase = await get_supabase()
         try:
             await supabase.auth.reset_password_email(data.email)
-        except (AuthApiError, AuthRetryableError) as e:
+        except auth_errors() as e:
             raise AuthServiceException(
                 AuthServiceExceptionInfo.ERROR_PASSWORD_RESET_FAILED
             ) from e
@@ -183,7 +225,7 @@ class AuthService:
             await supabase.auth.update_user(
                 {"password": data.new_password}, data.access_token
             )
-        except (AuthApiError, AuthRetryableError) as e:
+        except auth_errors() as e:
             raise AuthServiceException(
                 AuthServiceExceptionInfo.ERROR_PASSWORD_RESET_FAILED
             ) from e
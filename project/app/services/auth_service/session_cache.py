@@ -0,0 +1,116 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.app_config import app_settings
+from app.schemas.auth_schema import AuthResponseSchema
+from app.utils.token_helper import hash_token
+
+
+@dataclass(frozen=True)
+class SessionEntry:
+    session_id: int
+    user_id: int
+    email: str
+    loaded_at: float
+
+
+class SessionCache:
+    """
+    Per worker index of the UserSession rows by refresh token, so refreshes
+    do not load the session and its user again, and of the responses of the
+    latest refreshes.
+
+    A refresh token used again within auth_refresh_reuse_interval gets the
+    response of its previous refresh (the same reuse interval Supabase
+    applies), which absorbs clients retrying or refreshing from several
+    tabs at once. Tokens are only kept hashed.
+
+    An entry does not prove the session still exists: the session update
+    of the refresh is conditional on the row, a session deleted by another
+    worker is rejected there.
+    """
+
+    _sessions: OrderedDict[str, SessionEntry] = OrderedDict()
+    _refreshed: OrderedDict[str, tuple[AuthResponseSchema, float]] = OrderedDict()
+
+    @classmethod
+    def get(cls, refresh_token: str) -> SessionEntry | None:
+        key = hash_token(refresh_token)
+        entry = cls._sessions.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.loaded_at >= app_settings.session_cache_ttl:
+            cls._sessions.pop(key, None)
+            return None
+        cls._sessions.move_to_end(key)
+        return entry
+
+    @classmethod
+    def put(cls, refresh_token: str, session_id: int, user_id: int, email: str):
+        key = hash_token(refresh_token)
+        cls._sessions[key] = SessionEntry(session_id, user_id, email, time.monotonic())
+        cls._sessions.move_to_end(key)
+        while len(cls._sessions) > app_settings.session_cache_max_entries:
+            cls._sessions.popitem(last=False)
+
+    @classmethod
+    def get_refreshed(cls, refresh_token: str) -> AuthResponseSchema | None:
+        """
+        Get the response of a refresh of the token done within the reuse
+        interval
+        """
+        key = hash_token(refresh_token)
+        refreshed = cls._refreshed.get(key)
+        if refreshed is None:
+            return None
+        response, refreshed_at = refreshed
+        if time.monotonic() - refreshed_at >= app_settings.auth_refresh_reuse_interval:
+            cls._refreshed.pop(key, None)
+            return None
+        return response
+
+    @classmethod
+    def put_refreshed(cls, refresh_token: str, response: AuthResponseSchema):
+        """
+        Remember the response of a refresh, the refreshed token is replaced
+        by the one in the response
+        """
+        key = hash_token(refresh_token)
+        cls._sessions.pop(key, None)
+        cls._refreshed[key] = (response, time.monotonic())
+        while len(cls._refreshed) > app_settings.session_cache_max_entries:
+            cls._refreshed.popitem(last=False)
+
+    @classmethod
+    def invalidate(cls, refresh_token: str) -> None:
+        """
+        Revoke a refresh token, with the refresh responses that handed it
+        out: the tokens they replaced must not return it again
+        """
+        key = hash_token(refresh_token)
+        cls._sessions.pop(key, None)
+        cls._refreshed.pop(key, None)
+        cls._refreshed = OrderedDict(
+            (key, refreshed)
+            for key, refreshed in cls._refreshed.items()
+            if refreshed[0].refresh_token != refresh_token
+        )
+
+    @classmethod
+    def invalidate_user(cls, user_id: int) -> None:
+        cls._sessions = OrderedDict(
+            (key, entry)
+            for key, entry in cls._sessions.items()
+            if entry.user_id != user_id
+        )
+        cls._refreshed = OrderedDict(
+            (key, refreshed)
+            for key, refreshed in cls._refreshed.items()
+            if refreshed[0].user_id != user_id
+        )
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._sessions.clear()
+        cls._refreshed.clear()
@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import random
+from datetime import timedelta
+
+from app.app_config import app_settings
+from app.core.monitoring.metrics_registry import Counter, MetricsRegistry
+from app.repositories.auth_repository import AuthRepository
+from app.utils.timer_helper import utc_now
+
+logger = logging.getLogger(__name__)
+
+# Pause between two batches, so that the sweep never holds a connection
+# (or the locks of the rows) for long
+BATCH_PAUSE = 0.1
+
+
+class SessionSweeper:
+    """
+    Prune the sessions unused for session_expiry_days, which are otherwise
+    only removed on logout. Every worker runs the sweeper, the batches of
+    concurrent sweeps simply find fewer rows.
+    """
+
+    deleted = Counter(
+        "expired_sessions_deleted_total",
+        "Sessions deleted by the expiry sweeper",
+        (),
+    )
+
+    @classmethod
+    async def sweep(cls) -> int:
+        """
+        Delete the expired sessions in batches of session_sweep_batch_size
+        :return: number of deleted sessions
+        :rtype: int
+        """
+        unused_since = utc_now() - timedelta(days=app_settings.session_expiry_days)
+        batch_size = app_settings.session_sweep_batch_size
+        total = 0
+        while True:
+            deleted = await AuthRepository.delete_expired_sessions(
+                unused_since, batch_size
+            )
+            total += deleted
+            cls.deleted.inc((), deleted)
+            if deleted < batch_size:
+                return total
+            await asyncio.sleep(BATCH_PAUSE)
+
+    @classmethod
+    async def run(cls) -> None:
+        """
+        Sweep every session_sweep_interval, meant to run as a background task
+        """
+        # Spread the sweeps of the workers started together
+        await asyncio.sleep(random.uniform(0, app_settings.session_sweep_interval))
+        while True:
+            try:
+                deleted = await cls.sweep()
+                if deleted:
+                    logger.info("deleted %d expired sessions", deleted)
+            except Exception:
+                logger.warning("expired sessions not swept", exc_info=True)
+            await asyncio.sleep(app_settings.session_sweep_interval)
+
+
+MetricsRegistry.register(SessionSweeper.deleted)
@@ -0,0 +1,17 @@
+class BoardRevision:
+    """
+    Per worker revision of the content (columns and tasks) of each board,
+    bumped by the services after every change. Reads keyed by revision never
+    share or reuse a result computed before a change made by this worker.
+    """
+
+    _revisions: dict[int, int] = {}
+
+    @classmethod
+    def get(cls, board_id: int) -> int:
+        return cls._revisions.get(board_id, 0)
+
+    @classmethod
+    def bump(cls, *board_ids: int) -> None:
+        for board_id in set(board_ids):
+            cls._revisions[board_id] = cls._revisions.get(board_id, 0) + 1
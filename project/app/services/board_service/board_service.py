@@ -2,6 +2,9 @@ from tortoise.expressions import Q
 
 from app.repositories.board_repository import BoardRepository
 from app.schemas.board_schema import (
+    BoardBulkInvitationSchema,
+    BoardBulkMembershipOutputSchema,
+    BoardBulkRemoveMemberSchema,
     BoardCreateSchema,
     BoardFavoriteSchema,
     BoardFilterByNameSchema,
@@ -11,11 +14,13 @@ from app.schemas.board_schema import (
     BoardPaginateSchema,
     BoardRemoveMemberSchema,
 )
+from app.schemas.membership_schema import MembershipResultSchema, MembershipStatus
 from app.schemas.workspace_schema import WorkspaceFilterByUserInputSchema
 from app.services.board_service.board_service_exception import (
     BoardServiceException,
     BoardServiceExceptionInfo,
 )
+from app.services.permission_service.membership_cache import MembershipCache
 from app.services.permission_service.permission_service import PermissionService
 from app.services.user_service.user_service import UserService
 from app.services.workspace_service.workspace_service import WorkspaceService
@@ -62,7 +67,8 @@ class BoardService:
         response = BoardOutputSchema(**board_model.__dict__)
 
         # Auto-add creator as board member
-        await board_model.members.add(user)
+        await BoardRepository.add_board_members(board_model.id, {user.id})
+        MembershipCache.invalidate([user.id])
 
         # Add to favorites if indicated using repository methods
         if board.is_favorite:
@@ -147,6 +153,7 @@ class BoardService:
         user = await UserService.get_user_by_email_model(user_email)
 
         # Retrieve the board
+        await BoardRepository.use_board_shard(board_id)
         board = await BoardRepository.get_board_by_identifier(board_id)
         if not board:
             raise BoardServiceException(BoardServiceExceptionInfo.ERROR_BOARD_NOT_FOUND)
@@ -203,9 +210,6 @@ class BoardService:
                 BoardServiceExceptionInfo.ERROR_INVITED_USER_NOT_FOUND
             )
 
-        # Get board
-        board = await BoardRepository.get_board_by_identifier(invitation.board_id)
-
         # Check if user is already a member
         is_already_member = await BoardRepository.is_board_member(
             invitation.board_id, invited_user.id
@@ -217,10 +221,44 @@ class BoardService:
             )
 
         # Add user to board members
-        await board.members.add(invited_user)
+        await BoardRepository.add_board_members(invitation.board_id, {invited_user.id})
+        MembershipCache.invalidate([invited_user.id])
 
         return invitation
 
+    @staticmethod
+    async def invite_users_to_board(
+        invitation: BoardBulkInvitationSchema, inviter_email: str
+    ) -> BoardBulkMembershipOutputSchema:
+        """Invite several users to a board at once, reporting the result per email"""
+        await PermissionService.validate_board_ownership(
+            inviter_email, invitation.board_id
+        )
+
+        emails, user_ids = await UserService.get_user_ids_by_emails(
+            invitation.invited_user_emails
+        )
+        existing_ids = await BoardRepository.get_board_member_ids(
+            invitation.board_id, set(user_ids.values())
+        )
+        added_ids = set(user_ids.values()) - existing_ids
+        await BoardRepository.add_board_members(invitation.board_id, added_ids)
+        MembershipCache.invalidate(added_ids)
+
+        results = []
+        for email in emails:
+            if email not in user_ids:
+                status = MembershipStatus.USER_NOT_FOUND
+            elif user_ids[email] in existing_ids:
+                status = MembershipStatus.ALREADY_MEMBER
+            else:
+                status = MembershipStatus.ADDED
+            results.append(MembershipResultSchema(email=email, status=status))
+
+        return BoardBulkMembershipOutputSchema(
+            board_id=invitation.board_id, results=results
+        )
+
     @staticmethod
     async def remove_user_from_board(
         removal: BoardRemoveMemberSchema, remover_email: str
@@ -261,31 +299,63 @@ class BoardService:
             )
 
         # Remove user from board
-        await board.members.remove(user_to_remove)
+        await BoardRepository.remove_board_members(
+            removal.board_id, {user_to_remove.id}
+        )
+        MembershipCache.invalidate([user_to_remove.id])
 
         return removal
 
     @staticmethod
-    async def get_board_members(
-        board_id: int, requester_email: str
-    ) -> list[BoardMemberOutputSchema]:
-        """Get all members of a board"""
-        # Validate requester has access to board
-        await PermissionService.validate_user_board_access(requester_email, board_id)
+    async def remove_users_from_board(
+        removal: BoardBulkRemoveMemberSchema, remover_email: str
+    ) -> BoardBulkMembershipOutputSchema:
+        """Remove several users from a board at once, reporting the result per email"""
+        await PermissionService.validate_board_ownership(
+            remover_email, removal.board_id
+        )
 
-        # Get board members
-        members = await BoardRepository.get_board_members(board_id)
+        board = await BoardRepository.get_board_by_identifier(removal.board_id)
+        if not board:
+            raise BoardServiceException(BoardServiceExceptionInfo.ERROR_BOARD_NOT_FOUND)
 
-        # Get board owner info
-        board = await BoardRepository.get_board_by_identifier(board_id)
+        emails, user_ids = await UserService.get_user_ids_by_emails(
+            removal.user_emails_to_remove
+        )
+        member_ids = await BoardRepository.get_board_member_ids(
+            removal.board_id, set(user_ids.values())
+        )
+        # The owner is never removed
+        member_ids.discard(board.owner_id)
+        await BoardRepository.remove_board_members(removal.board_id, member_ids)
+        MembershipCache.invalidate(member_ids)
+
+        results = []
+        for email in emails:
+            if email not in user_ids:
+                status = MembershipStatus.USER_NOT_FOUND
+            elif user_ids[email] == board.owner_id:
+                status = MembershipStatus.OWNER
+            elif user_ids[email] in member_ids:
+                status = MembershipStatus.REMOVED
+            else:
+                status = MembershipStatus.NOT_MEMBER
+            results.append(MembershipResultSchema(email=email, status=status))
+
+        return BoardBulkMembershipOutputSchema(
+            board_id=removal.board_id, results=results
+        )
 
-        return [
-            BoardMemberOutputSchema(
-                id=member.id,
-                name=member.name,
-                surname=member.surname,
-                email=member.email,
-                is_owner=member.id == board.owner_id,
-            )
-            for member in members
-        ]
+    @staticmethod
+    async def get_board_members(
+        board_id: int,
+        search: str | None = None,
+        page: int = 0,
+        limit: int | None = None,
+    ) -> list[BoardMemberOutputSchema]:
+        """
+        Get the members of a board, optionally filtered and paginated.
+        Access is validated by the caller.
+        """
+        members = await BoardRepository.get_board_members(board_id, search, page, limit)
+        return [BoardMemberOutputSchema(**member) for member in members]
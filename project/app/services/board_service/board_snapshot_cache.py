@@ -0,0 +1,110 @@
+from app.app_config import app_settings
+from app.core.cache.cache_backend import CacheBackend, create_cache_backend
+from app.core.monitoring.metrics_registry import Counter, Gauge, MetricsRegistry
+from app.services.board_service.board_revision import BoardRevision
+
+
+class BoardSnapshotCache:
+    """
+    Serialized board snapshots (columns with their tasks, as JSON) keyed by
+    board and revision. Every change of a board increments its revision in
+    the backend, so a snapshot is never served after a change even when it
+    was stored by a request that started before it: it is stored under the
+    previous revision and left to expire. The backend is shared by the
+    workers (redis), the local one is only used by a single worker.
+    """
+
+    # With several local backends, the revisions bumped by a worker would
+    # not be seen by the others, still serving the previous revision
+    backend: CacheBackend | None = create_cache_backend(
+        "SNAPSHOT_CACHE_BACKEND",
+        app_settings.snapshot_cache_backend,
+        app_settings.snapshot_cache_redis_url,
+        app_settings.snapshot_cache_max_bytes,
+    )
+    requests = Counter(
+        "board_snapshot_cache_requests_total",
+        "Board snapshot cache lookups",
+        ("result",),
+    )
+
+    @classmethod
+    def configure(cls, backend: CacheBackend | None) -> None:
+        cls.backend = backend
+
+    @classmethod
+    async def get_revision(cls, board_id: int) -> int:
+        if cls.backend is None:
+            return BoardRevision.get(board_id)
+        return await cls.backend.get_counter(f"board:{board_id}:revision")
+
+    @staticmethod
+    def _key(board_id: int, revision: int, variant: str | None) -> str:
+        key = f"board:{board_id}:{revision}"
+        return f"{key}:{variant}" if variant else key
+
+    @classmethod
+    async def get(
+        cls, board_id: int, revision: int, variant: str | None = None
+    ) -> bytes | None:
+        """
+        :param variant: task fields of a partial snapshot, None for the
+            full snapshot
+        """
+        if cls.backend is None:
+            return None
+        snapshot = await cls.backend.get(cls._key(board_id, revision, variant))
+        cls.requests.inc(("hit" if snapshot is not None else "miss",))
+        return snapshot
+
+    @classmethod
+    async def set(
+        cls,
+        board_id: int,
+        revision: int,
+        snapshot: bytes,
+        variant: str | None = None,
+    ) -> None:
+        if cls.backend is not None:
+            await cls.backend.set(
+                cls._key(board_id, revision, variant),
+                snapshot,
+                app_settings.snapshot_cache_ttl,
+            )
+
+    @classmethod
+    async def invalidate(cls, *board_ids: int) -> None:
+        """
+        Record a change of the boards, called by the services after every
+        write of their columns or tasks. Partial snapshots of the previous
+        revision are left to expire.
+        """
+        BoardRevision.bump(*board_ids)
+        if cls.backend is None:
+            return
+        for board_id in set(board_ids):
+            revision = await cls.backend.incr(f"board:{board_id}:revision")
+            await cls.backend.delete(f"board:{board_id}:{revision - 1}")
+
+    @classmethod
+    def hit_ratio(cls) -> float:
+        hits = cls.requests.get(("hit",))
+        total = hits + cls.requests.get(("miss",))
+        return hits / total if total else 0.0
+
+
+MetricsRegistry.register(BoardSnapshotCache.requests)
+MetricsRegistry.register(
+    Gauge(
+        "board_snapshot_cache_hit_ratio",
+        "Share of board snapshot lookups served from the cache",
+        BoardSnapshotCache.hit_ratio,
+    )
+)
+MetricsRegistry.register(
+    Gauge(
+        "board_snapshot_cache_bytes",
+        "Bytes held by the board snapshot cache of this worker",
+        lambda: BoardSnapshotCache.backend.size() if BoardSnapshotCache.backend else 0,
+    )
+)
@@ -1,5 +1,6 @@
 from tortoise.exceptions import IntegrityError
 
+from app.modules.database_module.models.default import Column
 from app.repositories.column_repository import ColumnRepository
 from app.schemas.column_schema import (
     ColumnFilterNameAndBoardIdSchema,
@@ -8,21 +9,28 @@ from app.schemas.column_schema import (
     ColumnUpdateNameSchema,
     ColumnUpdateOrderSchema,
 )
+from app.services.board_service.board_revision import BoardRevision
+from app.services.board_service.board_snapshot_cache import BoardSnapshotCache
 from app.services.column_service.column_service_exception import (
     ColumnServiceException,
     ColumnServiceExceptionInfo,
 )
+from app.services.permission_service.membership_cache import Membership
 from app.services.permission_service.permission_service import PermissionService
+from app.utils.single_flight import SingleFlight
 from app.utils.string_helper import StringHelper
 
+# Identical concurrent column reads (same board and revision) share one query
+_column_reads = SingleFlight("columns_by_board")
+
 
 class ColumnService:
     @staticmethod
     async def create_column(
-        column: ColumnInputSchema, user_email: str
+        column: ColumnInputSchema, user: Membership
     ) -> ColumnOutputSchema:
         # Validate user has permission to create columns in this board
-        await PermissionService.validate_user_board_access(user_email, column.board_id)
+        await PermissionService.get_accessible_board(user, column.board_id)
 
         # clean and validate the name
         clean_name = StringHelper.normalize_and_validate(column.name)
@@ -63,6 +71,7 @@ class ColumnService:
                 ColumnServiceExceptionInfo.ERROR_CREATING_COLUMN
             )
 
+        await BoardSnapshotCache.invalidate(column.board_id)
         return ColumnOutputSchema(**created_column.__dict__)
 
     @staticmethod
@@ -94,11 +103,18 @@ class ColumnService:
     @staticmethod
     async def get_all_columns_by_board_id(
         board_id: int,
-        user_email: str,
     ) -> list[ColumnOutputSchema] | None:
-        # Validate user has access to this board
-        await PermissionService.validate_user_board_access(user_email, board_id)
+        """
+        Columns of a board by order, access is validated by the caller.
+        Concurrent requests for the same board revision share one query.
+        """
+        return await _column_reads.run(
+            (board_id, BoardRevision.get(board_id)),
+            lambda: ColumnService._load_columns_by_board_id(board_id),
+        )
 
+    @staticmethod
+    async def _load_columns_by_board_id(board_id: int) -> list[ColumnOutputSchema]:
         list_column = await ColumnRepository.get_all_column_by_board_id(board_id)
         columns_output_schema: list[ColumnOutputSchema] = [
             ColumnOutputSchema(**column.__dict__) for column in list_column
@@ -108,14 +124,10 @@ class ColumnService:
 
     @staticmethod
     async def move_column(
-        update_column: ColumnUpdateOrderSchema, user_email: str
+        update_column: ColumnUpdateOrderSchema, user: Membership
     ) -> ColumnOutputSchema:
         # Validate user has permission to modify this column
-        await PermissionService.validate_user_column_access(
-            user_email, update_column.id
-        )
-
-        column = await ColumnService.get_column_by_id(update_column.id)
+        column = await PermissionService.get_accessible_column(user, update_column.id)
         updated_column = await ColumnRepository.update_column_order(
             {
                 "order": column.order,
@@ -129,17 +141,16 @@ class ColumnService:
                 ColumnServiceExceptionInfo.ERROR_UPDATING_COLUMN
             )
 
+        await BoardSnapshotCache.invalidate(column.board_id)
         return ColumnOutputSchema(**updated_column.__dict__)
 
     @staticmethod
     async def update_column_name(
         column_schema: ColumnUpdateNameSchema,
-        user_email: str,
+        user: Membership,
     ) -> ColumnOutputSchema:
         # Validate user has permission to modify this column
-        await PermissionService.validate_user_column_access(
-            user_email, column_schema.id
-        )
+        column = await PermissionService.get_accessible_column(user, column_schema.id)
 
         # clean and validate the name
         clean_name = StringHelper.normalize_and_validate(column_schema.new_name)
@@ -148,9 +159,6 @@ class ColumnService:
                 ColumnServiceExceptionInfo.ERROR_INVALID_COLUMN_NAME
             )
 
-        # get current column by ID
-        column = await ColumnService.get_column_by_id(column_schema.id)
-
         # check if the new name already exists in the same board
         is_exist = await ColumnService.get_column_by_name_and_board_id(
             ColumnFilterNameAndBoardIdSchema(name=clean_name, board_id=column.board_id)
@@ -171,26 +179,19 @@ class ColumnService:
                 ColumnServiceExceptionInfo.ERROR_UPDATING_COLUMN
             )
 
+        await BoardSnapshotCache.invalidate(column.board_id)
         # return updated column
         return ColumnOutputSchema(**response.__dict__)
 
     @staticmethod
-    async def delete_column(column_id: int, user_email: str) -> ColumnOutputSchema:
-        # Validate user has permission to delete this column
-        await PermissionService.validate_user_column_access(user_email, column_id)
-
-        column = await ColumnService.get_column_by_id(column_id)
-
-        if not column:
-            raise ColumnServiceException(
-                ColumnServiceExceptionInfo.ERROR_COLUMN_NOT_FOUND
-            )
-
-        response = await ColumnRepository.delete_column(column_id)
+    async def delete_column(column: Column) -> ColumnOutputSchema:
+        """Delete a column and its tasks, access is validated by the caller"""
+        response = await ColumnRepository.delete_column(column.id)
 
         if not response:
             raise ColumnServiceException(
                 ColumnServiceExceptionInfo.ERROR_DELETING_COLUMN
             )
 
+        await BoardSnapshotCache.invalidate(column.board_id)
         return ColumnOutputSchema(**response.__dict__)
@@ -0,0 +1,183 @@
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from app.app_config import app_settings, get_workers
+from app.repositories.board_repository import BoardRepository
+from app.repositories.user_repository import UserRepository
+from app.repositories.workspace_repository import WorkspaceRepository
+from app.services.user_service.user_service_exception import (
+    UserServiceException,
+    UserServiceExceptionInfo,
+)
+
+
+@dataclass(frozen=True)
+class Membership:
+    user_id: int
+    email: str
+    workspace_ids: frozenset[int]
+    owned_workspace_ids: frozenset[int]
+    # Boards the user can open: owner or member, inside one of its workspaces
+    board_ids: frozenset[int]
+    owned_board_ids: frozenset[int]
+    # Workspace of each of those boards
+    board_workspace_ids: dict[int, int]
+    loaded_at: float
+
+
+# Start of the current request when its permission checks must not trust
+# the entries loaded before it
+_request_started_at: ContextVar[float | None] = ContextVar(
+    "membership_request_started_at", default=None
+)
+
+
+class MembershipCache:
+    """
+    Per worker index of the workspaces and boards each user can access,
+    loaded lazily on the first permission check of a user.
+
+    Only positive answers are trusted: a miss is re-checked against the
+    database by the caller, which invalidates the entry when it was stale.
+    Services changing memberships invalidate the users involved, the
+    invalidation publisher forwards them to the other workers (Redis pub/sub,
+    MembershipInvalidationChannel), and entries expire after
+    membership_cache_ttl as a safety net. Without a publisher, the other
+    workers' invalidations are never received: with several workers, each
+    request reloads the memberships of its user instead of trusting the
+    index, which then only serves the later checks of the same request
+    (begin_request).
+    """
+
+    _entries: OrderedDict[str, Membership] = OrderedDict()
+    _emails: dict[int, str] = {}
+    # Bumped on every invalidation, a load started before an invalidation
+    # is not stored
+    _generation: int = 0
+    _publisher: Callable[[list[int]], None] | None = None
+
+    @classmethod
+    async def get(cls, user_email: str) -> Membership:
+        """
+        Get the memberships of a user, loading them on a miss
+        :param user_email: email of the user
+        :return: workspaces and boards the user can access
+        :rtype: Membership
+        :raises UserServiceException: if the user does not exist
+        """
+        membership = cls._entries.get(user_email)
+        request_started_at = _request_started_at.get()
+        if (
+            membership
+            and time.monotonic() - membership.loaded_at
+            < app_settings.membership_cache_ttl
+            and (
+                request_started_at is None or membership.loaded_at >= request_started_at
+            )
+        ):
+            cls._entries.move_to_end(user_email)
+            return membership
+        return await cls._load(user_email)
+
+    @classmethod
+    def begin_request(cls) -> None:
+        """
+        Called at the start of each request: the entries loaded before it
+        are not trusted by its permission checks when the invalidations of
+        the other workers are not received
+        """
+        if cls._publisher is None and get_workers() > 1:
+            _request_started_at.set(time.monotonic())
+
+    @classmethod
+    def peek(cls, user_email: str) -> Membership | None:
+        """
+        Get the cached memberships of a user, without loading them
+        :param user_email: email of the user
+        :return: workspaces and boards the user can access, None on a miss
+        """
+        membership = cls._entries.get(user_email)
+        if membership and time.monotonic() - membership.loaded_at < (
+            app_settings.membership_cache_ttl
+        ):
+            return membership
+        return None
+
+    @classmethod
+    def invalidate(cls, user_ids: Iterable[int], publish: bool = True) -> None:
+        """
+        Drop the cached memberships of the users, they are reloaded on
+        their next permission check
+        :param user_ids: identifiers of the users whose memberships changed
+        :param publish: forward the invalidation to the other workers, False
+            when applying an invalidation received from another worker
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        cls._generation += 1
+        for user_id in user_ids:
+            email = cls._emails.pop(user_id, None)
+            if email is not None:
+                cls._entries.pop(email, None)
+        if publish and cls._publisher:
+            cls._publisher(user_ids)
+
+    @classmethod
+    def set_invalidation_publisher(
+        cls, publisher: Callable[[list[int]], None] | None
+    ) -> None:
+        """
+        Register the callable forwarding local invalidations to the other
+        workers, which apply them with invalidate(user_ids, publish=False)
+        """
+        cls._publisher = publisher
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._generation += 1
+        cls._entries.clear()
+        cls._emails.clear()
+
+    @classmethod
+    async def _load(cls, user_email: str) -> Membership:
+        generation = cls._generation
+        user = await UserRepository.get_user_by_email(user_email)
+        if not user:
+            raise UserServiceException(UserServiceExceptionInfo.USER_NOT_FOUND)
+
+        workspaces = await WorkspaceRepository.get_user_workspaces(user.id)
+        workspace_ids = frozenset(workspace_id for workspace_id, _ in workspaces)
+        boards = await BoardRepository.get_user_accessible_boards(
+            user.id, workspace_ids
+        )
+        membership = Membership(
+            user_id=user.id,
+            email=user_email,
+            workspace_ids=workspace_ids,
+            owned_workspace_ids=frozenset(
+                workspace_id
+                for workspace_id, owner_id in workspaces
+                if owner_id == user.id
+            ),
+            board_ids=frozenset(board_id for board_id, _, _ in boards),
+            owned_board_ids=frozenset(
+                board_id for board_id, owner_id, _ in boards if owner_id == user.id
+            ),
+            board_workspace_ids={
+                board_id: workspace_id for board_id, _, workspace_id in boards
+            },
+            loaded_at=time.monotonic(),
+        )
+
+        if generation == cls._generation:
+            cls._entries[user_email] = membership
+            cls._entries.move_to_end(user_email)
+            cls._emails[user.id] = user_email
+            while len(cls._entries) > app_settings.membership_cache_max_users:
+                _, evicted = cls._entries.popitem(last=False)
+                cls._emails.pop(evicted.user_id, None)
+        return membership
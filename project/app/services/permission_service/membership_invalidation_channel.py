@@ -0,0 +1,76 @@
+import asyncio
+import json
+import logging
+import uuid
+
+from app.services.permission_service.membership_cache import MembershipCache
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "kanban:membership-invalidations"
+# Pause before subscribing again after losing the connection (seconds)
+RECONNECT_DELAY = 1.0
+
+
+class MembershipInvalidationChannel:
+    """
+    Redis pub/sub channel sharing the invalidations of the membership index
+    between the workers and instances of the API. Each worker publishes its
+    own invalidations and applies those of the others.
+    """
+
+    def __init__(self, url: str):
+        # Optional dependency, only needed when the channel is configured
+        from redis.asyncio import Redis
+
+        self._client = Redis.from_url(url)
+        # Identifies the messages of this worker, already applied locally
+        self._sender = uuid.uuid4().hex
+        self._publishing: set[asyncio.Task] = set()
+
+    def publish(self, user_ids: list[int]) -> None:
+        """
+        Invalidation publisher of MembershipCache, sends the message in the
+        background
+        """
+        message = json.dumps({"sender": self._sender, "user_ids": user_ids})
+        task = asyncio.get_running_loop().create_task(self._publish(message))
+        self._publishing.add(task)
+        task.add_done_callback(self._publishing.discard)
+
+    def apply(self, message: bytes | str) -> None:
+        """Apply an invalidation received from another worker"""
+        payload = json.loads(message)
+        if payload["sender"] != self._sender:
+            MembershipCache.invalidate(payload["user_ids"], publish=False)
+
+    async def run(self) -> None:
+        """
+        Subscribe to the channel and apply the invalidations of the other
+        workers, meant to run as a background task. While disconnected, the
+        index is treated as not shared.
+        """
+        while True:
+            try:
+                async with self._client.pubsub() as pubsub:
+                    await pubsub.subscribe(CHANNEL)
+                    # Invalidations published while disconnected were missed
+                    MembershipCache.clear()
+                    MembershipCache.set_invalidation_publisher(self.publish)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.apply(message["data"])
+            except Exception:
+                logger.warning("membership invalidation channel lost", exc_info=True)
+            finally:
+                MembershipCache.set_invalidation_publisher(None)
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    async def _publish(self, message: str) -> None:
+        try:
+            await self._client.publish(CHANNEL, message)
+        except Exception:
+            logger.warning("membership invalidation not published", exc_info=True)
@@ -3,17 +3,22 @@ Centralized Permission Validation Service
 
 This service handles all permission validations across the application
 to ensure users can only access and modify resources they have permission for.
+Resolving a resource also binds the request to the shard holding it.
 """
 
+from app.modules.database_module.models.default import Column, Task
 from app.repositories.board_repository import BoardRepository
 from app.repositories.column_repository import ColumnRepository
 from app.repositories.task_repository import TaskRepository
 from app.repositories.workspace_repository import WorkspaceRepository
+from app.services.permission_service.membership_cache import (
+    Membership,
+    MembershipCache,
+)
 from app.services.permission_service.permission_service_exception import (
     PermissionServiceException,
     PermissionServiceExceptionInfo,
 )
-from app.services.user_service.user_service import UserService
 
 
 class PermissionService:
@@ -35,16 +40,21 @@ class PermissionService:
         Raises:
             PermissionServiceException: If user doesn't have access to workspace
         """
-        user = await UserService.get_user_by_email_model(user_email)
+        WorkspaceRepository.use_workspace_shard(workspace_id)
+        membership = await MembershipCache.get(user_email)
+        if workspace_id in membership.workspace_ids:
+            return
 
+        # Not in the index: check the database, the entry may be stale
         has_access = await WorkspaceRepository.check_user_contain_workspace(
-            {"workspace_id": workspace_id, "user_id": user.id}
+            {"workspace_id": workspace_id, "user_id": membership.user_id}
         )
 
         if not has_access:
             raise PermissionServiceException(
                 PermissionServiceExceptionInfo.ERROR_USER_NOT_IN_WORKSPACE
             )
+        MembershipCache.invalidate([membership.user_id], publish=False)
 
     @staticmethod
     async def validate_user_board_access(user_email: str, board_id: int) -> None:
@@ -60,8 +70,12 @@ class PermissionService:
         Raises:
             PermissionServiceException: If user doesn't have access to board
         """
-        user = await UserService.get_user_by_email_model(user_email)
+        membership = await MembershipCache.get(user_email)
+        await PermissionService._use_board_shard(membership, board_id)
+        if board_id in membership.board_ids:
+            return
 
+        # Not in the index: check the database, the entry may be stale
         # Get board to find its workspace
         board = await BoardRepository.get_board_by_identifier(board_id)
         if not board:
@@ -75,13 +89,156 @@ class PermissionService:
         )
 
         # Then validate user is either board owner or board member
-        is_board_owner = board.owner_id == user.id
-        is_board_member = await BoardRepository.is_board_member(board_id, user.id)
+        is_board_owner = board.owner_id == membership.user_id
+        is_board_member = await BoardRepository.is_board_member(
+            board_id, membership.user_id
+        )
 
         if not (is_board_owner or is_board_member):
             raise PermissionServiceException(
                 PermissionServiceExceptionInfo.ERROR_USER_NOT_IN_WORKSPACE
             )
+        MembershipCache.invalidate([membership.user_id], publish=False)
+
+    @staticmethod
+    async def get_accessible_workspace(user: Membership, workspace_id: int) -> int:
+        """
+        Validates that a user has access to a workspace, answering from the
+        membership index when possible
+
+        Args:
+            user: Memberships of the authenticated user
+            workspace_id: ID of the workspace to validate access to
+
+        Returns:
+            The workspace ID
+
+        Raises:
+            PermissionServiceException: If user doesn't have access to workspace
+        """
+        WorkspaceRepository.use_workspace_shard(workspace_id)
+        if workspace_id not in user.workspace_ids:
+            await PermissionService.validate_user_workspace_access(
+                user.email, workspace_id
+            )
+        return workspace_id
+
+    @staticmethod
+    async def get_accessible_board(user: Membership, board_id: int) -> int:
+        """
+        Validates that a user has access to a board, answering from the
+        membership index when possible
+
+        Args:
+            user: Memberships of the authenticated user
+            board_id: ID of the board to validate access to
+
+        Returns:
+            The board ID
+
+        Raises:
+            PermissionServiceException: If user doesn't have access to board
+        """
+        if board_id in user.board_ids:
+            await PermissionService._use_board_shard(user, board_id)
+        else:
+            await PermissionService.validate_user_board_access(user.email, board_id)
+        return board_id
+
+    @staticmethod
+    async def _use_board_shard(user: Membership, board_id: int) -> None:
+        """
+        Run the remaining queries on the shard of a board: the shard of its
+        workspace for the boards of the index, looked up on the shards
+        otherwise
+        """
+        workspace_id = user.board_workspace_ids.get(board_id)
+        if workspace_id is None:
+            await BoardRepository.use_board_shard(board_id)
+        else:
+            WorkspaceRepository.use_workspace_shard(workspace_id)
+
+    @staticmethod
+    async def validate_user_boards_access(
+        user: Membership, board_ids: set[int]
+    ) -> None:
+        """
+        Validates that a user has access to every board of a set, the
+        boards missing from the membership index are checked in one query
+
+        Args:
+            user: Memberships of the authenticated user
+            board_ids: IDs of the boards to validate access to
+
+        Raises:
+            PermissionServiceException: If user doesn't have access to a board
+        """
+        missing = board_ids - user.board_ids
+        if not missing:
+            return
+
+        # Not in the index: check the database, the entry may be stale
+        accessible = await BoardRepository.get_accessible_board_ids(
+            user.user_id, missing
+        )
+        if missing - accessible:
+            raise PermissionServiceException(
+                PermissionServiceExceptionInfo.ERROR_USER_NOT_IN_WORKSPACE
+            )
+        MembershipCache.invalidate([user.user_id], publish=False)
+
+    @staticmethod
+    async def get_accessible_column(user: Membership, column_id: int) -> Column:
+        """
+        Loads a column and validates that the user has access to its board
+
+        Args:
+            user: Memberships of the authenticated user
+            column_id: ID of the column to validate access to
+
+        Returns:
+            The column, to be reused by the operation
+
+        Raises:
+            PermissionServiceException: If the column doesn't exist or user
+            doesn't have access to it
+        """
+        await ColumnRepository.use_column_shard(column_id)
+        column = await ColumnRepository.get_column_by_id(column_id)
+        if not column:
+            raise PermissionServiceException(
+                PermissionServiceExceptionInfo.ERROR_COLUMN_NOT_FOUND
+            )
+
+        await PermissionService.get_accessible_board(user, column.board_id)
+        return column
+
+    @staticmethod
+    async def get_accessible_task(user: Membership, task_id: int) -> Task:
+        """
+        Loads a task with its column and validates that the user has access
+        to its board
+
+        Args:
+            user: Memberships of the authenticated user
+            task_id: ID of the task to validate access to
+
+        Returns:
+            The task with its column loaded, to be reused by the operation
+
+        Raises:
+            PermissionServiceException: If the task doesn't exist or user
+            doesn't have access to it
+        """
+        await TaskRepository.use_task_shard(task_id)
+        task = await TaskRepository.get_task_with_column(task_id)
+        if not task:
+            raise PermissionServiceException(
+                PermissionServiceExceptionInfo.ERROR_TASK_NOT_FOUND
+            )
+
+        await PermissionService.get_accessible_board(user, task.column.board_id)
+        return task
 
     @staticmethod
     async def validate_user_column_access(user_email: str, column_id: int) -> None:
@@ -97,6 +254,7 @@ class PermissionService:
             PermissionServiceException: If user doesn't have access to column
         """
         # Get column to find its board
+        await ColumnRepository.use_column_shard(column_id)
         column = await ColumnRepository.get_column_by_id(column_id)
         if not column:
             raise PermissionServiceException(
@@ -120,6 +278,7 @@ class PermissionService:
             PermissionServiceException: If user doesn't have access to task
         """
         # Get task to find its column
+        await TaskRepository.use_task_shard(task_id)
         task = await TaskRepository.get_task_by_id(task_id)
         if not task:
             raise PermissionServiceException(
@@ -212,7 +371,11 @@ class PermissionService:
         Raises:
             PermissionServiceException: If user is not the workspace owner
         """
-        user = await UserService.get_user_by_email_model(user_email)
+        WorkspaceRepository.use_workspace_shard(workspace_id)
+        membership = await MembershipCache.get(user_email)
+        if workspace_id in membership.owned_workspace_ids:
+            return
+
         workspace = await WorkspaceRepository.get_workspace_by_id(workspace_id)
 
         if not workspace:
@@ -220,10 +383,11 @@ class PermissionService:
                 PermissionServiceExceptionInfo.ERROR_WORKSPACE_NOT_FOUND
             )
 
-        if workspace.owner_id != user.id:
+        if workspace.owner_id != membership.user_id:
             raise PermissionServiceException(
                 PermissionServiceExceptionInfo.ERROR_USER_NOT_WORKSPACE_OWNER
             )
+        MembershipCache.invalidate([membership.user_id], publish=False)
 
     @staticmethod
     async def validate_board_ownership(user_email: str, board_id: int) -> None:
@@ -237,15 +401,22 @@ class PermissionService:
         Raises:
             PermissionServiceException: If user is not the board owner
         """
-        user = await UserService.get_user_by_email_model(user_email)
+        membership = await MembershipCache.get(user_email)
+        await PermissionService._use_board_shard(membership, board_id)
+        if board_id in membership.owned_board_ids:
+            return
+
         board = await BoardRepository.get_board_by_identifier(board_id)
 
         if not board:
             raise PermissionServiceException(
                 PermissionServiceExceptionInfo.ERROR_BOARD_NOT_FOUND
             )
+        # Rejects the boards of a workspace being moved
+        WorkspaceRepository.use_workspace_shard(board.workspace_id)
 
-        if board.owner_id != user.id:
+        if board.owner_id != membership.user_id:
             raise PermissionServiceException(
                 PermissionServiceExceptionInfo.ERROR_USER_NOT_BOARD_OWNER
             )
+        MembershipCache.invalidate([membership.user_id], publish=False)
@@ -1,5 +1,11 @@
-from black.trans import defaultdict
+from collections import defaultdict
+from datetime import timedelta
 
+from pydantic import TypeAdapter
+
+from app.modules.database_module.database_router import DatabaseRouter
+from app.modules.database_module.models.default import Column, Task
+from app.repositories.archived_task_repository import ArchivedTaskRepository
 from app.repositories.column_repository import ColumnRepository
 from app.repositories.task_repository import TaskRepository
 from app.schemas.column_schema import (
@@ -7,6 +13,12 @@ from app.schemas.column_schema import (
     ColumnWithTasksSchema,
 )
 from app.schemas.task_schema import (
+    COMPACT_TASK_FIELDS,
+    MAX_TASK_IDS,
+    ArchivedTaskOutputSchema,
+    ArchivedTaskPaginateSchema,
+    BoardView,
+    TaskArchiveOutputSchema,
     TaskCreateSchema,
     TaskFilterByTitleAndBoard,
     TaskInputSchema,
@@ -14,23 +26,28 @@ from app.schemas.task_schema import (
     TaskUpdateOrderSchema,
     TaskUpdateSchema,
 )
-from app.services.column_service.column_service import ColumnService
+from app.services.board_service.board_snapshot_cache import BoardSnapshotCache
+from app.services.permission_service.membership_cache import Membership
 from app.services.permission_service.permission_service import PermissionService
 from app.services.task_service.task_service_exception import (
     TaskServiceException,
     TaskServiceExceptionInfo,
 )
+from app.utils.single_flight import SingleFlight
 from app.utils.string_helper import StringHelper
+from app.utils.timer_helper import utc_now
+
+# Identical concurrent snapshot builds (same board, revision and fields)
+# share one query
+_snapshot_builds = SingleFlight("board_snapshot")
+_snapshot_adapter = TypeAdapter(list[ColumnWithTasksSchema])
 
 
 class TaskService:
     @staticmethod
-    async def create_task(task: TaskInputSchema, user_email: str) -> TaskOutputSchema:
+    async def create_task(task: TaskInputSchema, user: Membership) -> TaskOutputSchema:
         # Validate user has permission to create tasks in this column
-        await PermissionService.validate_user_column_access(user_email, task.column_id)
-
-        # get board_id from column
-        column = await ColumnService.get_column_by_id(task.column_id)
+        column = await PermissionService.get_accessible_column(user, task.column_id)
         board_id = column.board_id
 
         # check if task with same title exists in board
@@ -46,15 +63,20 @@ class TaskService:
             )
 
         # calculate next order automatically via repository
-        next_order = await TaskRepository.get_next_order_by_column_id(task.column_id)
+        next_order = await TaskRepository.get_next_order_by_column_id(
+            task.column_id, board_id
+        )
 
         # create schema for insertion
         task_create = TaskCreateSchema(**task.model_dump(), order=next_order)
 
-        response = await TaskRepository.create_task(task_create.model_dump())
+        response = await TaskRepository.create_task(
+            {**task_create.model_dump(), "board_id": board_id}
+        )
         if not response:
             raise TaskServiceException(TaskServiceExceptionInfo.ERROR_CREATING_TASK)
 
+        await BoardSnapshotCache.invalidate(board_id)
         return TaskOutputSchema(**response.__dict__)
 
     @staticmethod
@@ -68,12 +90,116 @@ class TaskService:
         )
 
     @staticmethod
-    async def get_columns_with_tasks(
-        board_id: int, user_email: str
-    ) -> list[ColumnWithTasksSchema]:
-        # Validate user has access to this board
-        await PermissionService.validate_user_board_access(user_email, board_id)
+    def get_task_fields(
+        view: BoardView, fields: str | None = None
+    ) -> frozenset[str] | None:
+        """
+        Task fields requested on a board read: an explicit comma separated
+        list (the id is always included) or the fields of the view
+        :return: fields to include, None for every field
+        :rtype: frozenset[str] | None
+        """
+        if fields:
+            requested = {field.strip() for field in fields.split(",") if field.strip()}
+            if not requested <= TaskOutputSchema.model_fields.keys():
+                raise TaskServiceException(
+                    TaskServiceExceptionInfo.ERROR_INVALID_TASK_FIELDS
+                )
+            return frozenset(requested | {"id"})
+        if view == BoardView.COMPACT:
+            return COMPACT_TASK_FIELDS
+        return None
+
+    @staticmethod
+    async def get_board_snapshot(
+        board_id: int, task_fields: frozenset[str] | None = None
+    ) -> bytes:
+        """
+        Columns of a board with their tasks serialized as JSON, served from
+        the snapshot cache. Access is validated by the caller.
+        :param task_fields: task fields to include, None for every field
+        """
+        variant = ",".join(sorted(task_fields)) if task_fields else None
+        revision = await BoardSnapshotCache.get_revision(board_id)
+        snapshot = await BoardSnapshotCache.get(board_id, revision, variant)
+        if snapshot is None:
+            snapshot = await _snapshot_builds.run(
+                (board_id, revision, variant),
+                lambda: TaskService._build_board_snapshot(
+                    board_id, revision, task_fields, variant
+                ),
+            )
+        return snapshot
+
+    @staticmethod
+    async def _build_board_snapshot(
+        board_id: int,
+        revision: int,
+        task_fields: frozenset[str] | None,
+        variant: str | None,
+    ) -> bytes:
+        # Stored under the current revision, must not come from a replica
+        # lagging behind it. Builds run in their own task (single flight),
+        # the reads of the request itself are left to the replicas.
+        DatabaseRouter.stick_to_primary()
+        columns = await TaskService._load_columns_with_tasks(board_id)
+        include = None
+        if task_fields:
+            column_fields = ColumnOutputSchema.model_fields.keys()
+            include = {
+                "__all__": {
+                    **{field: True for field in column_fields},
+                    "tasks": {"__all__": set(task_fields)},
+                }
+            }
+        snapshot = _snapshot_adapter.dump_json(columns, include=include, by_alias=True)
+        await BoardSnapshotCache.set(board_id, revision, snapshot, variant)
+        return snapshot
+
+    @staticmethod
+    def parse_task_ids(ids: str) -> list[int]:
+        """
+        Parse a comma separated list of task identifiers
+        :raises TaskServiceException: if an identifier is not a number
+        """
+        try:
+            return [int(task_id) for task_id in ids.split(",") if task_id.strip()]
+        except ValueError:
+            raise TaskServiceException(TaskServiceExceptionInfo.ERROR_INVALID_TASK_IDS)
 
+    @staticmethod
+    async def get_tasks_by_ids(
+        ids: list[int], user: Membership
+    ) -> list[TaskOutputSchema]:
+        """
+        Get tasks by identifier in one query, e.g. the descriptions left out
+        of compact board reads or a refresh of the tasks cached by a client.
+        Missing tasks are skipped.
+        :param ids: task identifiers, duplicates are returned once
+        :param user: Memberships of the authenticated user
+        :return: tasks in the requested order
+        :rtype: list[TaskOutputSchema]
+        :raises PermissionServiceException: if a task is on a board the
+            user cannot access
+        """
+        task_ids = list(dict.fromkeys(ids))
+        if not task_ids or len(task_ids) > MAX_TASK_IDS:
+            raise TaskServiceException(TaskServiceExceptionInfo.ERROR_INVALID_TASK_IDS)
+
+        tasks = await TaskRepository.get_tasks_with_column_by_ids(task_ids)
+        await PermissionService.validate_user_boards_access(
+            user, {task.column.board_id for task in tasks}
+        )
+
+        tasks_by_id = {task.id: task for task in tasks}
+        return [
+            TaskOutputSchema(**tasks_by_id[task_id].__dict__)
+            for task_id in task_ids
+            if task_id in tasks_by_id
+        ]
+
+    @staticmethod
+    async def _load_columns_with_tasks(board_id: int) -> list[ColumnWithTasksSchema]:
         # get all columns for board
         columns = await ColumnRepository.get_all_column_by_board_id(board_id)
         if not columns:
@@ -108,54 +234,50 @@ class TaskService:
 
     @staticmethod
     async def move_task(
-        update_task: TaskUpdateOrderSchema, user_email: str
+        update_task: TaskUpdateOrderSchema, user: Membership
     ) -> TaskOutputSchema:
-        # Validate user has permission to modify this task
-        await PermissionService.validate_user_task_access(user_email, update_task.id)
-
-        # Validate exist column with id
-        await ColumnService.get_column_by_id(update_task.column_id)
+        # Validate user has permission to modify this task and the target column
+        task = await PermissionService.get_accessible_task(user, update_task.id)
+        column = await PermissionService.get_accessible_column(
+            user, update_task.column_id
+        )
 
-        task = await TaskService.get_task_by_id(update_task.id)
         updated_task = await TaskRepository.update_order_task(
             {
                 "order": task.order,
                 "task_id": task.id,
                 "new_order": update_task.new_order,
                 "column_id": update_task.column_id,
+                "board_id": column.board_id,
             }
         )
         if not updated_task:
             raise TaskServiceException(TaskServiceExceptionInfo.ERROR_UPDATING_TASK)
 
+        await BoardSnapshotCache.invalidate(task.column.board_id, column.board_id)
         return TaskOutputSchema(**updated_task.__dict__)
 
     @staticmethod
-    async def delete_task(task_id: int, user_email: str) -> TaskOutputSchema:
-        # Validate user has permission to delete this task
-        await PermissionService.validate_user_task_access(user_email, task_id)
-
-        await TaskService.get_task_by_id(task_id)
-        response = await TaskRepository.delete_task(task_id)
+    async def delete_task(task: Task) -> TaskOutputSchema:
+        """Delete a task, access is validated by the caller"""
+        response = await TaskRepository.delete_task(task.id)
 
         if not response:
             raise TaskServiceException(TaskServiceExceptionInfo.ERROR_DELETING_TASK)
 
+        await BoardSnapshotCache.invalidate(task.column.board_id)
         return TaskOutputSchema(**response.__dict__)
 
     @staticmethod
     async def update_task(
-        task_schema: TaskUpdateSchema, user_email: str
+        task_schema: TaskUpdateSchema, user: Membership
     ) -> TaskOutputSchema:
         # Validate user has permission to update this task
-        await PermissionService.validate_user_task_access(user_email, task_schema.id)
-
-        task = await TaskService.get_task_by_id(task_schema.id)
+        task = await PermissionService.get_accessible_task(user, task_schema.id)
 
         title = StringHelper.normalize_and_validate(task_schema.title)
         if title:
-            column = await ColumnService.get_column_by_id(task.column_id)
-            board_id = column.board_id
+            board_id = task.column.board_id
             task_aux = await TaskService.get_task_by_title_and_board_id(
                 TaskFilterByTitleAndBoard(title=title, board_id=board_id)
             )
@@ -183,4 +305,97 @@ class TaskService:
         if not response:
             raise TaskServiceException(TaskServiceExceptionInfo.ERROR_UPDATING_TASK)
 
+        await BoardSnapshotCache.invalidate(task.column.board_id)
+        return TaskOutputSchema(**response.__dict__)
+
+    @staticmethod
+    async def archive_task(task: Task) -> TaskArchiveOutputSchema:
+        """Archive a task, access is validated by the caller"""
+        board_id = task.column.board_id
+        archived = await ArchivedTaskRepository.archive_tasks(board_id, {"id": task.id})
+        if not archived:
+            raise TaskServiceException(TaskServiceExceptionInfo.ERROR_TASK_NOT_FOUND)
+
+        await BoardSnapshotCache.invalidate(board_id)
+        return TaskArchiveOutputSchema(archived=archived)
+
+    @staticmethod
+    async def archive_column_tasks(column: Column) -> TaskArchiveOutputSchema:
+        """Archive every task of a column, access is validated by the caller"""
+        archived = await ArchivedTaskRepository.archive_tasks(
+            column.board_id, {"column_id": column.id}
+        )
+        if archived:
+            await BoardSnapshotCache.invalidate(column.board_id)
+        return TaskArchiveOutputSchema(archived=archived)
+
+    @staticmethod
+    async def archive_stale_tasks(
+        board_id: int, older_than_days: int
+    ) -> TaskArchiveOutputSchema:
+        """
+        Archive the tasks of a board not updated for older_than_days, access
+        is validated by the caller
+        """
+        archived = await ArchivedTaskRepository.archive_tasks(
+            board_id, {"updated_at__lt": utc_now() - timedelta(days=older_than_days)}
+        )
+        if archived:
+            await BoardSnapshotCache.invalidate(board_id)
+        return TaskArchiveOutputSchema(archived=archived)
+
+    @staticmethod
+    async def get_archived_tasks(
+        board_id: int, page: int, limit: int
+    ) -> ArchivedTaskPaginateSchema:
+        """Archived tasks of a board, access is validated by the caller"""
+        archived_tasks, total = (
+            await ArchivedTaskRepository.get_archived_tasks_paginated(
+                board_id, page, limit
+            )
+        )
+        return ArchivedTaskPaginateSchema(
+            data=[
+                ArchivedTaskOutputSchema(**archived_task.__dict__)
+                for archived_task in archived_tasks
+            ],
+            total=total,
+        )
+
+    @staticmethod
+    async def restore_task(archived_task_id: int, user: Membership) -> TaskOutputSchema:
+        """
+        Move an archived task back to the end of its column
+        :raises TaskServiceException: if a task of the board has the same title
+        """
+        await ArchivedTaskRepository.use_archived_task_shard(archived_task_id)
+        archived_task = await ArchivedTaskRepository.get_archived_task_by_id(
+            archived_task_id
+        )
+        if not archived_task:
+            raise TaskServiceException(
+                TaskServiceExceptionInfo.ERROR_ARCHIVED_TASK_NOT_FOUND
+            )
+        board_id = await PermissionService.get_accessible_board(
+            user, archived_task.board_id
+        )
+
+        is_exist = await TaskService.get_task_by_title_and_board_id(
+            TaskFilterByTitleAndBoard(title=archived_task.title, board_id=board_id)
+        )
+        if is_exist:
+            raise TaskServiceException(
+                TaskServiceExceptionInfo.ERROR_EXISTING_TASK_IN_BOARD
+            )
+
+        next_order = await TaskRepository.get_next_order_by_column_id(
+            archived_task.column_id, board_id
+        )
+        response = await ArchivedTaskRepository.restore_task(archived_task, next_order)
+        if not response:
+            raise TaskServiceException(
+                TaskServiceExceptionInfo.ERROR_ARCHIVED_TASK_NOT_FOUND
+            )
+
+        await BoardSnapshotCache.invalidate(board_id)
         return TaskOutputSchema(**response.__dict__)
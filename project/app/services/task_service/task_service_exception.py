@@ -11,6 +11,9 @@ class TaskServiceExceptionInfo(BaseExceptionInfo):
     ERROR_TASK_NOT_FOUND = (5003, "Error creating task", 404)
     ERROR_UPDATING_TASK = (5004, "Error updating task", 500)
     ERROR_DELETING_TASK = (5004, "Error deleting task", 500)
+    ERROR_INVALID_TASK_FIELDS = (5005, "Error unknown task fields requested", 400)
+    ERROR_INVALID_TASK_IDS = (5006, "Error invalid list of task ids", 400)
+    ERROR_ARCHIVED_TASK_NOT_FOUND = (5007, "Error archived task not found", 404)
 
 
 class TaskServiceException(BaseException):
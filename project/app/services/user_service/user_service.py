@@ -3,6 +3,8 @@ from app.modules.database_module.models.default import User
 from app.repositories.auth_repository import AuthRepository
 from app.repositories.user_repository import UserRepository
 from app.schemas.user_schema import UserOutputSchema, UserUpdateSchema
+from app.services.auth_service.session_cache import SessionCache
+from app.services.permission_service.membership_cache import MembershipCache
 from app.services.user_service.user_service_exception import (
     UserServiceException,
     UserServiceExceptionInfo,
@@ -18,6 +20,7 @@ class UserService:
             raise UserServiceException(UserServiceExceptionInfo.USER_NOT_FOUND)
         # Return user data as a schema instance
         return UserOutputSchema(**user.__dict__)
+
     @staticmethod
     async def get_user_by_email_model(email: str) -> User:
         # Fetch user by email from the local database
@@ -26,6 +29,19 @@ class UserService:
             raise UserServiceException(UserServiceExceptionInfo.USER_NOT_FOUND)
         # Return user data as a schema instance
         return user
+
+    @staticmethod
+    async def get_user_ids_by_emails(
+        emails: list[str],
+    ) -> tuple[list[str], dict[str, int]]:
+        """
+        Resolve a list of emails to user identifiers in one query
+        :return: the emails stripped and deduplicated in request order, and
+            the identifiers of the emails matching a user
+        """
+        unique_emails = list(dict.fromkeys(email.strip() for email in emails))
+        return unique_emails, await UserRepository.get_user_ids_by_emails(unique_emails)
+
     @staticmethod
     async def get_user_by_id(user_id: int) -> UserOutputSchema:
         # Fetch user by ID from the local database
@@ -58,9 +74,8 @@ class UserService:
             raise UserServiceException(UserServiceExceptionInfo.USER_NOT_FOUND)
 
         # Delete all user sessions
-        sessions = await user.sessions.all()
-        for session in sessions:
-            await AuthRepository.delete_session(user.id, session.refresh_token)
+        await AuthRepository.delete_user_sessions(user.id)
+        SessionCache.invalidate_user(user.id)
 
         # Delete the user in Supabase using their UUID (sub)
         supabase = await get_supabase_admin()
@@ -73,6 +88,7 @@ class UserService:
 
         # Delete the user from the local database
         deleted_user = await UserRepository.delete_user(user.id)
+        MembershipCache.invalidate([user.id])
         if not deleted_user:
             raise UserServiceException(UserServiceExceptionInfo.USER_NOT_FOUND)
 
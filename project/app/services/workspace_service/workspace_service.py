@@ -1,5 +1,11 @@
+from datetime import datetime
+
 from app.repositories.workspace_repository import WorkspaceRepository
+from app.schemas.membership_schema import MembershipResultSchema, MembershipStatus
 from app.schemas.workspace_schema import (
+    WorkspaceBulkInvitationSchema,
+    WorkspaceBulkMembershipOutputSchema,
+    WorkspaceBulkRemoveMemberSchema,
     WorkspaceCreateSchema,
     WorkspaceFilterByUserIdOutputSchema,
     WorkspaceFilterByUserInputSchema,
@@ -8,7 +14,9 @@ from app.schemas.workspace_schema import (
     WorkspaceMemberOutputSchema,
     WorkspaceOutputSchema,
     WorkspaceRemoveMemberSchema,
+    WorkspaceRole,
 )
+from app.services.permission_service.membership_cache import MembershipCache
 from app.services.permission_service.permission_service import PermissionService
 from app.services.user_service.user_service import UserService
 from app.services.workspace_service.workspace_service_exception import (
@@ -45,7 +53,8 @@ class WorkspaceService:
                 WorkspaceServiceExceptionInfo.ERROR_CREATING_WORKSPACE
             )
 
-        await response.user.add(user_model)
+        await WorkspaceRepository.add_workspace_members(response.id, {user_model.id})
+        MembershipCache.invalidate([user_model.id])
 
         return WorkspaceOutputSchema(**response.__dict__)
 
@@ -61,6 +70,8 @@ class WorkspaceService:
     async def check_user_contain_workspace(
         payload: WorkspaceFilterByUserInputSchema,
     ) -> bool:
+        # The queries following the check run on the shard of the workspace
+        WorkspaceRepository.use_workspace_shard(payload.workspace_id)
         return (
             True
             if await WorkspaceRepository.check_user_contain_workspace(
@@ -73,15 +84,40 @@ class WorkspaceService:
     async def get_all_workspaces(
         user_email: str,
     ) -> list[WorkspaceFilterByUserIdOutputSchema]:
-        response = await WorkspaceRepository.get_all_workspace(user_email)
-        if not response:
-            return []
+        user_model = await UserService.get_user_by_email_model(user_email)
+        response = await WorkspaceRepository.get_all_workspace(user_model.id)
 
         return [
-            WorkspaceFilterByUserIdOutputSchema(**workspace.__dict__)
+            WorkspaceFilterByUserIdOutputSchema(
+                id=workspace["id"],
+                name=workspace["name"],
+                owner_id=workspace["owner_id"],
+                role=(
+                    WorkspaceRole.OWNER
+                    if workspace["owner_id"] == user_model.id
+                    else WorkspaceRole.MEMBER
+                ),
+                board_count=workspace["board_count"],
+                member_count=workspace["member_count"],
+                last_activity=WorkspaceService._get_last_activity(workspace),
+            )
             for workspace in response
         ]
 
+    @staticmethod
+    def _get_last_activity(workspace: dict) -> datetime:
+        # Raw rows hold datetimes on postgres and ISO strings on sqlite
+        timestamps = [
+            datetime.fromisoformat(value) if isinstance(value, str) else value
+            for value in (
+                workspace["updated_at"],
+                workspace["boards_updated_at"],
+                workspace["tasks_updated_at"],
+            )
+            if value is not None
+        ]
+        return max(timestamps)
+
     @staticmethod
     async def invite_user_to_workspace(
         invitation: WorkspaceInvitationSchema, inviter_email: str
@@ -122,10 +158,49 @@ class WorkspaceService:
             )
 
         # Add user to workspace
-        await workspace.user.add(invited_user)
+        await WorkspaceRepository.add_workspace_members(workspace.id, {invited_user.id})
+        MembershipCache.invalidate([invited_user.id])
 
         return invitation
 
+    @staticmethod
+    async def invite_users_to_workspace(
+        invitation: WorkspaceBulkInvitationSchema, inviter_email: str
+    ) -> WorkspaceBulkMembershipOutputSchema:
+        """
+        Invite several users to a workspace at once, reporting the
+        result per email
+        """
+        await PermissionService.validate_workspace_ownership(
+            inviter_email, invitation.workspace_id
+        )
+
+        emails, user_ids = await UserService.get_user_ids_by_emails(
+            invitation.invited_user_emails
+        )
+        existing_ids = await WorkspaceRepository.get_workspace_member_ids(
+            invitation.workspace_id, set(user_ids.values())
+        )
+        added_ids = set(user_ids.values()) - existing_ids
+        await WorkspaceRepository.add_workspace_members(
+            invitation.workspace_id, added_ids
+        )
+        MembershipCache.invalidate(added_ids)
+
+        results = []
+        for email in emails:
+            if email not in user_ids:
+                status = MembershipStatus.USER_NOT_FOUND
+            elif user_ids[email] in existing_ids:
+                status = MembershipStatus.ALREADY_MEMBER
+            else:
+                status = MembershipStatus.ADDED
+            results.append(MembershipResultSchema(email=email, status=status))
+
+        return WorkspaceBulkMembershipOutputSchema(
+            workspace_id=invitation.workspace_id, results=results
+        )
+
     @staticmethod
     async def remove_user_from_workspace(
         removal: WorkspaceRemoveMemberSchema, remover_email: str
@@ -164,40 +239,75 @@ class WorkspaceService:
             )
 
         # Remove user from workspace
-        await workspace.user.remove(user_to_remove)
+        await WorkspaceRepository.remove_workspace_members(
+            workspace.id, {user_to_remove.id}
+        )
+        MembershipCache.invalidate([user_to_remove.id])
 
         return removal
 
     @staticmethod
-    async def get_workspace_members(
-        workspace_id: int, requester_email: str
-    ) -> list[WorkspaceMemberOutputSchema]:
-        """Get all members of a workspace"""
-        # Validate requester has access to workspace
-        await PermissionService.validate_user_workspace_access(
-            requester_email, workspace_id
+    async def remove_users_from_workspace(
+        removal: WorkspaceBulkRemoveMemberSchema, remover_email: str
+    ) -> WorkspaceBulkMembershipOutputSchema:
+        """
+        Remove several users from a workspace at once, reporting the
+        result per email
+        """
+        await PermissionService.validate_workspace_ownership(
+            remover_email, removal.workspace_id
         )
 
-        # Get workspace members
-        members = await WorkspaceRepository.get_workspace_members(workspace_id)
-
-        # Get workspace owner info
-        workspace = await WorkspaceRepository.get_workspace_by_id(workspace_id)
+        workspace = await WorkspaceRepository.get_workspace_by_id(removal.workspace_id)
         if not workspace:
             raise WorkspaceServiceException(
                 WorkspaceServiceExceptionInfo.ERROR_WORKSPACE_NOT_FOUND
             )
 
-        return [
-            WorkspaceMemberOutputSchema(
-                id=member.id,
-                name=member.name,
-                surname=member.surname,
-                email=member.email,
-                is_owner=member.id == workspace.owner_id,
-            )
-            for member in members
-        ]
+        emails, user_ids = await UserService.get_user_ids_by_emails(
+            removal.user_emails_to_remove
+        )
+        member_ids = await WorkspaceRepository.get_workspace_member_ids(
+            removal.workspace_id, set(user_ids.values())
+        )
+        # The owner is never removed
+        member_ids.discard(workspace.owner_id)
+        await WorkspaceRepository.remove_workspace_members(
+            removal.workspace_id, member_ids
+        )
+        MembershipCache.invalidate(member_ids)
+
+        results = []
+        for email in emails:
+            if email not in user_ids:
+                status = MembershipStatus.USER_NOT_FOUND
+            elif user_ids[email] == workspace.owner_id:
+                status = MembershipStatus.OWNER
+            elif user_ids[email] in member_ids:
+                status = MembershipStatus.REMOVED
+            else:
+                status = MembershipStatus.NOT_MEMBER
+            results.append(MembershipResultSchema(email=email, status=status))
+
+        return WorkspaceBulkMembershipOutputSchema(
+            workspace_id=removal.workspace_id, results=results
+        )
+
+    @staticmethod
+    async def get_workspace_members(
+        workspace_id: int,
+        search: str | None = None,
+        page: int = 0,
+        limit: int | None = None,
+    ) -> list[WorkspaceMemberOutputSchema]:
+        """
+        Get the members of a workspace, optionally filtered and paginated.
+        Access is validated by the caller.
+        """
+        members = await WorkspaceRepository.get_workspace_members(
+            workspace_id, search, page, limit
+        )
+        return [WorkspaceMemberOutputSchema(**member) for member in members]
 
     @staticmethod
     async def delete_workspace(
@@ -216,8 +326,13 @@ class WorkspaceService:
                 WorkspaceServiceExceptionInfo.ERROR_WORKSPACE_NOT_FOUND
             )
 
+        member_ids = await WorkspaceRepository.get_all_workspace_member_ids(
+            workspace_id
+        )
+
         # Delete workspace (this will cascade delete all boards, columns, tasks)
         deleted_workspace = await WorkspaceRepository.delete_workspace(workspace_id)
+        MembershipCache.invalidate(member_ids)
 
         if not deleted_workspace:
             raise WorkspaceServiceException(
@@ -0,0 +1,9 @@
+import os
+
+# Local runs: in-memory SQLite, the Supabase stub and a single worker. Set
+# before the settings are read, the environment of the CI takes precedence.
+os.environ.setdefault("API_VERSION", "1")
+os.environ.setdefault("DATABASE_URL", "sqlite://:memory:")
+os.environ.setdefault("SUPABASE_JWT_TOKEN", "test-secret")
+os.environ.setdefault("SUPABASE_STUB", "true")
+os.environ.setdefault("WEB_CONCURRENCY", "1")
@@ -4,14 +4,21 @@ import pytest
 from fastapi import FastAPI
 from requests.models import Response
 from starlette.testclient import TestClient
-from tortoise.contrib.fastapi import register_tortoise
-
-from app.app_config import AppSettings, get_application_settings
+from tortoise import Tortoise
+
+from app.app_config import AppSettings, app_settings, get_application_settings
+from app.core.monitoring.request_profile import (
+    RequestProfile,
+    add_profile_listener,
+    remove_profile_listener,
+)
 from app.main import create_app
-from app.modules.database_module.settings import module_settings
+from app.tests.constants import QUERY_BUDGETS
 
 
 class TestAPP:
+    # Not a test class, test modules import it for their annotations
+    __test__ = False
 
     def __init__(self, test_app, test_app_url):
         """
@@ -43,6 +50,15 @@ class TestAPP:
             data=json.dumps(data) if data else None,
         )
 
+    def get_token_for_role(self, role: str) -> str:
+        """
+        Get the access token of the user registered for a role
+        :param role: role name, as registered in tokens
+        :return: access token
+        :rtype: str
+        """
+        return self.tokens[role]
+
     def do_request_with_role(
         self,
         role: str,
@@ -82,17 +98,46 @@ def test_app() -> TestAPP:
     test_app_config = AppSettings()
     test_app.dependency_overrides[get_application_settings] = test_app_config
 
-    # Init Tortoise for database
-    register_tortoise(
-        test_app,
-        db_url=module_settings.database_url,
-        modules={"default": ["app.modules.database_module.models.default"]},
-    )
-
+    # Tortoise is initialized by the lifespan of the app, the schema is
+    # created on a fresh database (in-memory SQLite of the local runs)
     with TestClient(test_app) as test_client:
+        test_client.portal.call(Tortoise.generate_schemas)
         yield TestAPP(test_client, f"/api/v{test_app_config.api_version}")
 
 
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Fail the test when a request made during it exceeds the query budget
+    declared for its endpoint in QUERY_BUDGETS, repeats identical queries
+    beyond it, or hits an endpoint without a declared budget
+    """
+    api_prefix = f"/api/v{app_settings.api_version}"
+    violations = []
+
+    def check_request(method: str, _status: int, profile: RequestProfile) -> None:
+        if profile.route is None:
+            return
+        route = profile.route.removeprefix(api_prefix)
+        budget = QUERY_BUDGETS.get((method, route))
+        if budget is None:
+            if profile.query_count:
+                violations.append(f"{method} {route} has no query budget declared")
+            return
+        violations.extend(budget.check(f"{method} {route}", profile))
+
+    add_profile_listener(check_request)
+    yield
+    remove_profile_listener(check_request)
+
+    assert not violations, "\n".join(violations)
+
+
 def pytest_collection_modifyitems(items):
     order = {
         "primer_tests.py": 0,
@@ -101,6 +146,8 @@ def pytest_collection_modifyitems(items):
     def sort_key(item):
         filename = item.nodeid.split("::")[0].replace("\\", "/")
         shortname = filename.split("integration/")[-1]
-        return order.get(shortname, 999)
+        # The tests initializing Tortoise on their own databases run before
+        # the session app is started
+        return "test_app" in item.fixturenames, order.get(shortname, 999)
 
     items.sort(key=sort_key)
@@ -1 +1,65 @@
 # Todo: Clase en la que se crean las constantes a utilizar en los tests
+
+from app.core.monitoring.query_budget import QueryBudget
+
+# Query budget per endpoint (method, path without the api version prefix).
+# Lower them as endpoints stop re-fetching rows, never raise them silently.
+QUERY_BUDGETS: dict[tuple[str, str], QueryBudget] = {
+    # Auth
+    ("POST", "/auth/register"): QueryBudget(2),
+    ("POST", "/auth/login"): QueryBudget(2),
+    ("POST", "/auth/refresh"): QueryBudget(2),
+    ("POST", "/auth/logout"): QueryBudget(4),
+    ("POST", "/auth/forgot-password"): QueryBudget(0),
+    ("POST", "/auth/reset-password"): QueryBudget(0),
+    # User
+    ("GET", "/users/me"): QueryBudget(1),
+    ("PUT", "/users/me"): QueryBudget(3),
+    ("DELETE", "/users/me"): QueryBudget(7),
+    # Workspace
+    ("GET", "/workspaces/all-me"): QueryBudget(2),
+    ("GET", "/workspaces/{workspace_id}/members"): QueryBudget(4, 1),
+    ("POST", "/workspaces/"): QueryBudget(5),
+    ("POST", "/workspaces/invite"): QueryBudget(8),
+    ("POST", "/workspaces/invite/bulk"): QueryBudget(6),
+    ("DELETE", "/workspaces/remove-member"): QueryBudget(7),
+    ("DELETE", "/workspaces/remove-member/bulk"): QueryBudget(7),
+    ("DELETE", "/workspaces/remove-workspace/{workspace_id}"): QueryBudget(7, 1),
+    # Board
+    ("GET", "/boards/all-board-paginated/{workspace_id}"): QueryBudget(5),
+    # A board missing from the membership index is re-checked (board, member)
+    ("GET", "/boards/{board_id}/members"): QueryBudget(5),
+    ("POST", "/boards/"): QueryBudget(8),
+    ("POST", "/boards/invite"): QueryBudget(8),
+    ("POST", "/boards/invite/bulk"): QueryBudget(6, 1),
+    ("PUT", "/boards/update-favorite/{board_id}"): QueryBudget(5),
+    ("DELETE", "/boards/remove-member"): QueryBudget(7),
+    ("DELETE", "/boards/remove-member/bulk"): QueryBudget(7),
+    # Column
+    ("GET", "/columns/{board_id}"): QueryBudget(4),
+    ("POST", "/columns/"): QueryBudget(6),
+    ("PUT", "/columns/change-name"): QueryBudget(7, 1),
+    ("PUT", "/columns/move"): QueryBudget(7, 1),
+    ("DELETE", "/columns/{column_id}"): QueryBudget(6, 1),
+    # Task
+    ("GET", "/tasks/board/{board_id}"): QueryBudget(6, 1),
+    ("GET", "/tasks"): QueryBudget(4),
+    ("POST", "/tasks/batch"): QueryBudget(4),
+    ("POST", "/tasks/"): QueryBudget(7),
+    ("PUT", "/tasks/update"): QueryBudget(7),
+    ("PUT", "/tasks/move"): QueryBudget(8),
+    ("DELETE", "/tasks/{task_id}"): QueryBudget(6),
+    # Archiving runs 3 queries per batch of ARCHIVE_BATCH_SIZE tasks
+    ("POST", "/tasks/{task_id}/archive"): QueryBudget(4),
+    ("POST", "/tasks/archive/column/{column_id}"): QueryBudget(4),
+    ("POST", "/tasks/archive/board/{board_id}"): QueryBudget(3),
+    ("GET", "/tasks/archive/board/{board_id}"): QueryBudget(2),
+    ("POST", "/tasks/archive/{archived_task_id}/restore"): QueryBudget(5),
+}
+
+# Startup of a worker (unit/test_import_time.py and python -m
+# benchmarks.import_time --check). The modules must not be imported by
+# app.main, the time is the median cumulative import time of app.main on
+# the reference CI runner.
+IMPORT_TIME_BUDGET_MS = 800
+FORBIDDEN_STARTUP_IMPORTS = ("black", "supabase", "supabase_auth", "passlib")
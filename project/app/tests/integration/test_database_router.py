@@ -0,0 +1,125 @@
+"""
+Read routing between a primary and a replica, two local SQLite databases.
+The replica is not replicated: its rows are renamed so that each read tells
+which database answered it.
+"""
+
+import asyncio
+import json
+
+import pytest
+from tortoise import Tortoise
+
+from app.core.cache.cache_backend import LocalCacheBackend
+from app.modules.database_module import DatabaseModule
+from app.modules.database_module.database_router import DatabaseRouter
+from app.modules.database_module.models.default import (
+    Board,
+    Column,
+    Task,
+    User,
+    Workspace,
+)
+from app.modules.database_module.settings import (
+    REPLICA_CONNECTION_PREFIX,
+    module_settings,
+)
+from app.services.board_service.board_snapshot_cache import BoardSnapshotCache
+from app.services.task_service.task_service import TaskService
+
+REPLICA = f"{REPLICA_CONNECTION_PREFIX}0"
+
+
+async def _seed(db_url: str, name: str) -> None:
+    await Tortoise.init(
+        db_url=db_url,
+        modules={"default": ["app.modules.database_module.models.default"]},
+    )
+    await Tortoise.generate_schemas()
+    user = await User.create(name=name, surname=name, email=f"{name}@test.io")
+    workspace = await Workspace.create(name=name, owner_id=user.id)
+    board = await Board.create(name=name, workspace_id=workspace.id, owner_id=user.id)
+    column = await Column.create(name=name, order=0, board_id=board.id)
+    await Task.create(
+        title=name, description=name, order=0, column_id=column.id, board_id=board.id
+    )
+    await Tortoise.close_connections()
+
+
+@pytest.fixture
+async def databases(tmp_path, monkeypatch):
+    primary_url = f"sqlite://{tmp_path / 'primary.db'}"
+    replica_url = f"sqlite://{tmp_path / 'replica.db'}"
+    await _seed(primary_url, "primary")
+    await _seed(replica_url, "replica")
+
+    monkeypatch.setattr(module_settings, "database_url", primary_url)
+    monkeypatch.setattr(module_settings, "database_replica_urls", replica_url)
+    monkeypatch.setattr(DatabaseRouter, "_replicas", [REPLICA])
+    monkeypatch.setattr(DatabaseRouter, "_replica_lag", {})
+    await Tortoise.init(config=module_settings.get_tortoise_config())
+    yield
+    await Tortoise.close_connections()
+
+
+async def _in_request(query):
+    # Each request runs in its own task, with its own routing context
+    return await asyncio.create_task(query())
+
+
+async def _read_workspace_name() -> str:
+    workspaces = await DatabaseModule.get_all_entity_filtered(Workspace, {"id": 1})
+    return workspaces[0].name
+
+
+@pytest.mark.anyio
+async def test_reads_go_to_the_replica(databases):
+    assert await _in_request(_read_workspace_name) == "replica"
+
+
+@pytest.mark.anyio
+async def test_reads_after_a_write_go_to_the_primary(databases):
+    async def write_then_read() -> tuple[str, str]:
+        before = await _read_workspace_name()
+        await DatabaseModule.put_entity(Workspace, {"name": "primary"}, 1)
+        return before, await _read_workspace_name()
+
+    assert await _in_request(write_then_read) == ("replica", "primary")
+    # The next request reads from the replica again
+    assert await _in_request(_read_workspace_name) == "replica"
+
+
+@pytest.mark.anyio
+async def test_reads_after_a_many_to_many_write_go_to_the_primary(databases):
+    async def add_member_then_read() -> list[int]:
+        await DatabaseModule.add_related(Workspace, "user", 1, {1})
+        rows = await DatabaseModule.fetch_raw(
+            'SELECT user_id FROM "workspace_user" WHERE workspace_id = $1', [1]
+        )
+        return [row["user_id"] for row in rows]
+
+    assert await _in_request(add_member_then_read) == [1]
+
+
+@pytest.mark.anyio
+async def test_lagging_replica_is_skipped(databases):
+    DatabaseRouter._replica_lag[REPLICA] = float("inf")
+    assert await _in_request(_read_workspace_name) == "primary"
+
+    await DatabaseRouter.refresh_replica_lag()
+    assert await _in_request(_read_workspace_name) == "replica"
+
+
+@pytest.mark.anyio
+async def test_board_snapshots_are_built_on_the_primary(databases, monkeypatch):
+    monkeypatch.setattr(BoardSnapshotCache, "backend", LocalCacheBackend(1024 * 1024))
+
+    async def read_task_title() -> tuple[str, bool]:
+        snapshot = json.loads(await TaskService.get_board_snapshot(1))
+        # The reads of the request itself still go to the replica
+        return snapshot[0]["tasks"][0]["title"], DatabaseRouter.is_stuck_to_primary()
+
+    # The replica lags behind the new revision of the board
+    await BoardSnapshotCache.invalidate(1)
+    assert await _in_request(read_task_title) == ("primary", False)
+    assert await _in_request(_read_workspace_name) == "replica"
@@ -0,0 +1,437 @@
+"""
+Every endpoint of the API, driven through the routers and checked against
+its query budget (QUERY_BUDGETS) by the query_budget fixture
+"""
+
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.repositories.workspace_repository import WorkspaceRepository
+from app.tests.conftest import TestAPP
+
+PASSWORD = "Passw0rd!Test"
+
+
+def _register(test_app: TestAPP, role: str) -> dict:
+    email = f"{role}-{uuid.uuid4().hex[:8]}@test.io"
+    response = test_app.do_request(
+        "post",
+        "/auth/register",
+        data={"email": email, "password": PASSWORD, "name": role, "surname": role},
+    )
+    assert response.status_code == 200, response.text
+    session = response.json()
+    test_app.tokens[role] = session["access_token"]
+    return session
+
+
+@pytest.fixture(scope="module")
+def users(test_app: TestAPP) -> dict[str, str]:
+    """Email of the owner, member and guest roles, with their tokens"""
+    return {
+        role: _register(test_app, role)["email"]
+        for role in ("owner", "member", "guest")
+    }
+
+
+def _ok(response, status_code: int = 200) -> dict | list:
+    assert response.status_code == status_code, response.text
+    return response.json()
+
+
+def _create_workspace(test_app: TestAPP) -> int:
+    workspace = test_app.do_request_with_role(
+        "owner", "post", "/workspaces/", data={"name": f"ws-{uuid.uuid4().hex[:8]}"}
+    )
+    return _ok(workspace)["id"]
+
+
+def _create_board(test_app: TestAPP, users: dict[str, str]) -> int:
+    workspace_id = _create_workspace(test_app)
+    _ok(
+        test_app.do_request_with_role(
+            "owner",
+            "post",
+            "/workspaces/invite",
+            data={"workspace_id": workspace_id, "invited_user_email": users["member"]},
+        )
+    )
+    board = test_app.do_request_with_role(
+        "owner",
+        "post",
+        "/boards/",
+        data={"name": "board", "workspace_id": workspace_id, "is_favorite": True},
+    )
+    board_id = _ok(board)["id"]
+    _ok(
+        test_app.do_request_with_role(
+            "owner",
+            "post",
+            "/boards/invite",
+            data={"board_id": board_id, "invited_user_email": users["member"]},
+        )
+    )
+    return board_id
+
+
+def _create_column(test_app: TestAPP, board_id: int, name: str) -> int:
+    column = test_app.do_request_with_role(
+        "owner", "post", "/columns/", data={"name": name, "board_id": board_id}
+    )
+    return _ok(column)["id"]
+
+
+def _create_task(test_app: TestAPP, column_id: int, title: str) -> int:
+    task = test_app.do_request_with_role(
+        "owner",
+        "post",
+        "/tasks/",
+        data={"title": title, "description": "description", "column_id": column_id},
+    )
+    return _ok(task)["id"]
+
+
+def test_auth_router(test_app: TestAPP, query_budget):
+    session = _register(test_app, "auth")
+    email = session["email"]
+
+    login = test_app.do_request(
+        "post", "/auth/login", data={"email": email, "password": PASSWORD}
+    )
+    session = _ok(login)
+    test_app.tokens["auth"] = session["access_token"]
+    replaced_token = session["refresh_token"]
+    refresh = test_app.do_request_with_role(
+        "auth",
+        "post",
+        "/auth/refresh",
+        data={"refresh_token": replaced_token},
+    )
+    session = _ok(refresh)
+    test_app.tokens["auth"] = session["access_token"]
+    _ok(
+        test_app.do_request_with_role(
+            "auth",
+            "post",
+            "/auth/logout",
+            data={"refresh_token": session["refresh_token"]},
+        )
+    )
+    # The replaced token no longer returns the tokens of the closed session
+    replayed = test_app.do_request_with_role(
+        "auth",
+        "post",
+        "/auth/refresh",
+        data={"refresh_token": replaced_token},
+    )
+    assert replayed.status_code == 401, replayed.text
+    _ok(test_app.do_request("post", "/auth/forgot-password", data={"email": email}))
+    _ok(
+        test_app.do_request(
+            "post",
+            "/auth/reset-password",
+            data={
+                "access_token": session["access_token"],
+                "new_password": PASSWORD + "2",
+            },
+        )
+    )
+
+
+def test_user_router(test_app: TestAPP, query_budget):
+    email = _register(test_app, "user")["email"]
+
+    assert _ok(test_app.do_request_with_role("user", "get", "/users/me"))["email"] == (
+        email
+    )
+    updated = test_app.do_request_with_role(
+        "user", "put", "/users/me", data={"name": "renamed", "surname": "user"}
+    )
+    assert _ok(updated)["name"] == "renamed"
+    _ok(test_app.do_request_with_role("user", "delete", "/users/me"))
+
+
+def test_workspace_router(
+    test_app: TestAPP, users: dict[str, str], query_budget, monkeypatch
+):
+    workspace_id = _create_workspace(test_app)
+
+    _ok(
+        test_app.do_request_with_role(
+            "owner",
+            "post",
+            "/workspaces/invite",
+            data={"workspace_id": workspace_id, "invited_user_email": users["member"]},
+        )
+    )
+    _ok(
+        test_app.do_request_with_role(
+            "owner",
+            "post",
+            "/workspaces/invite/bulk",
+            data={
+                "workspace_id": workspace_id,
+                "invited_user_emails": [users["guest"]],
+            },
+        )
+    )
+    # A concurrent invite of the same email, not seen by the member check
+    monkeypatch.setattr(
+        WorkspaceRepository, "get_workspace_member_ids", AsyncMock(return_value=set())
+    )
+    _ok(
+        test_app.do_request_with_role(
+            "owner",
+            "post",
+            "/workspaces/invite/bulk",
+            data={
+                "workspace_id": workspace_id,
+                "invited_user_emails": [users["guest"]],
+            },
+        )
+    )
+    monkeypatch.undo()
+    workspaces = _ok(
+        test_app.do_request_with_role("member", "get", "/workspaces/all-me")
+    )
+    assert workspace_id in [workspace["id"] for workspace in workspaces]
+    members = _ok(
+        test_app.do_request_with_role(
+            "member", "get", f"/workspaces/{workspace_id}/members"
+        )
+    )
+    assert {member["email"] for member in members} == set(users.values())
+    page = _ok(
+        test_app.do_request_with_role(
+            "member", "get", f"/workspaces/{workspace_id}/members?page=1&limit=2"
+        )
+    )
+    assert len(page) == 1
+    for query in ("page=-1", "limit=0", "limit=101"):
+        invalid = test_app.do_request_with_role(
+            "member", "get", f"/workspaces/{workspace_id}/members?{query}"
+        )
+        assert invalid.status_code == 422
+
+    _ok(
+        test_app.do_request_with_role(
+            "owner",
+            "delete",
+            "/workspaces/remove-member",
+            data={
+                "workspace_id": workspace_id,
+                "user_email_to_remove": users["member"],
+            },
+        )
+    )
+    _ok(
+        test_app.do_request_with_role(
+            "owner",
+            "delete",
+            "/workspaces/remove-member/bulk",
+            data={
+                "workspace_id": workspace_id,
+                "user_emails_to_remove": [users["guest"]],
+            },
+        )
+    )
+    forbidden = test_app.do_request_with_role(
+        "member", "get", f"/workspaces/{workspace_id}/members"
+    )
+    assert forbidden.status_code == 403
+    _ok(
+        test_app.do_request_with_role(
+            "owner", "delete", f"/workspaces/remove-workspace/{workspace_id}"
+        )
+    )
+
+
+def test_board_router(test_app: TestAPP, users: dict[str, str], query_budget):
+    board_id = _create_board(test_app, users)
+    workspace_id = _ok(
+        test_app.do_request_with_role("owner", "get", "/workspaces/all-me")
+    )[-1]["id"]
+
+    favorites = _ok(
+        test_app.do_request_with_role(
+            "owner",
+            "get",
+            f"/boards/all-board-paginated/{workspace_id}?is_favourite=true",
+        )
+    )
+    assert [board["id"] for board in favorites["data"]] == [board_id]
+    _ok(
+        test_app.do_request_with_role(
+            "owner", "put", f"/boards/update-favorite/{board_id}"
+        )
+    )
+    others = _ok(
+        test_app.do_request_with_role(
+            "owner", "get", f"/boards/all-board-paginated/{workspace_id}"
+        )
+    )
+    assert [board["id"] for board in others["data"]] == [board_id]
+
+    _ok(
+        test_app.do_request_with_role(
+            "owner",
+            "post",
+            "/workspaces/invite",
+            data={"workspace_id": workspace_id, "invited_user_email": users["guest"]},
+        )
+    )
+    _ok(
+        test_app.do_request_with_role(
+            "owner",
+            "post",
+            "/boards/invite/bulk",
+            data={"board_id": board_id, "invited_user_emails": [users["guest"]]},
+        )
+    )
+    members = _ok(
+        test_app.do_request_with_role("member", "get", f"/boards/{board_id}/members")
+    )
+    assert {member["email"] for member in members} == set(users.values())
+    page = _ok(
+        test_app.do_request_with_role(
+            "member", "get", f"/boards/{board_id}/members?page=1&limit=2"
+        )
+    )
+    assert len(page) == 1
+    for query in ("page=-1", "limit=0", "limit=101"):
+        invalid = test_app.do_request_with_role(
+            "member", "get", f"/boards/{board_id}/members?{query}"
+        )
+        assert invalid.status_code == 422
+
+    _ok(
+        test_app.do_request_with_role(
+            "owner",
+            "delete",
+            "/boards/remove-member",
+            data={"board_id": board_id, "user_email_to_remove": users["member"]},
+        )
+    )
+    _ok(
+        test_app.do_request_with_role(
+            "owner",
+            "delete",
+            "/boards/remove-member/bulk",
+            data={"board_id": board_id, "user_emails_to_remove": [users["guest"]]},
+        )
+    )
+    forbidden = test_app.do_request_with_role(
+        "member", "get", f"/boards/{board_id}/members"
+    )
+    assert forbidden.status_code == 403
+
+
+def test_column_router(test_app: TestAPP, users: dict[str, str], query_budget):
+    board_id = _create_board(test_app, users)
+    todo, doing, done = (
+        _create_column(test_app, board_id, name) for name in ("todo", "doing", "done")
+    )
+
+    _ok(
+        test_app.do_request_with_role(
+            "member",
+            "put",
+            "/columns/change-name",
+            data={"id": doing, "new_name": "wip"},
+        )
+    )
+    _ok(
+        test_app.do_request_with_role(
+            "owner", "put", "/columns/move", data={"id": done, "new_order": 1}
+        )
+    )
+    columns = _ok(
+        test_app.do_request_with_role("member", "get", f"/columns/{board_id}")
+    )
+    assert [column["name"] for column in columns] == ["done", "todo", "wip"]
+
+    _ok(test_app.do_request_with_role("owner", "delete", f"/columns/{todo}"))
+    columns = _ok(
+        test_app.do_request_with_role("member", "get", f"/columns/{board_id}")
+    )
+    assert [column["id"] for column in columns] == [done, doing]
+
+
+def test_task_router(test_app: TestAPP, users: dict[str, str], query_budget):
+    board_id = _create_board(test_app, users)
+    todo, done = (_create_column(test_app, board_id, name) for name in ("todo", "done"))
+    tasks = [_create_task(test_app, todo, f"task {index}") for index in range(4)]
+
+    duplicate = test_app.do_request_with_role(
+        "owner",
+        "post",
+        "/tasks/",
+        data={"title": "task 0", "description": "description", "column_id": todo},
+    )
+    assert duplicate.status_code == 400
+    _ok(
+        test_app.do_request_with_role(
+            "member",
+            "put",
+            "/tasks/update",
+            data={"id": tasks[0], "title": "renamed", "description": "updated"},
+        )
+    )
+    _ok(
+        test_app.do_request_with_role(
+            "member",
+            "put",
+            "/tasks/move",
+            data={"id": tasks[3], "new_order": 1, "column_id": done},
+        )
+    )
+    ids = ",".join(map(str, tasks))
+    tasks_by_ids = test_app.do_request_with_role("member", "get", f"/tasks?ids={ids}")
+    # Served without a redirect to a trailing slash
+    assert not tasks_by_ids.history
+    assert len(_ok(tasks_by_ids)) == 4
+    batch = test_app.do_request_with_role(
+        "member", "post", "/tasks/batch", data={"ids": tasks}
+    )
+    assert len(_ok(batch)) == 4
+    snapshot = _ok(
+        test_app.do_request_with_role("member", "get", f"/tasks/board/{board_id}")
+    )
+    assert [[task["id"] for task in column["tasks"]] for column in snapshot] == [
+        tasks[:3],
+        [tasks[3]],
+    ]
+
+    archived = test_app.do_request_with_role(
+        "owner", "post", f"/tasks/{tasks[1]}/archive"
+    )
+    assert _ok(archived) == {"archived": 1}
+    archived = test_app.do_request_with_role(
+        "owner", "post", f"/tasks/archive/column/{done}"
+    )
+    assert _ok(archived) == {"archived": 1}
+    archived = test_app.do_request_with_role(
+        "owner", "post", f"/tasks/archive/board/{board_id}?older_than_days=30"
+    )
+    assert _ok(archived) == {"archived": 0}
+    page = _ok(
+        test_app.do_request_with_role(
+            "member", "get", f"/tasks/archive/board/{board_id}"
+        )
+    )
+    assert page["total"] == 2
+    restored = test_app.do_request_with_role(
+        "member", "post", f"/tasks/archive/{tasks[3]}/restore"
+    )
+    assert _ok(restored)["column_id"] == done
+
+    _ok(test_app.do_request_with_role("owner", "delete", f"/tasks/{tasks[2]}"))
+    snapshot = _ok(
+        test_app.do_request_with_role("member", "get", f"/tasks/board/{board_id}")
+    )
+    assert [[task["id"] for task in column["tasks"]] for column in snapshot] == [
+        [tasks[0]],
+        [tasks[3]],
+    ]
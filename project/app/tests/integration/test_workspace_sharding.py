@@ -0,0 +1,177 @@
+"""
+Workspaces spread over two local SQLite shards: the catalog and "acme".
+Schemas and identifier ranges are created by the init_db script, workspaces
+are moved by the move_workspace script.
+"""
+
+import asyncio
+
+import pytest
+from tortoise import Tortoise
+
+from app.modules.database_module import DatabaseModule
+from app.modules.database_module.database_router import DatabaseRouter
+from app.modules.database_module.models.default import (
+    Board,
+    Column,
+    Task,
+    User,
+    Workspace,
+    WorkspaceShard,
+)
+from app.modules.database_module.scripts.init_db import generate_schema
+from app.modules.database_module.scripts.move_workspace import move_workspace
+from app.modules.database_module.settings import CATALOG_SHARD, module_settings
+from app.modules.database_module.shard_exception import ShardException
+from app.modules.database_module.shard_router import ShardRouter
+from app.modules.database_module.sharding import SHARD_ID_RANGE
+from app.repositories.workspace_repository import WorkspaceRepository
+
+SHARD = "acme"
+
+
+@pytest.fixture
+async def shards(tmp_path, monkeypatch):
+    catalog_url = f"sqlite://{tmp_path / 'catalog.db'}"
+    shard_urls = f"{SHARD}=sqlite://{tmp_path / 'acme.db'}"
+    # Environment of the scripts, settings of the API
+    monkeypatch.setenv("DATABASE_URL", catalog_url)
+    monkeypatch.setenv("DATABASE_SHARD_URLS", shard_urls)
+    monkeypatch.setattr(module_settings, "database_url", catalog_url)
+    monkeypatch.setattr(module_settings, "database_replica_urls", "")
+    monkeypatch.setattr(module_settings, "database_shard_urls", shard_urls)
+    monkeypatch.setattr(module_settings, "shard_map_refresh_interval", 2.5)
+    monkeypatch.setattr(DatabaseRouter, "_replicas", [])
+    monkeypatch.setattr(ShardRouter, "_shards", [CATALOG_SHARD, SHARD])
+    monkeypatch.setattr(ShardRouter, "_workspace_shards", {})
+    monkeypatch.setattr(ShardRouter, "_moving", frozenset())
+
+    await generate_schema()
+    await Tortoise.init(config=module_settings.get_tortoise_config())
+    yield
+    await Tortoise.close_connections()
+
+
+async def _in_request(query):
+    # Each request runs in its own task, bound to its own shard
+    return await asyncio.create_task(query())
+
+
+async def _create_owner() -> User:
+    return await DatabaseModule.post_entity(
+        User, {"name": "owner", "surname": "owner", "email": "owner@test.io"}
+    )
+
+
+async def _create_workspace(owner: User, name: str, shard: str) -> int:
+    async def create() -> int:
+        ShardRouter.bind(shard)
+        workspace = await Workspace.create(name=name, owner_id=owner.id)
+        await workspace.user.add(owner)
+        board = await Board.create(
+            name=name, workspace_id=workspace.id, owner_id=owner.id
+        )
+        await board.members.add(owner)
+        column = await Column.create(name="todo", order=0, board_id=board.id)
+        for order in range(3):
+            await Task.create(
+                title=f"task {order}",
+                description="description",
+                order=order,
+                column_id=column.id,
+                board_id=board.id,
+            )
+        return workspace.id
+
+    workspace_id = await _in_request(create)
+    if shard != CATALOG_SHARD:
+        await WorkspaceShard.create(workspace_id=workspace_id, shard=shard)
+        await ShardRouter.refresh_shard_map()
+    return workspace_id
+
+
+async def _workspace_names(workspace_id: int) -> list[str]:
+    """Workspaces visible from the shard of a workspace"""
+
+    async def read() -> list[str]:
+        WorkspaceRepository.use_workspace_shard(workspace_id)
+        return await Workspace.all().order_by("id").values_list("name", flat=True)
+
+    return await _in_request(read)
+
+
+async def _task_ids(shard: str) -> list[int]:
+    async def read() -> list[int]:
+        ShardRouter.bind(shard)
+        return await Task.all().order_by("id").values_list("id", flat=True)
+
+    return await _in_request(read)
+
+
+@pytest.mark.anyio
+async def test_workspaces_are_isolated_on_their_shard(shards):
+    owner = await _create_owner()
+    catalog_id = await _create_workspace(owner, "catalog", CATALOG_SHARD)
+    acme_id = await _create_workspace(owner, "acme", SHARD)
+
+    # Identifiers of the range of each shard
+    assert catalog_id < SHARD_ID_RANGE <= acme_id
+    assert await _workspace_names(catalog_id) == ["catalog"]
+    assert await _workspace_names(acme_id) == ["acme"]
+    assert await ShardRouter.locate(Workspace, acme_id) == SHARD
+    assert await ShardRouter.locate(Workspace, catalog_id) == CATALOG_SHARD
+
+    # Users are replicated, the queries spanning shards gather every shard
+    assert await ShardRouter.gather(lambda: User.filter(id=owner.id).count()) == [1, 1]
+    assert sorted(await WorkspaceRepository.get_user_workspaces(owner.id)) == [
+        (catalog_id, owner.id),
+        (acme_id, owner.id),
+    ]
+
+
+@pytest.mark.anyio
+async def test_move_workspace_to_another_shard(shards):
+    owner = await _create_owner()
+    workspace_id = await _create_workspace(owner, "moved", CATALOG_SHARD)
+    await _create_workspace(owner, "staying", CATALOG_SHARD)
+    task_ids = await _task_ids(CATALOG_SHARD)
+
+    await Tortoise.close_connections()
+    await move_workspace(workspace_id, SHARD, batch_size=2, wait=False)
+    await Tortoise.init(config=module_settings.get_tortoise_config())
+    await ShardRouter.refresh_shard_map()
+
+    assert ShardRouter.get_workspace_shard(workspace_id) == SHARD
+    assert await _workspace_names(workspace_id) == ["moved"]
+    # The rows keep their identifiers, the other workspace stays
+    assert await _task_ids(SHARD) == task_ids[:3]
+    assert await _task_ids(CATALOG_SHARD) == task_ids[3:]
+    assert sorted(await WorkspaceRepository.get_user_workspaces(owner.id)) == sorted(
+        [(workspace_id, owner.id), (workspace_id + 1, owner.id)]
+    )
+
+    # New rows of the moved workspace are created in the range of the shard
+    async def create_board() -> int:
+        WorkspaceRepository.use_workspace_shard(workspace_id)
+        board = await Board.create(
+            name="new", workspace_id=workspace_id, owner_id=owner.id
+        )
+        return board.id
+
+    assert await _in_request(create_board) >= SHARD_ID_RANGE
+
+
+@pytest.mark.anyio
+async def test_moving_workspace_is_rejected(shards):
+    owner = await _create_owner()
+    workspace_id = await _create_workspace(owner, "moving", CATALOG_SHARD)
+    await WorkspaceShard.create(
+        workspace_id=workspace_id, shard=CATALOG_SHARD, is_moving=True
+    )
+    await ShardRouter.refresh_shard_map()
+
+    with pytest.raises(ShardException) as raised:
+        await _workspace_names(workspace_id)
+    assert raised.value.status_code == 503
+    # Retried once the API processes refreshed their shard map
+    assert raised.value.headers == {"Retry-After": "3"}
@@ -0,0 +1,187 @@
+"""
+Admission control driven by synthetic connection acquire latencies, on a
+fake clock: adaptation of the limits and shedding once they are reached
+"""
+
+import asyncio
+from contextlib import AsyncExitStack
+
+import pytest
+
+from app.app_config import app_settings
+from app.core.admission import admission_controller
+from app.core.admission.admission_controller import (
+    ADJUST_INTERVAL,
+    AdmissionController,
+    RequestClass,
+    _create_limits,
+)
+from app.core.admission.admission_exception import AdmissionException
+
+SATURATED = 0.05
+IDLE = 0.001
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(admission_controller, "time", clock)
+    monkeypatch.setattr(app_settings, "admission_target_acquire_ms", 20)
+    monkeypatch.setattr(app_settings, "admission_mutation_limit", 8)
+    monkeypatch.setattr(app_settings, "admission_read_limit", 4)
+    monkeypatch.setattr(app_settings, "admission_low_priority_limit", 4)
+    monkeypatch.setattr(app_settings, "admission_mutation_queue_timeout", 0.05)
+    monkeypatch.setattr(app_settings, "admission_read_queue_timeout", 0.05)
+    monkeypatch.setattr(AdmissionController, "enabled", True)
+    monkeypatch.setattr(AdmissionController, "limits", _create_limits())
+    monkeypatch.setattr(AdmissionController, "acquire_latency", 0.0)
+    monkeypatch.setattr(AdmissionController, "_acquire_total", 0.0)
+    monkeypatch.setattr(AdmissionController, "_acquire_count", 0)
+    monkeypatch.setattr(AdmissionController, "_adjusted_at", clock.now)
+    return clock
+
+
+def _observe(clock: FakeClock, latency: float, intervals: int = 1) -> None:
+    """Acquires of the given latency over the next intervals"""
+    for _ in range(3):
+        AdmissionController.observe_acquire(latency)
+    clock.now += ADJUST_INTERVAL * intervals
+
+
+async def _admit(request_class: RequestClass) -> None:
+    async with AdmissionController.admit(request_class):
+        pass
+
+
+def _limits() -> dict[RequestClass, float]:
+    return {
+        request_class: round(limit.limit, 2)
+        for request_class, limit in AdmissionController.limits.items()
+    }
+
+
+async def _hold(stack: AsyncExitStack, request_class: RequestClass, count: int):
+    for _ in range(count):
+        await stack.enter_async_context(AdmissionController.admit(request_class))
+
+
+def _rejected(request_class: RequestClass, reason: str) -> float:
+    return AdmissionController.rejected.get((request_class.value, reason))
+
+
+@pytest.mark.anyio
+async def test_limits_decrease_while_saturated(clock):
+    _observe(clock, SATURATED)
+    await _admit(RequestClass.READ)
+    assert AdmissionController.acquire_latency == pytest.approx(SATURATED)
+    assert _limits() == {
+        RequestClass.MUTATION: 7.2,
+        RequestClass.READ: 2.8,
+        RequestClass.LOW_PRIORITY: 2.0,
+    }
+
+    # Low priority reads are shed entirely, mutations keep their floor
+    for _ in range(20):
+        _observe(clock, SATURATED)
+        await _admit(RequestClass.MUTATION)
+    assert _limits() == {
+        RequestClass.MUTATION: 2.0,
+        RequestClass.READ: 1.0,
+        RequestClass.LOW_PRIORITY: 0.0,
+    }
+
+
+@pytest.mark.anyio
+async def test_limits_grow_back_below_the_target(clock):
+    _observe(clock, SATURATED)
+    await _admit(RequestClass.READ)
+    _observe(clock, SATURATED)
+    await _admit(RequestClass.READ)
+
+    # One per interval, idle intervals included, up to the configured limit
+    _observe(clock, IDLE)
+    await _admit(RequestClass.READ)
+    assert _limits()[RequestClass.READ] == 2.96
+    clock.now += ADJUST_INTERVAL * 2
+    await _admit(RequestClass.READ)
+    assert _limits() == {
+        RequestClass.MUTATION: 8.0,
+        RequestClass.READ: 4.0,
+        RequestClass.LOW_PRIORITY: 4.0,
+    }
+
+
+@pytest.mark.anyio
+async def test_low_priority_reads_shed_once_the_limit_is_reached(clock):
+    shed = _rejected(RequestClass.LOW_PRIORITY, "shed")
+    async with AsyncExitStack() as stack:
+        await _hold(stack, RequestClass.LOW_PRIORITY, 4)
+
+        with pytest.raises(AdmissionException) as raised:
+            await _admit(RequestClass.LOW_PRIORITY)
+        assert raised.value.status_code == 503
+        assert raised.value.headers == {"Retry-After": "1"}
+        assert _rejected(RequestClass.LOW_PRIORITY, "shed") == shed + 1
+
+        # The other classes have their own limits
+        await _admit(RequestClass.READ)
+
+
+@pytest.mark.anyio
+async def test_saturation_sheds_below_the_configured_limit(clock):
+    _observe(clock, SATURATED)
+    async with AsyncExitStack() as stack:
+        await _hold(stack, RequestClass.LOW_PRIORITY, 2)
+        with pytest.raises(AdmissionException):
+            await _admit(RequestClass.LOW_PRIORITY)
+
+
+@pytest.mark.anyio
+async def test_reads_deferred_until_a_slot_is_released(clock):
+    async with AsyncExitStack() as stack:
+        await _hold(stack, RequestClass.READ, 3)
+        async with AdmissionController.admit(RequestClass.READ):
+            deferred = asyncio.create_task(_admit(RequestClass.READ))
+            await asyncio.sleep(0)
+            assert not deferred.done()
+        await deferred
+        assert AdmissionController.limits[RequestClass.READ].in_flight == 3
+
+
+@pytest.mark.anyio
+async def test_deferred_reads_rejected_after_the_queue_timeout(clock):
+    timeouts = _rejected(RequestClass.READ, "timeout")
+    async with AsyncExitStack() as stack:
+        await _hold(stack, RequestClass.READ, 4)
+        with pytest.raises(AdmissionException):
+            await _admit(RequestClass.READ)
+    assert _rejected(RequestClass.READ, "timeout") == timeouts + 1
+
+
+@pytest.mark.anyio
+async def test_reads_rejected_when_the_queue_is_full(clock):
+    queue_full = _rejected(RequestClass.READ, "queue_full")
+    async with AsyncExitStack() as stack:
+        await _hold(stack, RequestClass.READ, 4)
+        deferred = [asyncio.create_task(_admit(RequestClass.READ)) for _ in range(4)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionException):
+            await _admit(RequestClass.READ)
+        assert _rejected(RequestClass.READ, "queue_full") == queue_full + 1
+    await asyncio.gather(*deferred, return_exceptions=True)
+
+
+@pytest.mark.anyio
+async def test_disabled_admits_everything(clock, monkeypatch):
+    monkeypatch.setattr(AdmissionController, "enabled", False)
+    async with AsyncExitStack() as stack:
+        await _hold(stack, RequestClass.LOW_PRIORITY, 10)
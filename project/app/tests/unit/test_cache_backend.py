@@ -0,0 +1,40 @@
+"""
+Backend selected by the cache settings according to the worker processes
+"""
+
+import pytest
+
+from app.core.cache import cache_backend
+from app.core.cache.cache_backend import LocalCacheBackend, create_cache_backend
+
+SETTING = "SNAPSHOT_CACHE_BACKEND"
+
+
+def _create(backend: str):
+    return create_cache_backend(SETTING, backend, "redis://localhost:6379/0", 1024)
+
+
+@pytest.fixture
+def workers(monkeypatch):
+    def set_workers(count: int) -> None:
+        monkeypatch.setattr(cache_backend, "get_workers", lambda: count)
+
+    return set_workers
+
+
+def test_local_backend_with_a_single_worker(workers):
+    workers(1)
+    backend = _create("local")
+    assert isinstance(backend, LocalCacheBackend)
+    assert backend.max_bytes == 1024
+
+
+def test_local_backend_disabled_with_several_workers(workers, caplog):
+    workers(4)
+    assert _create("local") is None
+    assert f"{SETTING}=local disabled" in caplog.text
+
+
+def test_no_backend(workers):
+    workers(1)
+    assert _create("none") is None
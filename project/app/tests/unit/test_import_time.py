@@ -0,0 +1,22 @@
+"""
+Cold start of a worker: import time of app.main, measured in fresh
+interpreters by benchmarks.import_time, against its budget
+"""
+
+import statistics
+
+from app.tests.constants import FORBIDDEN_STARTUP_IMPORTS, IMPORT_TIME_BUDGET_MS
+from benchmarks.import_time import TARGET_MODULE, forbidden_imports, measure, total_ms
+
+RUNS = 3
+
+
+def test_import_time_within_budget():
+    runs = [measure() for _ in range(RUNS)]
+
+    median_ms = statistics.median(total_ms(records) for records in runs)
+    assert median_ms <= IMPORT_TIME_BUDGET_MS, (
+        f"{TARGET_MODULE} imported in {median_ms:.1f} ms (median of {RUNS} runs), "
+        f"budget {IMPORT_TIME_BUDGET_MS} ms"
+    )
+    assert forbidden_imports(runs[-1], FORBIDDEN_STARTUP_IMPORTS) == []
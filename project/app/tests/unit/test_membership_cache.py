@@ -0,0 +1,112 @@
+"""
+Trust of the membership index by the permission checks, with the loads from
+the database replaced by a counter
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.permission_service import membership_cache
+from app.services.permission_service.membership_cache import (
+    Membership,
+    MembershipCache,
+)
+from app.services.permission_service.membership_invalidation_channel import (
+    MembershipInvalidationChannel,
+)
+
+EMAIL = "user@test.io"
+
+
+@pytest.fixture
+def loads(monkeypatch) -> list[str]:
+    """Emails loaded from the database"""
+    loaded = []
+
+    async def load(user_email: str) -> Membership:
+        loaded.append(user_email)
+        membership = Membership(
+            user_id=1,
+            email=user_email,
+            workspace_ids=frozenset(),
+            owned_workspace_ids=frozenset(),
+            board_ids=frozenset(),
+            owned_board_ids=frozenset(),
+            board_workspace_ids={},
+            loaded_at=time.monotonic(),
+        )
+        MembershipCache._entries[user_email] = membership
+        MembershipCache._emails[1] = user_email
+        return membership
+
+    MembershipCache.clear()
+    monkeypatch.setattr(MembershipCache, "_load", load)
+    monkeypatch.setattr(MembershipCache, "_publisher", None)
+    yield loaded
+    MembershipCache.clear()
+
+
+def _workers(monkeypatch, workers: int) -> None:
+    monkeypatch.setattr(membership_cache, "get_workers", lambda: workers)
+
+
+async def _request(checks: int = 2) -> None:
+    async def serve() -> None:
+        MembershipCache.begin_request()
+        for _ in range(checks):
+            await MembershipCache.get(EMAIL)
+
+    # Each request runs in its own task, with its own context
+    await asyncio.create_task(serve())
+
+
+@pytest.mark.anyio
+async def test_single_worker_trusts_the_index(loads, monkeypatch):
+    _workers(monkeypatch, 1)
+    await _request()
+    await _request()
+    assert loads == [EMAIL]
+
+
+@pytest.mark.anyio
+async def test_requests_reload_without_shared_invalidations(loads, monkeypatch):
+    _workers(monkeypatch, 4)
+    # Once per request, the later checks of the request use the fresh entry
+    await _request()
+    await _request()
+    assert loads == [EMAIL] * 2
+
+
+@pytest.mark.anyio
+async def test_requests_trust_the_index_with_shared_invalidations(loads, monkeypatch):
+    _workers(monkeypatch, 4)
+    published = []
+    MembershipCache.set_invalidation_publisher(published.append)
+    await _request()
+    await _request()
+    assert loads == [EMAIL]
+
+    MembershipCache.invalidate([1])
+    assert published == [[1]]
+    await _request()
+    assert loads == [EMAIL] * 2
+
+
+@pytest.mark.anyio
+async def test_channel_applies_the_invalidations_of_other_workers(loads):
+    published = []
+    MembershipCache.set_invalidation_publisher(published.append)
+    # No Redis client, only the handling of the received messages
+    channel = MembershipInvalidationChannel.__new__(MembershipInvalidationChannel)
+    channel._sender = "this-worker"
+    await _request()
+
+    channel.apply('{"sender": "this-worker", "user_ids": [1]}')
+    assert MembershipCache.peek(EMAIL) is not None
+
+    channel.apply('{"sender": "other-worker", "user_ids": [1]}')
+    assert MembershipCache.peek(EMAIL) is None
+    # Not published again
+    assert published == []
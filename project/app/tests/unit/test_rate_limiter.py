@@ -0,0 +1,26 @@
+"""
+Token buckets of the rate limits according to the worker processes
+"""
+
+import pytest
+
+from app.app_config import app_settings
+from app.core.cache import cache_backend
+from app.core.rate_limit import rate_limiter
+from app.core.rate_limit.token_buckets import LocalTokenBuckets
+
+
+@pytest.fixture
+def local_buckets(monkeypatch) -> None:
+    monkeypatch.setattr(app_settings, "rate_limit_backend", "local")
+
+
+def test_local_buckets_with_a_single_worker(local_buckets, monkeypatch):
+    monkeypatch.setattr(cache_backend, "get_workers", lambda: 1)
+    assert isinstance(rate_limiter._create_backend(), LocalTokenBuckets)
+
+
+def test_local_buckets_disabled_with_several_workers(local_buckets, monkeypatch):
+    # Each worker would grant the whole limit
+    monkeypatch.setattr(cache_backend, "get_workers", lambda: 4)
+    assert rate_limiter._create_backend() is None
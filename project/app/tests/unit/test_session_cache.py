@@ -0,0 +1,121 @@
+"""
+Session cache hits, expiry and revocation, on a fake clock
+"""
+
+import pytest
+
+from app.app_config import app_settings
+from app.schemas.auth_schema import AuthResponseSchema
+from app.services.auth_service import session_cache
+from app.services.auth_service.session_cache import SessionCache, SessionEntry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(session_cache, "time", clock)
+    monkeypatch.setattr(app_settings, "session_cache_ttl", 300)
+    monkeypatch.setattr(app_settings, "auth_refresh_reuse_interval", 10)
+    monkeypatch.setattr(app_settings, "session_cache_max_entries", 3)
+    SessionCache.clear()
+    yield clock
+    SessionCache.clear()
+
+
+def _response(refresh_token: str, user_id: int = 1) -> AuthResponseSchema:
+    return AuthResponseSchema(
+        access_token="access",
+        refresh_token=refresh_token,
+        user_id=user_id,
+        email="user@test.io",
+    )
+
+
+def test_hit_until_the_ttl(clock):
+    SessionCache.put("token", 10, 1, "user@test.io")
+
+    clock.now += 299
+    assert SessionCache.get("token") == SessionEntry(10, 1, "user@test.io", 1000.0)
+    assert SessionCache.get("other") is None
+
+    clock.now += 1
+    assert SessionCache.get("token") is None
+    # The expired entry is dropped
+    assert SessionCache._sessions == {}
+
+
+def test_tokens_are_kept_hashed(clock):
+    SessionCache.put("token", 10, 1, "user@test.io")
+    SessionCache.put_refreshed("refreshed", _response("new"))
+    assert "token" not in SessionCache._sessions
+    assert "refreshed" not in SessionCache._refreshed
+
+
+def test_least_recently_used_sessions_are_evicted(clock):
+    for session_id, token in enumerate(("a", "b", "c")):
+        SessionCache.put(token, session_id, 1, "user@test.io")
+    assert SessionCache.get("a") is not None
+
+    SessionCache.put("d", 3, 1, "user@test.io")
+    assert SessionCache.get("b") is None
+    assert [SessionCache.get(token).session_id for token in ("a", "c", "d")] == [
+        0,
+        2,
+        3,
+    ]
+
+
+def test_refresh_response_reused_within_the_interval(clock):
+    SessionCache.put("token", 10, 1, "user@test.io")
+    response = _response("new")
+    SessionCache.put_refreshed("token", response)
+
+    # The refreshed token is replaced by the one of the response
+    assert SessionCache.get("token") is None
+    clock.now += 9
+    assert SessionCache.get_refreshed("token") is response
+    clock.now += 1
+    assert SessionCache.get_refreshed("token") is None
+
+
+def test_invalidate_revokes_the_token(clock):
+    SessionCache.put("token", 10, 1, "user@test.io")
+    SessionCache.put_refreshed("refreshed", _response("new"))
+    SessionCache.put("other", 11, 1, "user@test.io")
+
+    SessionCache.invalidate("token")
+    SessionCache.invalidate("refreshed")
+    assert SessionCache.get("token") is None
+    assert SessionCache.get_refreshed("refreshed") is None
+    assert SessionCache.get("other") is not None
+
+
+def test_invalidate_revokes_the_refreshes_handing_out_the_token(clock):
+    SessionCache.put_refreshed("token", _response("new"))
+    SessionCache.put_refreshed("other", _response("other-new"))
+
+    # Logout with the rotated token, the replaced one must not return it
+    SessionCache.invalidate("new")
+    assert SessionCache.get_refreshed("token") is None
+    assert SessionCache.get_refreshed("other") is not None
+
+
+def test_invalidate_user_revokes_all_its_sessions(clock):
+    SessionCache.put("token", 10, 1, "user@test.io")
+    SessionCache.put_refreshed("refreshed", _response("new"))
+    SessionCache.put("other-user", 20, 2, "other@test.io")
+    SessionCache.put_refreshed("other-refreshed", _response("other-new", user_id=2))
+
+    SessionCache.invalidate_user(1)
+    assert SessionCache.get("token") is None
+    assert SessionCache.get_refreshed("refreshed") is None
+    assert SessionCache.get("other-user") is not None
+    assert SessionCache.get_refreshed("other-refreshed") is not None
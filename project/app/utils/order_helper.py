@@ -15,8 +15,12 @@ class OrderHelper:
             parent_id: int,
             old_order: int,
             new_order: int,
+            scope: dict | None = None,
     ) -> DatabaseModel | None:
-        filters = {parent_field: parent_id}
+        # scope: partition key of the parent (e.g. the board of a column),
+        # filtered on so the shifts are pruned to one partition, set on the entity
+        scope = scope or {}
+        filters = {parent_field: parent_id, **scope}
 
         if new_order < old_order:
             await model.filter(
@@ -32,4 +36,6 @@ class OrderHelper:
                 order__lte=new_order,
             ).update(order=F("order") - 1)
 
-        return await DatabaseModule.put_entity(model, {"order": new_order, parent_field: parent_id}, entity_id)
+        return await DatabaseModule.put_entity(
+            model, {"order": new_order, parent_field: parent_id, **scope}, entity_id
+        )
@@ -0,0 +1,41 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+from app.core.monitoring.metrics_registry import MetricsRegistry
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls sharing a key: the first caller runs the
+    operation and the callers arriving while it is in flight await the same
+    result (or exception) instead of running it again.
+
+    Nothing is kept once the operation completes, callers arriving later run
+    it again.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def run(self, key: Hashable, operation: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run the operation, or join the call in flight for the same key
+        :param key: identifies calls that can share their result
+        :param operation: callable returning the awaitable to run
+        :return: result of the operation
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            MetricsRegistry.single_flight_calls.inc((self.name, "joined"))
+            # Shielded: a cancelled waiter must not cancel the shared call
+            return await asyncio.shield(future)
+
+        MetricsRegistry.single_flight_calls.inc((self.name, "executed"))
+        future = asyncio.ensure_future(operation())
+        self._calls[key] = future
+        future.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(future)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
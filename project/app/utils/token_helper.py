@@ -0,0 +1,9 @@
+import hashlib
+
+# Length of the stored token hashes (hex encoded SHA-256)
+TOKEN_HASH_LENGTH = 64
+
+
+def hash_token(token: str) -> str:
+    """Return the SHA-256 hex digest under which a token is stored."""
+    return hashlib.sha256(token.encode()).hexdigest()
@@ -0,0 +1,141 @@
+"""
+Mutation latency while reads flood a saturated database, with and without
+the admission control, driven in process through the ASGI app against the
+synthetic slow database (DATABASE_STUB_LATENCY_MS).
+
+Usage (from the project directory):
+    python -m benchmarks.admission_benchmark [--db-url URL] [--latency-ms 5]
+        [--readers 40] [--duration 10]
+
+Readers loop over the board pagination (low priority) and the member lists
+(reads), a single writer moves a task in a loop. Shed requests get 503 and
+are retried by the readers after a short pause, as a client honouring
+Retry-After would, only faster.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from dataclasses import dataclass, field
+
+from benchmarks.api_benchmark import _auth_headers, _configure_environment, _percentile
+
+SHED_PAUSE = 0.05
+
+
+@dataclass
+class ClassResult:
+    latencies: list[float] = field(default_factory=list)
+    shed: int = 0
+    errors: int = 0
+
+    def summary(self) -> str:
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return f"{'-':>9} {'-':>9} {0:>8} {self.shed:>6} {self.errors:>7}"
+        return (
+            f"{statistics.median(latencies) * 1000:>9.1f} "
+            f"{_percentile(latencies, 99) * 1000:>9.1f} "
+            f"{len(latencies):>8} {self.shed:>6} {self.errors:>7}"
+        )
+
+
+async def measure(client, data, args: argparse.Namespace) -> dict:
+    workspace_id, board_id = data.workspace_ids[0], data.board_ids[0]
+    reads = [
+        ("low priority", f"/boards/all-board-paginated/{workspace_id}?limit=20"),
+        ("read", f"/boards/{board_id}/members"),
+        ("read", f"/workspaces/{workspace_id}/members"),
+    ]
+    results = {name: ClassResult() for name in ("mutation", "read", "low priority")}
+    deadline = time.perf_counter() + args.duration
+
+    async def send(name: str, method: str, path: str, body=None) -> None:
+        start = time.perf_counter()
+        response = await client.request(method, path, json=body)
+        elapsed = time.perf_counter() - start
+        if response.status_code == 503:
+            results[name].shed += 1
+            await asyncio.sleep(SHED_PAUSE)
+        elif response.status_code >= 400:
+            results[name].errors += 1
+        else:
+            results[name].latencies.append(elapsed)
+
+    async def reader(index: int) -> None:
+        while time.perf_counter() < deadline:
+            name, path = reads[index % len(reads)]
+            await send(name, "GET", path)
+            index += 1
+
+    async def writer() -> None:
+        order = 0
+        while time.perf_counter() < deadline:
+            order = order % 5 + 1
+            await send(
+                "mutation",
+                "PUT",
+                "/tasks/move",
+                {
+                    "id": data.task_ids[0],
+                    "new_order": order,
+                    "column_id": data.column_ids[0],
+                },
+            )
+
+    await asyncio.gather(writer(), *(reader(index) for index in range(args.readers)))
+    return results
+
+
+async def run(args: argparse.Namespace) -> None:
+    import httpx
+    from tortoise import Tortoise
+
+    from app.app_config import app_settings
+    from app.core.admission.admission_controller import AdmissionController
+    from app.main import create_app
+    from benchmarks.seed import SeedSizes, seed_database
+
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        await Tortoise.generate_schemas()
+        data = await seed_database(SeedSizes(users=40, workspaces=1, boards=20))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url=f"http://benchmark/api/v{app_settings.api_version}",
+            headers=_auth_headers(data.user_emails[0]),
+            timeout=None,
+        ) as client:
+            print(
+                f"{args.readers} readers, 1 writer, {args.latency_ms:.0f} ms per "
+                f"connection, {args.duration:.0f}s per run"
+            )
+            print(
+                f"{'admission':<10} {'class':<13} {'p50 ms':>9} {'p99 ms':>9} "
+                f"{'served':>8} {'shed':>6} {'errors':>7}"
+            )
+            for enabled in (False, True):
+                AdmissionController.configure(enabled)
+                results = await measure(client, data, args)
+                for name, result in results.items():
+                    print(
+                        f"{'on' if enabled else 'off':<10} {name:<13} "
+                        f"{result.summary()}"
+                    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db-url", default="sqlite://:memory:")
+    parser.add_argument("--latency-ms", type=float, default=5)
+    parser.add_argument("--readers", type=int, default=40)
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    _configure_environment(args.db_url)
+    # Settings are read at import time
+    os.environ["DATABASE_STUB_LATENCY_MS"] = str(args.latency_ms)
+    asyncio.run(run(args))
@@ -0,0 +1,324 @@
+"""
+End to end latency, throughput and query counts of the API endpoints against
+a seeded large board, driven in process through the ASGI app.
+
+Usage (from the project directory):
+    python -m benchmarks.api_benchmark [--db-url URL] [--requests 200]
+        [--concurrency 10] [--columns 10] [--tasks 100] [--members 50]
+        [--output results.json] [--compare baseline.json]
+
+The database must be empty, the schema is generated before seeding. Auth
+endpoints run against the in-process Supabase stub, SUPABASE_STUB_LATENCY_MS
+simulates the upstream round trip.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass, field
+
+BENCHMARK_JWT_SECRET = "benchmark"
+BENCHMARK_AUTH_USER = {
+    "email": "storm@bench.io",
+    "password": "Benchmark-Passw0rd",
+    "name": "storm",
+    "surname": "bench",
+}
+SIZE_OPTIONS = (
+    "users",
+    "workspaces",
+    "boards",
+    "columns",
+    "tasks",
+    "members",
+    "favorites",
+)
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: str
+    body: object = None  # dict, or callable building a fresh body per request
+    headers: dict | None = None  # defaults to the seeded user
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    latencies: list[float] = field(default_factory=list)
+    query_counts: list[int] = field(default_factory=list)
+    errors: int = 0
+    wall_time: float = 0.0
+
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "requests": len(latencies),
+            "errors": self.errors,
+            "throughput_rps": len(latencies) / self.wall_time if self.wall_time else 0,
+            "p50_ms": _percentile(latencies, 50) * 1000,
+            "p95_ms": _percentile(latencies, 95) * 1000,
+            "p99_ms": _percentile(latencies, 99) * 1000,
+            "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0,
+            "queries_per_request": (
+                statistics.fmean(self.query_counts) if self.query_counts else 0
+            ),
+        }
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, round(percentile / 100 * (len(values) - 1)))
+    return values[index]
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _configure_environment(db_url: str) -> None:
+    # Settings are read at import time, set them before importing the app
+    os.environ["DATABASE_URL"] = db_url
+    os.environ.setdefault("API_VERSION", "1")
+    os.environ["SUPABASE_JWT_TOKEN"] = BENCHMARK_JWT_SECRET
+    os.environ["SUPABASE_STUB"] = "true"
+    os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+    os.environ.setdefault("REFRESH_TOKEN_EXPIRE_DAYS", "7")
+    # Measure the endpoints, not the per user limits the load would hit nor
+    # the load shedding
+    os.environ.setdefault("RATE_LIMIT_BACKEND", "none")
+    os.environ.setdefault("ADMISSION_CONTROL_ENABLED", "false")
+
+
+def _auth_headers(email: str) -> dict:
+    from jose import jwt
+
+    token = jwt.encode(
+        {"sub": email, "email": email, "aud": "authenticated"},
+        BENCHMARK_JWT_SECRET,
+        algorithm="HS256",
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+def build_scenarios(data, refresh_token: str) -> list[Scenario]:
+    workspace_id, board_id = data.workspace_ids[0], data.board_ids[0]
+    first_column = data.column_ids[0]
+    counter = itertools.count()
+    moved_task = data.task_ids[0]
+    return [
+        Scenario("board snapshot", "GET", f"/tasks/board/{board_id}"),
+        Scenario("board columns", "GET", f"/columns/{board_id}"),
+        Scenario("board members", "GET", f"/boards/{board_id}/members"),
+        Scenario("workspace members", "GET", f"/workspaces/{workspace_id}/members"),
+        Scenario("workspaces of user", "GET", "/workspaces/all-me"),
+        Scenario(
+            "boards paginated",
+            "GET",
+            f"/boards/all-board-paginated/{workspace_id}?page=1&size=20",
+        ),
+        Scenario("current user", "GET", "/users/me"),
+        Scenario(
+            "create task",
+            "POST",
+            "/tasks/",
+            lambda: {
+                "title": f"benchmark task {next(counter)}",
+                "description": "created by the benchmark",
+                "column_id": first_column,
+            },
+        ),
+        Scenario(
+            "update task",
+            "PUT",
+            "/tasks/update",
+            lambda: {
+                "id": moved_task,
+                "title": f"benchmark update {next(counter)}",
+                "description": "updated by the benchmark",
+            },
+        ),
+        Scenario(
+            "move task",
+            "PUT",
+            "/tasks/move",
+            lambda: {
+                "id": moved_task,
+                "new_order": next(counter) % 10 + 1,
+                "column_id": first_column,
+            },
+        ),
+        Scenario(
+            "login",
+            "POST",
+            "/auth/login",
+            {
+                "email": BENCHMARK_AUTH_USER["email"],
+                "password": BENCHMARK_AUTH_USER["password"],
+            },
+        ),
+        # Clients refreshing the same token at once (tabs, retries)
+        Scenario(
+            "refresh same token",
+            "POST",
+            "/auth/refresh",
+            {"refresh_token": refresh_token},
+            _auth_headers(BENCHMARK_AUTH_USER["email"]),
+        ),
+    ]
+
+
+async def run_scenario(
+    client, scenario: Scenario, headers: dict, requests: int, concurrency: int
+) -> ScenarioResult:
+    from app.core.monitoring.request_profile import (
+        add_profile_listener,
+        remove_profile_listener,
+    )
+
+    result = ScenarioResult(scenario.name)
+
+    def listener(method, status, profile):
+        result.query_counts.append(profile.query_count)
+
+    async def send() -> None:
+        body = scenario.body() if callable(scenario.body) else scenario.body
+        start = time.perf_counter()
+        response = await client.request(
+            scenario.method,
+            scenario.path,
+            json=body,
+            headers=scenario.headers or headers,
+        )
+        result.latencies.append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            result.errors += 1
+
+    # Warm up outside of the measurements (compiled statements, caches)
+    await send()
+    result.latencies.clear()
+    result.errors = 0
+
+    pending = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in pending:
+            await send()
+
+    add_profile_listener(listener)
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        result.wall_time = time.perf_counter() - start
+        remove_profile_listener(listener)
+    return result
+
+
+def print_results(results: dict, baseline: dict | None) -> None:
+    print(
+        f"{'scenario':<22}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        f"{'req/s':>10}{'queries':>9}{'errors':>8}"
+    )
+    for name, summary in results["scenarios"].items():
+        line = (
+            f"{name:<22}{summary['p50_ms']:>10.2f}{summary['p95_ms']:>10.2f}"
+            f"{summary['p99_ms']:>10.2f}{summary['throughput_rps']:>10.1f}"
+            f"{summary['queries_per_request']:>9.1f}{summary['errors']:>8}"
+        )
+        reference = (baseline or {}).get("scenarios", {}).get(name)
+        if reference and reference["p95_ms"]:
+            change = (summary["p95_ms"] / reference["p95_ms"] - 1) * 100
+            line += f"   p95 {change:+.1f}% vs {baseline.get('commit')}"
+        print(line)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    _configure_environment(args.db_url)
+
+    import httpx
+    from tortoise import Tortoise
+
+    from app.app_config import app_settings
+    from app.main import create_app
+    from benchmarks.seed import SeedSizes, seed_database
+
+    sizes = SeedSizes(
+        **{name: value for name in SIZE_OPTIONS if (value := getattr(args, name))}
+    )
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        await Tortoise.generate_schemas()
+        seed_start = time.perf_counter()
+        data = await seed_database(sizes)
+        print(
+            f"seeded {len(data.task_ids)} tasks on {len(data.board_ids)} boards "
+            f"in {time.perf_counter() - seed_start:.1f}s"
+        )
+
+        headers = _auth_headers(data.user_emails[0])
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url=f"http://benchmark/api/v{app_settings.api_version}",
+        ) as client:
+            response = await client.post("/auth/register", json=BENCHMARK_AUTH_USER)
+            refresh_token = response.json()["refresh_token"]
+
+            scenarios = {}
+            for scenario in build_scenarios(data, refresh_token):
+                if args.only and scenario.name not in args.only:
+                    continue
+                result = await run_scenario(
+                    client, scenario, headers, args.requests, args.concurrency
+                )
+                scenarios[scenario.name] = result.summary()
+
+    return {
+        "commit": _git_commit(),
+        "dialect": args.db_url.split(":", 1)[0],
+        "python": platform.python_version(),
+        "sizes": sizes.as_dict(),
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "scenarios": scenarios,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db-url", default="sqlite://:memory:")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    for name in SIZE_OPTIONS:
+        parser.add_argument(f"--{name}", type=int, help="see benchmarks.seed.SeedSizes")
+    parser.add_argument("--only", nargs="*", help="scenario names to run")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+    print_results(results, baseline)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
@@ -0,0 +1,74 @@
+"""
+CPU cost of the hot repository lookups through the Tortoise query builder
+compared with the compiled query cache.
+
+Usage (from the project directory):
+    DATABASE_URL=sqlite://:memory: python -m benchmarks.compiled_query_benchmark
+        [--iterations 2000] [--db-url URL]
+"""
+
+import argparse
+import asyncio
+import time
+
+from tortoise import Tortoise
+
+from app.modules.database_module.dao.compiled_query import CompiledQuery
+from app.modules.database_module.models.default import Board, User, Workspace
+
+
+async def seed() -> tuple[User, Board]:
+    user = await User.create(name="bench", surname="bench", email="bench@bench.io")
+    workspace = await Workspace.create(name="bench", owner_id=user.id)
+    board = await Board.create(name="bench", workspace=workspace, owner=user)
+    await board.members.add(user)
+    return user, board
+
+
+async def measure(label: str, iterations: int, call) -> None:
+    await call()
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    for _ in range(iterations):
+        await call()
+    cpu = (time.process_time() - cpu_start) / iterations * 1_000_000
+    wall = (time.perf_counter() - wall_start) / iterations * 1_000_000
+    print(f"{label:<48} cpu {cpu:8.1f} us/op   wall {wall:8.1f} us/op")
+
+
+async def run(iterations: int, db_url: str) -> None:
+    await Tortoise.init(
+        db_url=db_url,
+        modules={"default": ["app.modules.database_module.models.default"]},
+    )
+    await Tortoise.generate_schemas()
+    user, board = await seed()
+
+    cases = {
+        "get_entity by id": (
+            lambda: User.filter(id=user.id).first(),
+            lambda: CompiledQuery.fetch_first(User, {"id": user.id}),
+        ),
+        "get_entity_filtered by email": (
+            lambda: User.filter(email=user.email).first(),
+            lambda: CompiledQuery.fetch_first(User, {"email": user.email}),
+        ),
+        "board membership exists": (
+            lambda: Board.filter(id=board.id, members__id=user.id).exists(),
+            lambda: CompiledQuery.exists(
+                Board, {"id": board.id, "members__id": user.id}
+            ),
+        ),
+    }
+    for name, (builder, compiled) in cases.items():
+        await measure(f"{name} [query builder]", iterations, builder)
+        await measure(f"{name} [compiled]", iterations, compiled)
+
+    await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--db-url", default="sqlite://:memory:")
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations, args.db_url))
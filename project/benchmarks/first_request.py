@@ -0,0 +1,150 @@
+"""
+First request latency of a worker, with and without the warm-up phase.
+Every run boots the app in a fresh interpreter, like a newly spawned
+worker, and times its first requests against a seeded database.
+
+Usage (from the project directory):
+    python -m benchmarks.first_request [--db-url sqlite:///tmp/first.db]
+        [--runs 5]
+
+The database is seeded by the first run when empty. Requests go through
+the ASGI app in process, the times exclude the network.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.api_benchmark import _auth_headers, _configure_environment
+
+MODES = {"cold": "false", "warm": "true"}
+
+
+async def _seed() -> dict:
+    from tortoise import Tortoise
+
+    from app.main import create_app
+    from app.modules.database_module.models.default import Board, User
+    from benchmarks.seed import SeedSizes, seed_database
+
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        await Tortoise.generate_schemas(safe=True)
+        if not await User.exists():
+            await seed_database(SeedSizes())
+        # The first user owns the first workspace and its boards
+        user = await User.all().order_by("id").first()
+        board = await Board.filter(owner_id=user.id).order_by("id").first()
+    return {"email": user.email, "board_id": board.id}
+
+
+async def _boot_and_request(email: str, board_id: int) -> dict:
+    """Run in the fresh interpreter: boot the app and time its first requests"""
+    start = time.perf_counter()
+    import httpx
+
+    from app.app_config import app_settings
+    from app.core.monitoring.worker_startup import WorkerStartup
+    from app.main import create_app
+
+    app = create_app()
+    imported = time.perf_counter()
+    paths = [
+        f"/tasks/board/{board_id}",
+        f"/columns/{board_id}",
+        "/workspaces/all-me",
+        f"/tasks/board/{board_id}",
+    ]
+    timings = {}
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url=f"http://benchmark/api/v{app_settings.api_version}",
+        ) as client:
+            for index, path in enumerate(paths):
+                request_start = time.perf_counter()
+                response = await client.get(path, headers=_auth_headers(email))
+                response.raise_for_status()
+                name = path if path not in timings else f"{path} (again)"
+                timings[name] = (time.perf_counter() - request_start) * 1000
+    return {
+        "import_ms": (imported - start) * 1000,
+        "lifespan_ms": (ready - imported) * 1000,
+        "warmup_ms": WorkerStartup.warmup_duration * 1000,
+        "requests_ms": timings,
+    }
+
+
+def _run_worker(db_url: str, warmup: str, arguments: list[str]) -> dict:
+    environment = dict(os.environ, WARMUP_ENABLED=warmup)
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.first_request", "--db-url", db_url]
+        + arguments,
+        capture_output=True,
+        text=True,
+        env=environment,
+        check=True,
+    )
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def seed(db_url: str) -> dict:
+    """
+    Seed the database unless already seeded
+    :return: email of the first user and identifier of one of its boards
+    """
+    return _run_worker(db_url, "false", ["--seed"])
+
+
+def _median_by_key(results: list[dict]) -> dict:
+    return {
+        key: statistics.median(result[key] for result in results) for key in results[0]
+    }
+
+
+def main(args: argparse.Namespace) -> None:
+    seeded = seed(args.db_url)
+    arguments = ["--email", seeded["email"], "--board-id", str(seeded["board_id"])]
+
+    for mode, warmup in MODES.items():
+        runs = [_run_worker(args.db_url, warmup, arguments) for _ in range(args.runs)]
+        startup = _median_by_key(
+            [{k: v for k, v in run.items() if k != "requests_ms"} for run in runs]
+        )
+        requests = _median_by_key([run["requests_ms"] for run in runs])
+        print(
+            f"{mode}: import {startup['import_ms']:.0f} ms, "
+            f"lifespan {startup['lifespan_ms']:.0f} ms "
+            f"(warm-up {startup['warmup_ms']:.0f} ms), median of {args.runs} runs"
+        )
+        for path, duration in requests.items():
+            print(f"  {path:<40} {duration:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--db-url",
+        default=f"sqlite://{os.path.join(tempfile.gettempdir(), 'first_request.db')}",
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--email", help=argparse.SUPPRESS)
+    parser.add_argument("--board-id", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.seed or args.email:
+        _configure_environment(args.db_url)
+        if args.seed:
+            print(json.dumps(asyncio.run(_seed())))
+        else:
+            print(json.dumps(asyncio.run(_boot_and_request(args.email, args.board_id))))
+    else:
+        main(args)
@@ -0,0 +1,101 @@
+"""
+Cold start cost of a worker: import time of app.main measured with
+python -X importtime in fresh interpreters.
+
+Usage (from the project directory):
+    python -m benchmarks.import_time [--runs 5] [--top 15] [--check]
+
+With --check, exits with an error when the median exceeds
+IMPORT_TIME_BUDGET_MS or a module of FORBIDDEN_STARTUP_IMPORTS is imported
+(both declared in app/tests/constants.py).
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+
+TARGET_MODULE = "app.main"
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def _environment() -> dict:
+    # Settings are read at import time, the database is never reached
+    environment = dict(os.environ)
+    environment.setdefault("DATABASE_URL", "sqlite://:memory:")
+    environment.setdefault("API_VERSION", "1")
+    return environment
+
+
+def measure(module: str = TARGET_MODULE) -> list[ImportRecord]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=_environment(),
+        check=True,
+    )
+    records = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        records.append(ImportRecord(name.strip(), int(self_us), int(cumulative_us)))
+    return records
+
+
+def total_ms(records: list[ImportRecord], module: str = TARGET_MODULE) -> float:
+    return next(r.cumulative_us for r in records if r.module == module) / 1000
+
+
+def forbidden_imports(records: list[ImportRecord], forbidden: tuple) -> list[str]:
+    return sorted(
+        {
+            record.module
+            for record in records
+            if record.module.split(".")[0] in forbidden
+        }
+    )
+
+
+def print_top(records: list[ImportRecord], top: int) -> None:
+    # Self time summed by top level package, the heaviest dependencies
+    packages = {}
+    for record in records:
+        package = record.module.split(".")[0]
+        packages[package] = packages.get(package, 0) + record.self_us
+    print(f"{'package':<30}{'self ms':>10}")
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"{package:<30}{self_us / 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--check", action="store_true", help="enforce the budget")
+    args = parser.parse_args()
+
+    from app.tests.constants import FORBIDDEN_STARTUP_IMPORTS, IMPORT_TIME_BUDGET_MS
+
+    runs = [measure() for _ in range(args.runs)]
+    median_ms = statistics.median(total_ms(records) for records in runs)
+    print_top(runs[-1], args.top)
+    print(
+        f"\n{TARGET_MODULE}: median {median_ms:.1f} ms over {args.runs} runs "
+        f"(budget {IMPORT_TIME_BUDGET_MS} ms)"
+    )
+
+    forbidden = forbidden_imports(runs[-1], FORBIDDEN_STARTUP_IMPORTS)
+    if forbidden:
+        print(f"forbidden startup imports: {', '.join(forbidden)}")
+    if args.check and (forbidden or median_ms > IMPORT_TIME_BUDGET_MS):
+        sys.exit(1)
@@ -0,0 +1,184 @@
+"""
+Board snapshot and task move latency with a single task table and with the
+task table hash partitioned by board, at 10M tasks by default.
+
+Usage (from the project directory):
+    python -m benchmarks.partition_benchmark --db-url postgres://...
+        [--tasks 10000000] [--boards 10000] [--partitions 32] [--samples 500]
+
+The database must be disposable: its tables are dropped before each layout.
+Seeding 10M tasks takes a few minutes per layout. Against SQLite only the
+single table runs, to try the benchmark on a small dataset.
+
+The snapshot is the uncached query of GET /tasks/board/{board_id} (columns
+and tasks of a board), the move shifts the tasks of a column as
+PUT /tasks/move does, moving a random task to the top of its column.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from benchmarks.api_benchmark import _configure_environment, _percentile
+
+COLUMNS_PER_BOARD = 5
+SEED_CHUNK = 1_000_000
+
+
+async def reset_schema(connection) -> None:
+    from tortoise import Tortoise
+
+    if connection.capabilities.dialect == "postgres":
+        await connection.execute_script(
+            "DROP SCHEMA public CASCADE; CREATE SCHEMA public;"
+        )
+    else:
+        rows = await connection.execute_query_dict(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            "AND name NOT LIKE 'sqlite_%'"
+        )
+        tables = "".join(f'DROP TABLE "{row["name"]}";' for row in rows)
+        await connection.execute_script(
+            f"PRAGMA foreign_keys = OFF; {tables} PRAGMA foreign_keys = ON;"
+        )
+    await Tortoise.generate_schemas()
+
+
+async def seed(connection, args: argparse.Namespace) -> None:
+    """
+    Boards of COLUMNS_PER_BOARD columns, the tasks spread evenly over the
+    columns, inserted with set based statements
+    """
+    from app.modules.database_module.models.default import User, Workspace
+
+    user = await User.create(name="bench", surname="bench", email="bench@bench.io")
+    workspace = await Workspace.create(name="bench", owner_id=user.id)
+    columns = args.boards * COLUMNS_PER_BOARD
+    series = (
+        "generate_series({start}, {stop}) AS g"
+        if connection.capabilities.dialect == "postgres"
+        else "(WITH RECURSIVE s(g) AS (SELECT {start} UNION ALL "
+        "SELECT g + 1 FROM s WHERE g < {stop}) SELECT g FROM s)"
+    )
+    await connection.execute_script(
+        f"""
+        INSERT INTO board (name, created_at, updated_at, workspace_id, owner_id)
+        SELECT 'board' || g, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP,
+            {workspace.id}, {user.id}
+        FROM {series.format(start=1, stop=args.boards)};
+        INSERT INTO columns (name, "order", board_id)
+        SELECT 'column' || g, (g - 1) % {COLUMNS_PER_BOARD} + 1,
+            (g - 1) / {COLUMNS_PER_BOARD} + 1
+        FROM {series.format(start=1, stop=columns)};
+        """
+    )
+    for start in range(1, args.tasks + 1, SEED_CHUNK):
+        stop = min(start + SEED_CHUNK - 1, args.tasks)
+        # Task g goes to column (g - 1) % columns + 1, at the end of it
+        await connection.execute_script(
+            f"""
+            INSERT INTO task (title, description, "order", created_at,
+                updated_at, column_id, board_id)
+            SELECT 'task' || g, 'Benchmark task', (g - 1) / {columns} + 1,
+                CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, (g - 1) % {columns} + 1,
+                ((g - 1) % {columns}) / {COLUMNS_PER_BOARD} + 1
+            FROM {series.format(start=start, stop=stop)};
+            """
+        )
+        print(f"  seeded {stop} tasks", flush=True)
+    await connection.execute_script("ANALYZE;")
+
+
+async def measure(args: argparse.Namespace) -> dict[str, list[float]]:
+    from app.modules.database_module.models.default import Task
+    from app.repositories.task_repository import TaskRepository
+    from app.services.task_service.task_service import TaskService
+
+    rng = random.Random(42)
+    tasks_per_column = args.tasks // (args.boards * COLUMNS_PER_BOARD)
+    results = {"snapshot": [], "move": []}
+    for _ in range(args.samples):
+        board_id = rng.randint(1, args.boards)
+        start = time.perf_counter()
+        await TaskService._load_columns_with_tasks(board_id)
+        results["snapshot"].append(time.perf_counter() - start)
+
+        column_id = (board_id - 1) * COLUMNS_PER_BOARD + rng.randint(
+            1, COLUMNS_PER_BOARD
+        )
+        task = await Task.filter(
+            board_id=board_id,
+            column_id=column_id,
+            order=rng.randint(1, max(tasks_per_column, 1)),
+        ).first()
+        if task is None:
+            continue
+        start = time.perf_counter()
+        await TaskRepository.update_order_task(
+            {
+                "order": task.order,
+                "task_id": task.id,
+                "new_order": 1,
+                "column_id": column_id,
+                "board_id": board_id,
+            }
+        )
+        results["move"].append(time.perf_counter() - start)
+    return results
+
+
+async def run(args: argparse.Namespace) -> None:
+    from tortoise import Tortoise
+
+    from app.modules.database_module.settings import module_settings
+    from app.modules.database_module.task_partitioning import (
+        create_partitioned_task_table,
+    )
+
+    await Tortoise.init(config=module_settings.get_tortoise_config())
+    connection = Tortoise.get_connection("default")
+    layouts = ["single table"]
+    if connection.capabilities.dialect == "postgres":
+        layouts.append(f"{args.partitions} partitions")
+
+    print(
+        f"{args.tasks} tasks, {args.boards} boards of {COLUMNS_PER_BOARD} columns, "
+        f"{args.samples} samples"
+    )
+    rows = []
+    for layout in layouts:
+        print(f"{layout}: seeding...", flush=True)
+        await reset_schema(connection)
+        if layout != "single table":
+            await create_partitioned_task_table(connection, args.partitions)
+            await Tortoise.generate_schemas()
+        start = time.perf_counter()
+        await seed(connection, args)
+        seed_time = time.perf_counter() - start
+        results = await measure(args)
+        for name, latencies in results.items():
+            latencies.sort()
+            rows.append(
+                f"{layout:<16} {name:<9} "
+                f"{statistics.median(latencies) * 1000:>9.2f} "
+                f"{_percentile(latencies, 99) * 1000:>9.2f} {seed_time:>9.0f}"
+            )
+
+    print(f"{'layout':<16} {'query':<9} {'p50 ms':>9} {'p99 ms':>9} {'seed s':>9}")
+    print("\n".join(rows))
+    await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db-url", required=True)
+    parser.add_argument("--tasks", type=int, default=10_000_000)
+    parser.add_argument("--boards", type=int, default=10_000)
+    parser.add_argument("--partitions", type=int, default=32)
+    parser.add_argument("--samples", type=int, default=500)
+    args = parser.parse_args()
+
+    _configure_environment(args.db_url)
+    asyncio.run(run(args))
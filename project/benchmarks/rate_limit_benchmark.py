@@ -0,0 +1,119 @@
+"""
+Overhead of the rate limits on requests under the limits: cost of taking a
+token from the buckets, and latency of an endpoint with and without the
+limits, driven in process through the ASGI app.
+
+Usage (from the project directory):
+    python -m benchmarks.rate_limit_benchmark [--requests 2000] [--users 1000]
+        [--path /tasks/board/{board_id}] [--redis-url redis://localhost:6379/0]
+
+The limits of the routers are raised so that no request is rejected, the
+requests alternate between the limits on and off to share the same noise.
+With --redis-url the shared buckets are measured too, their cost is mostly
+the round trip to the server.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks.api_benchmark import _auth_headers, _configure_environment
+
+UNLIMITED = 1_000_000
+ROUTE_GROUPS = ("users", "workspaces", "boards", "columns", "tasks")
+
+
+async def measure_acquire(label: str, buckets, iterations: int, users: int) -> None:
+    await buckets.acquire("warm-up", UNLIMITED, UNLIMITED)
+    start = time.perf_counter()
+    for index in range(iterations):
+        await buckets.acquire(f"tasks:user:{index % users}", UNLIMITED, UNLIMITED)
+    per_call = (time.perf_counter() - start) / iterations * 1_000_000
+    print(f"acquire {label:<34} {per_call:8.1f} us/call")
+
+
+async def measure_endpoint(args: argparse.Namespace, backends: dict) -> None:
+    import httpx
+    from tortoise import Tortoise
+
+    from app.app_config import app_settings
+    from app.core.rate_limit.rate_limiter import RateLimiter
+    from app.main import create_app
+    from benchmarks.seed import SeedSizes, seed_database
+
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        await Tortoise.generate_schemas()
+        data = await seed_database(SeedSizes(users=20, workspaces=1, boards=2))
+        path = args.path.format(
+            board_id=data.board_ids[0], workspace_id=data.workspace_ids[0]
+        )
+        headers = _auth_headers(data.user_emails[0])
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url=f"http://benchmark/api/v{app_settings.api_version}",
+            headers=headers,
+        ) as client:
+            latencies = {name: [] for name in backends}
+            for index in range(args.requests + len(backends)):
+                name = list(backends)[index % len(backends)]
+                RateLimiter.configure(backends[name])
+                start = time.perf_counter()
+                response = await client.get(path)
+                elapsed = time.perf_counter() - start
+                response.raise_for_status()
+                if index >= len(backends):  # first round warms the caches up
+                    latencies[name].append(elapsed)
+
+    baseline = statistics.median(latencies["off"])
+    print(f"GET {args.path}, {args.requests} requests")
+    for name, values in latencies.items():
+        median = statistics.median(values)
+        print(
+            f"limits {name:<6} p50 {median * 1000:7.3f} ms  "
+            f"overhead {(median - baseline) * 1_000_000:+7.1f} us"
+        )
+
+
+async def run(args: argparse.Namespace) -> None:
+    from app.core.rate_limit.token_buckets import (
+        LocalTokenBuckets,
+        RedisTokenBuckets,
+    )
+
+    backends = {"off": None, "local": LocalTokenBuckets(args.users * 2)}
+    if args.redis_url:
+        backends["redis"] = RedisTokenBuckets(args.redis_url, "kanban:benchmark:")
+
+    for name, buckets in backends.items():
+        if buckets is not None:
+            await measure_acquire(
+                f"{name} ({args.users} users)", buckets, args.requests, args.users
+            )
+    await measure_endpoint(args, backends)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db-url", default="sqlite://:memory:")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument(
+        "--path",
+        default="/tasks/board/{board_id}",
+        help="requested path, {board_id} and {workspace_id} are replaced",
+    )
+    parser.add_argument("--redis-url")
+    args = parser.parse_args()
+
+    _configure_environment(args.db_url)
+    # Settings are read at import time: limits no request reaches
+    os.environ["RATE_LIMITS"] = ",".join(
+        f"{group}.{scope}={UNLIMITED}/{UNLIMITED}"
+        for group in ROUTE_GROUPS
+        for scope in ("user", "workspace")
+    )
+    asyncio.run(run(args))
@@ -0,0 +1,160 @@
+"""
+Bulk seeding of workspaces, boards, columns and tasks for the benchmarks.
+Expects an empty database, identifiers are assigned in insertion order.
+"""
+
+import random
+from dataclasses import asdict, dataclass, field
+
+from tortoise import Tortoise
+
+from app.modules.database_module.models.default import (
+    Board,
+    Column,
+    Task,
+    User,
+    Workspace,
+)
+
+BATCH_SIZE = 1000
+
+
+@dataclass
+class SeedSizes:
+    users: int = 50
+    workspaces: int = 2
+    boards: int = 10  # per workspace
+    columns: int = 5  # per board
+    tasks: int = 40  # per column
+    members: int = 20  # workspace and board members, owner included
+    favorites: int = 3  # favorite boards per member and workspace
+    seed: int = 42
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class SeededData:
+    user_emails: list[str] = field(default_factory=list)
+    workspace_ids: list[int] = field(default_factory=list)
+    board_ids: list[int] = field(default_factory=list)
+    column_ids: list[int] = field(default_factory=list)
+    task_ids: list[int] = field(default_factory=list)
+
+
+async def _bulk_insert_pairs(table: str, columns: tuple[str, str], rows: list):
+    connection = Tortoise.get_connection("default")
+    if connection.capabilities.dialect == "postgres":
+        placeholders = "$1, $2"
+    else:
+        placeholders = "?, ?"
+    query = (
+        f'INSERT INTO "{table}" ("{columns[0]}", "{columns[1]}") '
+        f"VALUES ({placeholders})"
+    )
+    for start in range(0, len(rows), BATCH_SIZE):
+        end = start + BATCH_SIZE
+        await connection.execute_many(query, rows[start:end])
+
+
+async def _ids(model) -> list[int]:
+    return await model.all().order_by("id").values_list("id", flat=True)
+
+
+async def seed_database(sizes: SeedSizes) -> SeededData:
+    """
+    Insert the dataset with bulk inserts. The first user owns the first
+    workspace and its boards, and is member of every workspace and board.
+    """
+    rng = random.Random(sizes.seed)
+    data = SeededData()
+
+    await User.bulk_create(
+        [
+            User(name=f"user{i}", surname="bench", email=f"user{i}@bench.io")
+            for i in range(sizes.users)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    user_ids = await _ids(User)
+    data.user_emails = [f"user{i}@bench.io" for i in range(sizes.users)]
+
+    await Workspace.bulk_create(
+        [
+            Workspace(name=f"workspace{w}", owner_id=user_ids[w % len(user_ids)])
+            for w in range(sizes.workspaces)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    data.workspace_ids = await _ids(Workspace)
+
+    members_by_workspace = {}
+    workspace_members = []
+    for index, workspace_id in enumerate(data.workspace_ids):
+        owner_id = user_ids[index % len(user_ids)]
+        required = list(dict.fromkeys((owner_id, user_ids[0])))
+        others = [user_id for user_id in user_ids if user_id not in required]
+        extra = max(sizes.members - len(required), 0)
+        members = required + rng.sample(others, min(len(others), extra))
+        members_by_workspace[workspace_id] = (owner_id, members)
+        workspace_members.extend((workspace_id, user_id) for user_id in members)
+    await _bulk_insert_pairs(
+        "workspace_user", ("workspace_id", "user_id"), workspace_members
+    )
+
+    await Board.bulk_create(
+        [
+            Board(
+                name=f"board{w}-{b}",
+                workspace_id=workspace_id,
+                owner_id=members_by_workspace[workspace_id][0],
+            )
+            for w, workspace_id in enumerate(data.workspace_ids)
+            for b in range(sizes.boards)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    data.board_ids = await _ids(Board)
+
+    board_members, favorites = [], []
+    boards_by_workspace = {}
+    for board in await Board.all().order_by("id"):
+        boards_by_workspace.setdefault(board.workspace_id, []).append(board.id)
+        _, members = members_by_workspace[board.workspace_id]
+        board_members.extend((board.id, user_id) for user_id in members)
+    for workspace_id, (_, members) in members_by_workspace.items():
+        boards = boards_by_workspace.get(workspace_id, [])
+        for user_id in members:
+            picked = rng.sample(boards, min(len(boards), sizes.favorites))
+            favorites.extend((board_id, user_id) for board_id in picked)
+    await _bulk_insert_pairs("board_member", ("board_id", "user_id"), board_members)
+    await _bulk_insert_pairs("favorite_board", ("board_id", "user_id"), favorites)
+
+    await Column.bulk_create(
+        [
+            Column(name=f"column{c}", order=c + 1, board_id=board_id)
+            for board_id in data.board_ids
+            for c in range(sizes.columns)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    column_boards = await Column.all().order_by("id").values_list("id", "board_id")
+    data.column_ids = [column_id for column_id, _ in column_boards]
+
+    await Task.bulk_create(
+        [
+            Task(
+                title=f"task{column_id}-{t}",
+                description=f"Benchmark task {t} " * 8,
+                order=t + 1,
+                column_id=column_id,
+                board_id=board_id,
+            )
+            for column_id, board_id in column_boards
+            for t in range(sizes.tasks)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    data.task_ids = await _ids(Task)
+    return data
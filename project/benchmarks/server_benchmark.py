@@ -0,0 +1,240 @@
+"""
+Throughput of the server configurations (engine, event loop, HTTP parser,
+worker processes, HTTP/2) on this machine, against a seeded database.
+
+Usage (from the project directory):
+    python -m benchmarks.server_benchmark [--db-url sqlite:///tmp/first.db]
+        [--path /api/v1/columns/{board_id}] [--duration 10]
+        [--connections 64] [--clients 2]
+        [--configurations uvicorn-asyncio-h11 uvicorn-uvloop-httptools ...]
+
+Each configuration is started with python -m app.core.server, then client
+processes request the path (a board snapshot by default) in a loop over
+keep-alive connections.
+The clients share the machine with the server: compare the configurations
+with each other, not with production figures.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+
+from benchmarks.api_benchmark import (
+    BENCHMARK_JWT_SECRET,
+    _auth_headers,
+    _percentile,
+)
+from benchmarks.first_request import seed
+
+STARTUP_TIMEOUT = 60
+
+
+@dataclass
+class Configuration:
+    name: str
+    environment: dict
+    http2: bool = False  # clients speak HTTP/2 (cleartext, prior knowledge)
+
+
+CONFIGURATIONS = [
+    Configuration(
+        "uvicorn-asyncio-h11",
+        {
+            "SERVER_ENGINE": "uvicorn",
+            "SERVER_LOOP": "asyncio",
+            "SERVER_HTTP": "h11",
+            "WEB_CONCURRENCY": "1",
+        },
+    ),
+    Configuration(
+        "uvicorn-uvloop-httptools",
+        {
+            "SERVER_ENGINE": "uvicorn",
+            "SERVER_LOOP": "uvloop",
+            "SERVER_HTTP": "httptools",
+            "WEB_CONCURRENCY": "1",
+        },
+    ),
+    Configuration("uvicorn-per-cpu", {"SERVER_ENGINE": "uvicorn"}),
+    Configuration("gunicorn-per-cpu", {"SERVER_ENGINE": "gunicorn"}),
+    Configuration("hypercorn-per-cpu", {"SERVER_ENGINE": "hypercorn"}),
+    Configuration("hypercorn-h2-per-cpu", {"SERVER_ENGINE": "hypercorn"}, True),
+]
+
+
+@dataclass
+class LoadResult:
+    latencies: list[float]
+    errors: int
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(configuration: Configuration, db_url: str, port: int):
+    environment = dict(
+        os.environ,
+        RATE_LIMIT_BACKEND="none",
+        ADMISSION_CONTROL_ENABLED="false",
+        **configuration.environment,
+        DATABASE_URL=db_url,
+        API_VERSION=os.environ.get("API_VERSION", "1"),
+        SUPABASE_JWT_TOKEN=BENCHMARK_JWT_SECRET,
+        SERVER_HOST="127.0.0.1",
+        PORT=str(port),
+    )
+    # Own session, so the server and its workers are stopped together
+    return subprocess.Popen(
+        [sys.executable, "-m", "app.core.server"],
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        start_new_session=True,
+    )
+
+
+def _wait_until_ready(server: subprocess.Popen, url: str) -> None:
+    import httpx
+
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(server.stderr.read().decode().strip().splitlines()[-1])
+        try:
+            httpx.get(f"{url}/metrics").raise_for_status()
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"not ready after {STARTUP_TIMEOUT}s")
+
+
+def _stop_server(server: subprocess.Popen) -> None:
+    os.killpg(server.pid, signal.SIGTERM)
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        os.killpg(server.pid, signal.SIGKILL)
+        server.wait()
+
+
+async def _load(
+    url: str, headers: dict, connections: int, duration: float, http2: bool
+) -> LoadResult:
+    import httpx
+
+    result = LoadResult([], 0)
+    deadline = time.perf_counter() + duration
+    async with httpx.AsyncClient(
+        headers=headers,
+        http1=not http2,
+        http2=http2,
+        limits=httpx.Limits(max_connections=connections),
+    ) as client:
+
+        async def connection() -> None:
+            while (start := time.perf_counter()) < deadline:
+                try:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                    result.latencies.append(time.perf_counter() - start)
+                except httpx.HTTPError:
+                    # HTTP/2 streams in flight included when the server
+                    # closes a connection (hypercorn keep_alive_max_requests)
+                    result.errors += 1
+
+        await asyncio.gather(*(connection() for _ in range(connections)))
+    return result
+
+
+def _run_client(arguments: tuple) -> LoadResult:
+    return asyncio.run(_load(*arguments))
+
+
+def measure(
+    configuration: Configuration, args: argparse.Namespace, seeded: dict
+) -> dict:
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = _start_server(configuration, args.db_url, port)
+    try:
+        _wait_until_ready(server, base_url)
+        url = base_url + args.path.format(**seeded)
+        client_arguments = (
+            url,
+            _auth_headers(seeded["email"]),
+            max(args.connections // args.clients, 1),
+            args.duration,
+            configuration.http2,
+        )
+        # Warm the workers and the snapshot cache up before measuring
+        _run_client((*client_arguments[:3], 1.0, configuration.http2))
+        with multiprocessing.Pool(args.clients) as pool:
+            results = pool.map(_run_client, [client_arguments] * args.clients)
+    finally:
+        _stop_server(server)
+
+    latencies = sorted(value for result in results for value in result.latencies)
+    return {
+        "requests_per_second": len(latencies) / args.duration,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "errors": sum(result.errors for result in results),
+    }
+
+
+def main(args: argparse.Namespace) -> None:
+    seeded = seed(args.db_url)
+    selected = [
+        configuration
+        for configuration in CONFIGURATIONS
+        if not args.configurations or configuration.name in args.configurations
+    ]
+    print(
+        f"{os.cpu_count()} CPUs, {args.connections} connections from "
+        f"{args.clients} clients, {args.duration:.0f}s per configuration"
+    )
+    print(f"{'configuration':<24} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} errors")
+    for configuration in selected:
+        try:
+            result = measure(configuration, args, seeded)
+        except RuntimeError as error:
+            print(f"{configuration.name:<24} failed: {error}")
+            continue
+        print(
+            f"{configuration.name:<24} {result['requests_per_second']:>9.0f} "
+            f"{result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--db-url",
+        default=f"sqlite://{os.path.join(tempfile.gettempdir(), 'first_request.db')}",
+    )
+    parser.add_argument(
+        "--path",
+        default="/api/v1/tasks/board/{board_id}",
+        help="requested path, {board_id} is replaced by a seeded board",
+    )
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--clients", type=int, default=2)
+    parser.add_argument(
+        "--configurations",
+        nargs="*",
+        choices=[configuration.name for configuration in CONFIGURATIONS],
+    )
+    main(parser.parse_args())
@@ -0,0 +1,37 @@
+"""
+Gunicorn settings of the production image, read from the working directory.
+Command line options take precedence.
+"""
+
+import gc
+import os
+
+from app.app_config import app_settings, get_workers
+
+bind = f"{app_settings.server_host}:{app_settings.server_port}"
+workers = get_workers()
+# Event loop, HTTP parser and concurrency limit of the launcher settings
+worker_class = "app.core.server.uvicorn_worker.TunedUvicornWorker"
+backlog = app_settings.server_backlog
+keepalive = app_settings.server_keepalive
+if app_settings.server_certfile:
+    certfile = app_settings.server_certfile
+    keyfile = app_settings.server_keyfile
+
+# Import the app once in the master: the workers are forked from it and
+# share its modules instead of importing them again. Tortoise and every
+# connection are opened by the lifespan of each worker, after the fork.
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+
+def when_ready(server):
+    """Called in the master before the workers are spawned"""
+    if not preload_app:
+        return
+    from app.core.warmup.worker_warmup import preload
+    from app.main import app
+
+    preload(app)
+    # Keep the collector of the workers off the preloaded objects, so their
+    # memory pages stay shared with the master
+    gc.freeze()